@@ -0,0 +1,353 @@
+# pomodoro_app/core/async_timer.py
+"""Pomodoro timer driven by an asyncio event loop instead of a thread.
+
+``AsyncPomodoroTimer`` follows the same pomodoro/break rules and stores the
+same state keys as ``PomodoroTimerCore``, but each running timer is a
+single ``loop.call_at`` handle: it wakes only when the displayed time
+changes at the configured resolution (or only at the deadline when ticks
+are disabled), so thousands of timers share one loop and no threads.
+
+Like other asyncio objects it is not thread-safe; call its methods from
+the loop's thread. Storage writes run in the loop's default executor, one
+at a time per timer, so a slow backend never stalls the loop; await
+``flush()`` before closing the storage.
+
+Usage:
+    timer = AsyncPomodoroTimer(storage, resolution=60)
+    async with timer.events() as stream:
+        timer.start()
+        async for event in stream:
+            ...
+    await timer.completed()
+"""
+import asyncio
+import collections
+import math
+import time
+from . import logger
+from .clock import SystemClock
+from .events import Event
+
+class EventStream:
+    """Async iterator over a timer's events, subscribed from creation on
+
+    Events published after ``timer.events()`` returns are buffered even
+    before iteration starts. At most ``maxsize`` events wait: a consumer
+    falling behind loses the oldest waiting ticks rather than slowing the
+    timer down, while completions are never dropped. Use it as an async
+    context manager, or call ``close()``, to unsubscribe.
+    """
+
+    def __init__(self, timer, maxsize=64):
+        self.maxsize = maxsize
+        self.dropped = 0
+        self.closed = False
+        self._timer = timer
+        self._events = collections.deque()
+        self._ticks = 0
+        self._waiter = None
+        timer._streams.append(self)
+
+    def put(self, event):
+        if len(self._events) >= self.maxsize and self._ticks:
+            for i, waiting in enumerate(self._events):
+                if waiting.name == "tick":
+                    del self._events[i]
+                    self._ticks -= 1
+                    self.dropped += 1
+                    break
+        self._events.append(event)
+        if event.name == "tick":
+            self._ticks += 1
+        self._wake_waiter()
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self._timer._streams.remove(self)
+            self._wake_waiter()
+
+    def _wake_waiter(self):
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while not self._events:
+            if self.closed:
+                raise StopAsyncIteration
+            self._waiter = self._timer.loop.create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        event = self._events.popleft()
+        if event.name == "tick":
+            self._ticks -= 1
+        return event
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+class AsyncPomodoroTimer:
+    """Asyncio-native timer with the semantics of PomodoroTimerCore
+
+    Args:
+        storage_manager: Optional storage backend; state is loaded on
+            creation and saved like the threaded core does
+        events: Optional EventBus that also receives every event
+        clock: Clock providing ``monotonic()`` and ``speed``; an
+            AcceleratedClock runs sessions faster, as with the threaded core
+        resolution: Seconds between tick events, or None for no ticks
+        notify: Send desktop notifications on completion (off by default,
+            since embedding applications usually run many timers)
+        loop: Event loop to schedule on, defaults to the running loop
+    """
+
+    def __init__(self, storage_manager=None, events=None, clock=None, resolution=1.0, notify=False, loop=None):
+        self.storage_manager = storage_manager
+        self.bus = events
+        self.clock = clock or SystemClock()
+        self.resolution = resolution
+        self.notify = notify
+        self._loop = loop
+
+        # Timer default values
+        self.default_pomodoro = 25 * 60
+        self.default_break = 5 * 60
+
+        # Current settings
+        self.pomodoro_time = self.default_pomodoro
+        self.break_time = self.default_break
+
+        # State variables
+        self.timer_running = False
+        self.current_time_left = self.pomodoro_time
+        self.current_mode = "pomodoro"
+        self.pomodoro_count = 0
+
+        self._deadline = None
+        self._handle = None
+        self._last_tick = None
+        self._last_saved = None
+        self._streams = []
+        self._waiters = []
+        # Newest state not yet handed to the executor, and the write in flight
+        self._unsaved = None
+        self._saving = None
+
+        if self.storage_manager:
+            self._load_state()
+
+    @property
+    def loop(self):
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        return self._loop
+
+    # Commands -------------------------------------------------------------
+
+    def start(self):
+        """Start or resume the timer"""
+        if self.timer_running:
+            logger.warning("Attempted to start timer that is already running")
+            return False
+
+        logger.debug(f"Starting async timer in {self.current_mode} mode")
+        self._deadline = self.clock.monotonic() + self.current_time_left
+        self.timer_running = True
+        self._last_tick = None
+        self._last_saved = self.current_time_left
+        # Publish the starting time right away, like the threaded core does
+        self._handle = self.loop.call_soon(self._wake)
+        self._save_state()
+        return True
+
+    def pause(self):
+        """Pause the timer"""
+        if not self.timer_running:
+            logger.warning("Attempted to pause timer that is not running")
+            return False
+
+        self.current_time_left = self.get_time_left()
+        logger.debug(f"Pausing async timer with {self.current_time_left} seconds left")
+        self._stop()
+        self._save_state()
+        return True
+
+    def reset(self):
+        """Stop the timer and restore the full length of the current mode"""
+        self._stop()
+        self.current_time_left = self.pomodoro_time if self.current_mode == "pomodoro" else self.break_time
+        self._publish("tick", self.current_time_left, self.current_mode)
+        self._save_state()
+        return True
+
+    def switch_mode(self):
+        """Stop the timer and switch between pomodoro and break, resetting the time left"""
+        if self.timer_running:
+            self.pause()
+        self.current_mode = "break" if self.current_mode == "pomodoro" else "pomodoro"
+        self.current_time_left = self.pomodoro_time if self.current_mode == "pomodoro" else self.break_time
+        self._publish("tick", self.current_time_left, self.current_mode)
+        self._save_state()
+        return self.current_mode
+
+    def set_timer_duration(self, pomodoro_time, break_time):
+        """Update timer durations; a running session keeps its deadline"""
+        self.pomodoro_time = pomodoro_time
+        self.break_time = break_time
+        if not self.timer_running:
+            self.current_time_left = pomodoro_time if self.current_mode == "pomodoro" else break_time
+        self._save_state()
+
+    def set_resolution(self, resolution):
+        """Change the tick interval, e.g. to minutes while an app is minimized"""
+        self.resolution = resolution
+        if self.timer_running:
+            self._schedule()
+
+    def get_time_left(self):
+        """Seconds left in the current session, derived from the deadline while running"""
+        if self.timer_running and self._deadline is not None:
+            return max(0, math.ceil(self._deadline - self.clock.monotonic()))
+        return self.current_time_left
+
+    # Awaiting -------------------------------------------------------------
+
+    def completed(self):
+        """Future resolved with the completion Event of the next finished session"""
+        waiter = self.loop.create_future()
+        self._waiters.append(waiter)
+        return waiter
+
+    def events(self, maxsize=64):
+        """EventStream of the tick and completion events published from now on"""
+        return EventStream(self, maxsize)
+
+    def _publish(self, name, *args):
+        event = Event(name, args, time.monotonic())
+        for stream in self._streams:
+            stream.put(event)
+        if self.bus is not None:
+            self.bus.publish(name, *args)
+        return event
+
+    # Scheduling -----------------------------------------------------------
+
+    def _stop(self):
+        self.timer_running = False
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def _schedule(self):
+        """Wake at the next tick boundary, or at the deadline without ticks"""
+        if self._handle is not None:
+            self._handle.cancel()
+        remaining = self._deadline - self.clock.monotonic()
+        delay = remaining
+        if self.resolution and remaining > 0:
+            # Next point where the remaining time crosses a multiple of the resolution
+            delay = remaining - (math.ceil(remaining / self.resolution) - 1) * self.resolution
+        self._handle = self.loop.call_at(self.loop.time() + max(0.0, delay) / self.clock.speed, self._wake)
+
+    def _wake(self):
+        self._handle = None
+        remaining = self._deadline - self.clock.monotonic()
+        self.current_time_left = max(0, math.ceil(remaining))
+        if self.current_time_left <= 0:
+            self._complete()
+            return
+
+        # Loop timers may fire a hair early; publish each value once
+        if self.resolution and self.current_time_left != self._last_tick:
+            self._last_tick = self.current_time_left
+            self._publish("tick", self.current_time_left, self.current_mode)
+
+        # Save state periodically (every 10 seconds to reduce disk writes)
+        if self._last_saved - self.current_time_left >= 10:
+            self._last_saved = self.current_time_left
+            self._save_state()
+        self._schedule()
+
+    def _complete(self):
+        if self.current_mode == "pomodoro":
+            self.pomodoro_count += 1
+            event = self._publish("pomodoro_complete", self.pomodoro_count)
+            self.current_mode = "break"
+            self.current_time_left = self.break_time
+            notification = ("Pomodoro Completed! 🎉", "Time for a break!")
+        else:
+            event = self._publish("break_complete")
+            self.current_mode = "pomodoro"
+            self.current_time_left = self.pomodoro_time
+            notification = ("Break Finished!", "Ready to focus again?")
+        self.timer_running = False
+        self._save_state()
+
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(event)
+        if self.notify:
+            # Imported on first use: notification backends pull in plyer and PIL
+            from ..utils.notifications import send_notification
+            # Notification backends block; keep them off the loop
+            self.loop.run_in_executor(None, send_notification, *notification)
+
+    # Persistence ----------------------------------------------------------
+
+    def _save_state(self):
+        """Queue a save of the timer state, with the keys the threaded core uses
+
+        States queued while a write is in flight are coalesced, so only the
+        newest one is written next and an older one can never land last.
+        """
+        if not self.storage_manager:
+            return
+        self._unsaved = {
+            "pomodoro_time": self.pomodoro_time,
+            "break_time": self.break_time,
+            "current_time_left": self.get_time_left(),
+            "current_mode": self.current_mode,
+            "pomodoro_count": self.pomodoro_count
+        }
+        if self._saving is None:
+            self._write_next()
+
+    def _write_next(self, previous=None):
+        self._saving = None
+        if self._unsaved is None:
+            return
+        state, self._unsaved = self._unsaved, None
+        self._saving = self.loop.run_in_executor(None, self.storage_manager.save_state, state)
+        self._saving.add_done_callback(self._write_next)
+
+    async def flush(self):
+        """Wait until every queued state has been written"""
+        while self._saving is not None:
+            await asyncio.wait([self._saving])
+            # Let the done callback hand over the next queued state
+            await asyncio.sleep(0)
+
+    def _load_state(self):
+        default_state = {
+            "pomodoro_time": self.pomodoro_time,
+            "break_time": self.break_time,
+            "current_time_left": self.current_time_left,
+            "current_mode": self.current_mode,
+            "pomodoro_count": self.pomodoro_count
+        }
+        state = self.storage_manager.load_state(default_state)
+        self.pomodoro_time = state.get("pomodoro_time", self.default_pomodoro)
+        self.break_time = state.get("break_time", self.default_break)
+        self.current_time_left = state.get("current_time_left", self.pomodoro_time)
+        self.current_mode = state.get("current_mode", "pomodoro")
+        self.pomodoro_count = state.get("pomodoro_count", 0)
+        logger.info(f"Loaded async timer state: mode={self.current_mode}, time_left={self.current_time_left}")
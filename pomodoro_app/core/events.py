@@ -0,0 +1,219 @@
+# pomodoro_app/core/events.py
+import collections
+import threading
+import time
+from . import logger
+
+class Event:
+    """A published event; droppable kinds reuse one instance per bus"""
+
+    __slots__ = ("name", "args", "timestamp", "queued")
+
+    def __init__(self, name, args, timestamp):
+        self.name = name
+        self.args = args
+        self.timestamp = timestamp
+        self.queued = False
+
+    def __repr__(self):
+        return f"Event(name={self.name!r}, args={self.args!r}, timestamp={self.timestamp!r})"
+
+SYNC = "sync"
+QUEUED = "queued"
+THROTTLED = "throttled"
+
+# Events only the latest of which matters: asynchronous subscribers get the
+# newest one waiting and older ones are coalesced away. Anything else
+# (completions, status changes) is delivered every time, in order
+DROPPABLE = frozenset({"tick"})
+
+class Subscription:
+    """A subscriber registered on the event bus with its own delivery mode
+
+    ``handlers`` maps event names to callables taking the event arguments.
+    Events for one subscription are delivered in publish order, except that
+    a droppable event still waiting is replaced by a newer one of its kind.
+    Throttled subscribers also pause between droppable deliveries.
+    """
+
+    def __init__(self, name, handlers, mode=SYNC, rate_hz=1.0, droppable=DROPPABLE):
+        if mode not in (SYNC, QUEUED, THROTTLED):
+            raise ValueError(f"Unknown delivery mode: {mode}")
+        self.name = name
+        self.handlers = dict(handlers)
+        self.mode = mode
+        self.interval = 1.0 / rate_hz if rate_hz else 0.0
+        self.delivered = 0
+        self.dropped = 0
+        self.active = True
+        self._pending = collections.deque()
+        # Keys are never removed, so storing a waiting event allocates nothing
+        self._latest = dict.fromkeys(droppable)
+        self._waiting = 0
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def start(self):
+        if self.mode != SYNC and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=f"events-{self.name}", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self.active = False
+            self._cond.notify()
+
+    def offer(self, event):
+        """Queue an event for delivery on this subscription's worker thread"""
+        with self._cond:
+            if event.name not in self._latest:
+                self._pending.append(event)
+            elif self._latest[event.name] is None:
+                self._latest[event.name] = event
+                self._waiting += 1
+            else:
+                # Replaces the one still waiting; a bus slot may be both
+                self.dropped += 1
+                self._latest[event.name] = event
+            self._cond.notify()
+
+    def deliver(self, name, args):
+        """Call the handler for an event, isolating the bus from failures"""
+        handler = self.handlers.get(name)
+        if handler is None:
+            return
+        try:
+            handler(*args)
+            # Synchronous subscribers are delivered to on every publishing thread
+            with self._cond:
+                self.delivered += 1
+        except Exception as e:
+            logger.error(f"Event handler '{self.name}' failed on '{name}': {str(e)}")
+
+    def _next(self):
+        """Remove and return the oldest waiting event; called with _cond held"""
+        event = self._pending[0] if self._pending else None
+        latest_name = None
+        if self._waiting:
+            for name, latest in self._latest.items():
+                if latest is not None and (event is None or latest.timestamp < event.timestamp):
+                    event, latest_name = latest, name
+        if latest_name is not None:
+            self._latest[latest_name] = None
+            self._waiting -= 1
+        else:
+            self._pending.popleft()
+        return event
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self.active and not self._pending and not self._waiting:
+                    self._cond.wait()
+                if not self.active:
+                    return
+                event = self._next()
+                # Read here: a reused slot may be refilled once the lock is released
+                name, args = event.name, event.args
+            self.deliver(name, args)
+            if self.mode == THROTTLED and self.interval and name in self._latest:
+                time.sleep(self.interval)
+
+    def stats(self):
+        return {
+            "name": self.name,
+            "mode": self.mode,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "backlog": len(self._pending) + self._waiting
+        }
+
+class EventBus:
+    """Publish/subscribe bus used by the timer core to notify its consumers
+
+    Synchronous subscribers run inline on the publishing thread and should
+    be cheap. Queued and throttled subscribers each get their own worker
+    thread; publishing only appends to a single queue that a dispatcher
+    thread fans out, so its cost does not depend on how many asynchronous
+    subscribers there are or how slow they are. Droppable events are not
+    allocated per publish: each kind has one preallocated slot that is
+    refilled in place and queued at most once, so a flood of ticks neither
+    grows the queue nor creates objects.
+    """
+
+    def __init__(self, droppable=DROPPABLE):
+        self._sync = ()
+        self._async = ()
+        self.droppable = frozenset(droppable)
+        self._slots = {name: Event(name, (), 0.0) for name in self.droppable}
+        self._queue = collections.deque()
+        self._queue_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._dispatcher = None
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self, name, handlers, mode=SYNC, rate_hz=1.0):
+        """Register a subscriber and return its Subscription"""
+        subscription = Subscription(name, handlers, mode, rate_hz, self.droppable)
+        with self._lock:
+            if mode == SYNC:
+                self._sync = self._sync + (subscription,)
+            else:
+                self._async = self._async + (subscription,)
+                subscription.start()
+                self._ensure_dispatcher()
+        logger.debug(f"Subscribed '{name}' ({mode}) to {sorted(subscription.handlers)}")
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._sync = tuple(s for s in self._sync if s is not subscription)
+            self._async = tuple(s for s in self._async if s is not subscription)
+        subscription.stop()
+
+    def publish(self, name, *args):
+        """Publish an event to every subscriber handling it"""
+        for subscription in self._sync:
+            subscription.deliver(name, args)
+        # Timer, UI and tray threads all publish
+        with self._queue_lock:
+            self.published += 1
+            if not self._async:
+                return
+            slot = self._slots.get(name)
+            if slot is None:
+                self._queue.append(Event(name, args, time.monotonic()))
+            else:
+                slot.args = args
+                slot.timestamp = time.monotonic()
+                if slot.queued:
+                    # Still waiting for the dispatcher, which will see the new value
+                    self.dropped += 1
+                    return
+                slot.queued = True
+                self._queue.append(slot)
+        self._wakeup.set()
+
+    def _ensure_dispatcher(self):
+        if self._dispatcher is None:
+            self._dispatcher = threading.Thread(target=self._dispatch, name="events-dispatcher", daemon=True)
+            self._dispatcher.start()
+
+    def _dispatch(self):
+        queue = self._queue
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            while queue:
+                with self._queue_lock:
+                    event = queue.popleft()
+                    event.queued = False
+                for subscription in self._async:
+                    if event.name in subscription.handlers:
+                        subscription.offer(event)
+
+    def stats(self):
+        """Return delivery statistics for every subscriber"""
+        return [s.stats() for s in self._sync + self._async]
@@ -0,0 +1,254 @@
+# pomodoro_app/core/http_sink.py
+"""Batched delivery of session events to an external HTTP endpoint.
+
+Events are appended to an in-memory batch by a cheap synchronous bus
+handler. A dedicated sender thread seals batches into spool files on disk
+and POSTs them oldest first as JSON over one persistent keep-alive
+connection, retrying with exponential backoff. A spool file is only
+removed once the endpoint accepted it, so batches survive being offline
+and restarts. Records that cannot be spooled (full or missing disk) wait
+in memory, up to max_buffered, oldest dropped first.
+"""
+import http.client
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+from . import logger
+from .events import SYNC
+
+SINK_URL_ENV_VAR = "POMODORO_SINK_URL"
+SINK_TOKEN_ENV_VAR = "POMODORO_SINK_TOKEN"
+
+class DeliveryError(Exception):
+    def __init__(self, message, retryable=True):
+        super().__init__(message)
+        self.retryable = retryable
+
+class HttpSink:
+    def __init__(self, url, spool_dir, batch_size=50, flush_interval=5.0, timeout=10.0,
+                 token=None, min_backoff=1.0, max_backoff=300.0, max_buffered=10000):
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported sink URL: {url}")
+        self.url = url
+        self._scheme = parts.scheme
+        self._netloc = parts.netloc
+        self._path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        self.spool_dir = spool_dir
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.timeout = timeout
+        self.token = token
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.max_buffered = max_buffered
+
+        self._buffer = []
+        self._backing_off = False
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread = None
+        self._conn = None
+        self._seq = 0
+        self._subscriptions = []
+
+        self.started_at = None
+        self.delivered_records = 0
+        self.delivered_batches = 0
+        self.failed_attempts = 0
+        self.rejected_batches = 0
+        self.dropped_records = 0
+
+    # Collecting -----------------------------------------------------------
+
+    def attach(self, events):
+        """Subscribe to completions and task status changes on an event bus"""
+        # The handlers only append to the batch; all I/O happens on the sender thread
+        self._subscriptions.append((events, events.subscribe("http_sink", {
+            "pomodoro_complete": lambda count: self.add({"type": "pomodoro_complete", "count": count}),
+            "task_status": lambda entry: self.add(dict(entry, type="task_status"))
+        }, mode=SYNC)))
+
+    def add(self, record):
+        record.setdefault("at", time.time())
+        with self._cond:
+            if len(self._buffer) >= self.max_buffered:
+                # Spooling keeps failing; keep memory bounded
+                del self._buffer[0]
+                self.dropped_records += 1
+                logger.warning("HTTP sink buffer full, dropped the oldest record")
+            self._buffer.append(record)
+            # While backing off, a full batch must not cut the wait short
+            if len(self._buffer) >= self.batch_size and not self._backing_off:
+                self._cond.notify()
+
+    # Spool ----------------------------------------------------------------
+
+    def _spooled(self):
+        try:
+            return sorted(name for name in os.listdir(self.spool_dir) if name.endswith(".json"))
+        except OSError:
+            # Missing or unusable; _seal reports why once it tries to write
+            return []
+
+    def _seal(self):
+        """Move the buffered records into new spool files of at most batch_size records"""
+        with self._cond:
+            records, self._buffer = self._buffer, []
+        if not records:
+            return
+        sealed = 0
+        try:
+            os.makedirs(self.spool_dir, exist_ok=True)
+            for start in range(0, len(records), self.batch_size):
+                self._seq += 1
+                name = f"batch_{time.time_ns():020d}_{self._seq:06d}.json"
+                fd, tmp_path = tempfile.mkstemp(dir=self.spool_dir, suffix=".tmp")
+                try:
+                    with os.fdopen(fd, "w", encoding="utf-8") as f:
+                        json.dump(records[start:start + self.batch_size], f, separators=(",", ":"))
+                    os.replace(tmp_path, os.path.join(self.spool_dir, name))
+                except BaseException:
+                    os.unlink(tmp_path)
+                    raise
+                sealed = start + self.batch_size
+        except OSError:
+            # Put back what was not spooled, ahead of anything added meanwhile
+            with self._cond:
+                self._buffer[:0] = records[sealed:]
+            raise
+
+    # Delivery -------------------------------------------------------------
+
+    def _connection(self):
+        if self._conn is None:
+            conn_class = http.client.HTTPSConnection if self._scheme == "https" else http.client.HTTPConnection
+            self._conn = conn_class(self._netloc, timeout=self.timeout)
+        return self._conn
+
+    def _close_connection(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _post(self, body):
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        try:
+            conn = self._connection()
+            conn.request("POST", self._path, body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException) as e:
+            # The keep-alive connection may have been dropped; reconnect next time
+            self._close_connection()
+            raise DeliveryError(f"Connection to sink failed: {str(e)}")
+        if response.status >= 300:
+            retryable = response.status >= 500 or response.status in (408, 429)
+            raise DeliveryError(f"Sink answered HTTP {response.status}", retryable)
+
+    def _deliver_spool(self):
+        """Send spooled batches oldest first; returns False on a retryable failure"""
+        for name in self._spooled():
+            path = os.path.join(self.spool_dir, name)
+            with open(path, "rb") as f:
+                body = f.read()
+            try:
+                self._post(body)
+            except DeliveryError as e:
+                self.failed_attempts += 1
+                if e.retryable:
+                    logger.warning(f"Delivery of {name} failed, will retry: {str(e)}")
+                    return False
+                # Resending a batch the endpoint rejects would block everything behind it
+                logger.error(f"Sink rejected {name}, moving it aside: {str(e)}")
+                rejected_dir = os.path.join(self.spool_dir, "rejected")
+                os.makedirs(rejected_dir, exist_ok=True)
+                os.replace(path, os.path.join(rejected_dir, name))
+                self.rejected_batches += 1
+                continue
+            os.unlink(path)
+            self.delivered_batches += 1
+            self.delivered_records += len(json.loads(body))
+        return True
+
+    def _run(self):
+        backoff = 0.0
+        while True:
+            with self._cond:
+                if self._running:
+                    wait = backoff or self.flush_interval
+                    self._backing_off = bool(backoff)
+                    if backoff or len(self._buffer) < self.batch_size:
+                        self._cond.wait(wait)
+                    self._backing_off = False
+                running = self._running
+            try:
+                self._seal()
+                delivered = self._deliver_spool()
+            except OSError as e:
+                # Full disk, or the spool directory removed or unwritable
+                logger.error(f"HTTP sink spool failed, will retry: {str(e)}")
+                delivered = False
+            if delivered:
+                backoff = 0.0
+            elif running:
+                # Exponential backoff with jitter so many clients do not retry in step
+                backoff = min(self.max_backoff, max(self.min_backoff, backoff * 2))
+                backoff *= random.uniform(0.8, 1.2)
+            if not running:
+                self._close_connection()
+                return
+
+    # Lifecycle ------------------------------------------------------------
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self.started_at = time.monotonic()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="http-sink", daemon=True)
+        self._thread.start()
+        logger.info(f"HTTP sink delivering to {self.url} ({len(self._spooled())} spooled batches)")
+
+    def stop(self, timeout=5.0):
+        """Spool whatever is buffered, try one last delivery and stop"""
+        for events, subscription in self._subscriptions:
+            events.unsubscribe(subscription)
+        self._subscriptions = []
+        if self._thread is None:
+            try:
+                self._seal()
+            except OSError as e:
+                logger.error(f"HTTP sink could not spool {len(self._buffer)} records: {str(e)}")
+            return
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def flush(self):
+        """Wake the sender to deliver buffered records now"""
+        with self._cond:
+            self._cond.notify()
+
+    def stats(self):
+        elapsed = time.monotonic() - self.started_at if self.started_at else 0.0
+        with self._cond:
+            buffered = len(self._buffer)
+        return {
+            "delivered_records": self.delivered_records,
+            "delivered_batches": self.delivered_batches,
+            "records_per_second": self.delivered_records / elapsed if elapsed else 0.0,
+            "failed_attempts": self.failed_attempts,
+            "rejected_batches": self.rejected_batches,
+            "dropped_records": self.dropped_records,
+            "buffered_records": buffered,
+            "spooled_batches": len(self._spooled())
+        }
@@ -0,0 +1,149 @@
+# pomodoro_app/core/instance.py
+import json
+import os
+import socket
+import threading
+import time
+from . import logger
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+DEFAULT_STORAGE_PATH = os.path.join(os.path.expanduser("~"), ".pomodoro_app")
+LOCK_FILE = "pomodoro.lock"
+SOCKET_FILE = "pomodoro.sock"
+
+def is_supported():
+    """Check whether single-instance enforcement is available on this platform"""
+    return fcntl is not None and hasattr(socket, "AF_UNIX")
+
+class SingleInstance:
+    """Single-instance lock plus a Unix-domain socket for command hand-off
+
+    The first launch takes an exclusive lock on a file in the storage
+    directory and listens on a socket next to it. Later launches fail to
+    take the lock and forward their command with ``send_command`` instead.
+    """
+
+    def __init__(self, storage_path=None):
+        self.storage_path = storage_path or DEFAULT_STORAGE_PATH
+        self.lock_path = os.path.join(self.storage_path, LOCK_FILE)
+        self.socket_path = os.path.join(self.storage_path, SOCKET_FILE)
+        self._lock_file = None
+        self._server = None
+        self._thread = None
+
+    def acquire(self):
+        """Try to become the primary instance"""
+        if not is_supported():
+            logger.warning("Single-instance lock not supported on this platform")
+            return True
+
+        os.makedirs(self.storage_path, exist_ok=True)
+        lock_file = open(self.lock_path, "a+")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            logger.info("Another instance is already running")
+            return False
+
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(str(os.getpid()))
+        lock_file.flush()
+        self._lock_file = lock_file
+        logger.info(f"Acquired single-instance lock at {self.lock_path}")
+        return True
+
+    def serve(self, handler):
+        """Listen for commands from later launches and pass them to handler
+
+        The handler receives the decoded command dict on the listener thread
+        and returns True if the command was accepted.
+        """
+        if self._lock_file is None:
+            return False
+
+        # We hold the lock, so any existing socket file is stale
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+        try:
+            self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._server.bind(self.socket_path)
+            self._server.listen(4)
+        except OSError as e:
+            logger.error(f"Failed to open instance socket: {str(e)}")
+            self._server = None
+            return False
+
+        self._thread = threading.Thread(target=self._serve_forever, args=(handler,), daemon=True)
+        self._thread.start()
+        logger.info(f"Listening for instance commands on {self.socket_path}")
+        return True
+
+    def _serve_forever(self, handler):
+        while self._server is not None:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                break
+            with conn:
+                try:
+                    conn.settimeout(1.0)
+                    command = json.loads(_read_line(conn))
+                    logger.info(f"Received instance command: {command.get('action')}")
+                    ok = handler(command)
+                    conn.sendall(b"ok\n" if ok else b"error\n")
+                except Exception as e:
+                    logger.error(f"Failed to handle instance command: {str(e)}")
+
+    def release(self):
+        """Stop listening and release the lock"""
+        server, self._server = self._server, None
+        if server is not None:
+            server.close()
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+            logger.debug("Released single-instance lock")
+
+def _read_line(conn):
+    data = b""
+    while not data.endswith(b"\n"):
+        chunk = conn.recv(4096)
+        if not chunk:
+            break
+        data += chunk
+    return data.decode("utf-8")
+
+def send_command(command, storage_path=None, timeout=2.0):
+    """Forward a command to the running instance
+
+    Returns True if the running instance accepted the command.
+    """
+    socket_path = os.path.join(storage_path or DEFAULT_STORAGE_PATH, SOCKET_FILE)
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+                conn.settimeout(timeout)
+                conn.connect(socket_path)
+                conn.sendall(json.dumps(command).encode("utf-8") + b"\n")
+                return _read_line(conn).strip() == "ok"
+        except (FileNotFoundError, ConnectionRefusedError) as e:
+            # The running instance may still be starting up
+            if time.monotonic() >= deadline:
+                logger.error(f"Failed to reach running instance: {str(e)}")
+                return False
+            time.sleep(0.05)
+        except OSError as e:
+            logger.error(f"Failed to reach running instance: {str(e)}")
+            return False
@@ -1,39 +1,285 @@
 # logger.py
 
+import atexit
+import contextlib
+import gzip
 import logging
+import logging.handlers
 import os
+import queue
+import shutil
+import sys
+import threading
+import time
 from datetime import datetime
-from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+DEFAULT_LOG_DIR = os.path.join(os.path.expanduser("~"), ".pomodoro_app", "logs")
+LOG_DIR_ENV_VAR = "POMODORO_LOG_DIR"
+LOG_FILE = "pomodoro.log"
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+# A rotated file is compressed once no process has written to it for this
+# long; one that had it open may still append a record right after the rename
+ROTATED_QUIET_SECONDS = 1.0
+
+class CompressingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Rotates on size or age, gzips rotated files in the background and
+    deletes the oldest ones to keep the log directory within a byte budget
+
+    The app and the command line tools append to the same file from
+    separate processes. Rotation and pruning hold an flock on a sidecar
+    ``.lock`` file, the rotating process re-checks that the file still
+    needs rotating once it holds it, and a process whose open file was
+    rotated away by another one reopens the path before writing.
+    """
+
+    def __init__(self, filename, max_bytes, max_age_days, budget_bytes):
+        super().__init__(filename, maxBytes=max_bytes, encoding="utf-8", delay=True)
+        self.max_age_seconds = max_age_days * 86400
+        self.budget_bytes = budget_bytes
+        self.opened_at = self._first_record_time()
+        self._compress_queue = queue.Queue()
+        self._compressor = None
+
+    def _first_record_time(self):
+        """Time of the first record in the active file, so age survives restarts"""
+        try:
+            with open(self.baseFilename, encoding="utf-8") as f:
+                return datetime.strptime(f.readline()[:19], TIME_FORMAT).timestamp()
+        except (OSError, ValueError):
+            return time.time()
+
+    @contextlib.contextmanager
+    def _rotation_lock(self):
+        if fcntl is None:
+            yield
+            return
+        with open(f"{self.baseFilename}.lock", "a") as lock_file:
+            # Released when the file is closed
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    def _follow_rotation(self):
+        """Reopen the path if another process rotated the file we have open"""
+        try:
+            if os.fstat(self.stream.fileno()).st_ino == os.stat(self.baseFilename).st_ino:
+                return
+        except FileNotFoundError:
+            pass
+        self.stream.close()
+        self.stream = None
+        self.opened_at = self._first_record_time()
+
+    def _needs_rollover(self):
+        try:
+            size = os.path.getsize(self.baseFilename)
+        except FileNotFoundError:
+            return False
+        if self.maxBytes > 0 and size >= self.maxBytes:
+            return True
+        return size > 0 and time.time() - self._first_record_time() >= self.max_age_seconds
+
+    def shouldRollover(self, record):
+        if self.stream is not None:
+            self._follow_rotation()
+        if record.created - self.opened_at >= self.max_age_seconds:
+            return os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename) > 0
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        with self._rotation_lock():
+            # Another process may have rotated it while we waited for the lock
+            if self._needs_rollover():
+                rotated = f"{self.baseFilename}.{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}"
+                os.rename(self.baseFilename, rotated)
+                self._enqueue(rotated)
+        self.opened_at = self._first_record_time()
+
+    def _enqueue(self, path):
+        if self._compressor is None:
+            self._compressor = threading.Thread(target=self._compress_loop, name="log-compressor", daemon=True)
+            self._compressor.start()
+        self._compress_queue.put(path)
+
+    def _compress_loop(self):
+        while True:
+            path = self._compress_queue.get()
+            try:
+                while time.time() - os.path.getmtime(path) < ROTATED_QUIET_SECONDS:
+                    time.sleep(ROTATED_QUIET_SECONDS)
+                with open(path, "rb") as src, gzip.open(f"{path}.gz", "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+                os.unlink(path)
+                self.enforce_budget()
+            except OSError as e:
+                # Logging through ourselves here could recurse into another rotation
+                print(f"Failed to compress log file {path}: {e}", file=sys.stderr)
+
+    def enforce_budget(self):
+        """Delete the oldest compressed files until the directory is within budget"""
+        with self._rotation_lock():
+            self._prune_rotated()
+
+    def _prune_rotated(self):
+        directory, base = os.path.split(self.baseFilename)
+        rotated = sorted(name for name in os.listdir(directory)
+                         if name.startswith(f"{base}.") and name != f"{base}.lock")
+        sizes = [(os.path.join(directory, name), os.path.getsize(os.path.join(directory, name))) for name in rotated]
+
+        total = sum(size for _, size in sizes)
+        if os.path.exists(self.baseFilename):
+            total += os.path.getsize(self.baseFilename)
+        for path, size in sizes:
+            if total <= self.budget_bytes:
+                break
+            # Files still waiting for compression are left to the next pass
+            if path.endswith(".gz"):
+                os.unlink(path)
+                total -= size
+
+class RepeatFilter(logging.Filter):
+    """Collapses identical messages from the same call site
+
+    The first occurrence is logged; repeats within ``interval`` seconds are
+    counted and dropped. Their "repeated N times" summary is logged by the
+    next occurrence after the interval or by flush(), whichever comes first.
+    """
+
+    def __init__(self, interval=60.0, max_keys=1024):
+        super().__init__()
+        self.interval = interval
+        self.max_keys = max_keys
+        # key -> [first occurrence time, repeats dropped, last dropped record]
+        self._seen = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if getattr(record, "repeat_summary", False):
+            return True
+        key = (record.pathname, record.lineno, record.getMessage())
+        with self._lock:
+            seen = self._seen.get(key)
+            if seen is not None and record.created - seen[0] < self.interval:
+                seen[1] += 1
+                seen[2] = record
+                return False
+
+            self._seen[key] = [record.created, 0, None]
+            if len(self._seen) > self.max_keys:
+                self._prune(record.created)
+
+        if seen is not None and seen[1]:
+            record.msg = self._summary(record.getMessage(), seen[1])
+            record.args = ()
+        return True
+
+    def _summary(self, message, repeats):
+        return f"{message} (repeated {repeats} more times in {self.interval:.0f}s)"
+
+    def _prune(self, now):
+        for key in [key for key, seen in self._seen.items() if now - seen[0] >= self.interval]:
+            del self._seen[key]
+
+    def flush(self, now=None):
+        """Log the summaries of repeats whose interval has passed, or of all
+        pending repeats when now is None; returns the number logged"""
+        with self._lock:
+            expired = [key for key, seen in self._seen.items()
+                       if now is None or now - seen[0] >= self.interval]
+            pending = [self._seen.pop(key) for key in expired]
+
+        summaries = 0
+        for _, repeats, last in pending:
+            if not repeats:
+                continue
+            summary = logging.makeLogRecord(last.__dict__)
+            summary.msg = self._summary(last.getMessage(), repeats)
+            summary.args = ()
+            summary.exc_info = summary.exc_text = None
+            summary.repeat_summary = True
+            logging.getLogger(last.name).handle(summary)
+            summaries += 1
+        return summaries
 
 class Logger:
-    def __init__(self, log_level=logging.INFO):
+    def __init__(self, log_level=logging.INFO, log_dir=None, max_bytes=2 * 1024 * 1024,
+                 max_age_days=7, budget_bytes=20 * 1024 * 1024, repeat_interval=60.0, log_file=True):
         self.logger = logging.getLogger('pomodoro')
         self.logger.setLevel(log_level)
-        logs_dir = Path('logs')
-        logs_dir.mkdir(exist_ok=True)
-        log_file = logs_dir / f"pomodoro_{datetime.now().strftime('%Y-%m-%d')}.log"
-        file_handler = logging.FileHandler(log_file)
-        console_handler = logging.StreamHandler()
         formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        file_handler.setFormatter(formatter)
+        self.file_handler = None
+        if log_file:
+            logs_dir = log_dir or os.environ.get(LOG_DIR_ENV_VAR) or DEFAULT_LOG_DIR
+            os.makedirs(logs_dir, exist_ok=True)
+            self.file_handler = CompressingRotatingFileHandler(
+                os.path.join(logs_dir, LOG_FILE), max_bytes, max_age_days, budget_bytes)
+            self.file_handler.setFormatter(formatter)
+            self.logger.addHandler(self.file_handler)
+        console_handler = logging.StreamHandler()
         console_handler.setFormatter(formatter)
-        self.logger.addHandler(file_handler)
         self.logger.addHandler(console_handler)
+        self.repeat_filter = RepeatFilter(repeat_interval)
+        self.logger.addFilter(self.repeat_filter)
+        # Repeats of a message that stops recurring would otherwise never be reported
+        self._closed = threading.Event()
+        threading.Thread(target=self._flush_loop, name="log-repeat-flush", daemon=True).start()
+        atexit.register(self.close)
         self.logger.info('Logger initialized')
     def get_logger(self):
         return self.logger
+    def _flush_loop(self):
+        while not self._closed.wait(self.repeat_filter.interval):
+            self.repeat_filter.flush(time.time())
+    def close(self):
+        """Log every pending repeat summary; registered to run at exit"""
+        self._closed.set()
+        self.repeat_filter.flush()
+    def close_file(self):
+        """Stop writing to the log file, keeping the console handler"""
+        if self.file_handler is not None:
+            self.logger.removeHandler(self.file_handler)
+            self.file_handler.close()
+            self.file_handler = None
 
 _logger_instance = None
+_settings = {}
+
+def configure(**settings):
+    """Set Logger options (log_dir, max_bytes, max_age_days, budget_bytes,
+    repeat_interval, log_file); must be called before the first get_logger()"""
+    if _logger_instance is not None:
+        _logger_instance.logger.warning("Logger already initialized, ignoring new settings")
+        return
+    _settings.update((key, value) for key, value in settings.items() if value is not None)
+
+def disable_file_logging():
+    """Log to the console only in this process
+
+    For worker processes, which must not append to or rotate the log file
+    their parent writes. Works before and after the first get_logger(),
+    so also when the logger was inherited through fork.
+    """
+    _settings["log_file"] = False
+    if _logger_instance is not None:
+        _logger_instance.close_file()
 
 def get_logger():
     global _logger_instance
     if _logger_instance is None:
-        _logger_instance = Logger()
+        _logger_instance = Logger(**_settings)
     return _logger_instance.get_logger()
 
-def debug(msg): get_logger().debug(msg)
-def info(msg): get_logger().info(msg)
-def warning(msg): get_logger().warning(msg)
-def error(msg): get_logger().error(msg)
-def critical(msg): get_logger().critical(msg)
-def exception(msg): get_logger().exception(msg)
+# stacklevel points records at the caller so the repeat filter groups by call site
+def debug(msg): get_logger().debug(msg, stacklevel=2)
+def info(msg): get_logger().info(msg, stacklevel=2)
+def warning(msg): get_logger().warning(msg, stacklevel=2)
+def error(msg): get_logger().error(msg, stacklevel=2)
+def critical(msg): get_logger().critical(msg, stacklevel=2)
+def exception(msg): get_logger().exception(msg, stacklevel=2)
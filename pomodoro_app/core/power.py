@@ -0,0 +1,29 @@
+# pomodoro_app/core/power.py
+import time
+from . import logger
+
+class WakeupCounter:
+    """Counts periodic wakeups so the power cost of a loop can be reported"""
+
+    def __init__(self, name):
+        self.name = name
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.since = time.monotonic()
+
+    def tick(self):
+        self.count += 1
+
+    def rate_per_minute(self):
+        """Average wakeups per minute since the last reset"""
+        elapsed = time.monotonic() - self.since
+        if elapsed <= 0:
+            return 0.0
+        return self.count * 60.0 / elapsed
+
+    def report(self, mode):
+        rate = self.rate_per_minute()
+        logger.info(f"{self.name} wakeups in {mode} mode: {rate:.1f}/min ({self.count} total)")
+        return rate
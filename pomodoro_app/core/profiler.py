@@ -0,0 +1,137 @@
+# pomodoro_app/core/profiler.py
+"""On-demand profiling of the running app.
+
+A profiling session is started and stopped with SIGUSR1 or from the tray
+menu. It runs ``cProfile`` on the Tk thread and, optionally, a sampling
+thread that periodically captures the stacks of every other thread (timer,
+tray, event bus workers). When stopped it writes a ``.pstats`` file and a
+collapsed-stack file (one ``frame;frame;frame count`` line per stack, the
+input format of flamegraph tools). Nothing is installed while no session
+is running.
+"""
+import cProfile
+import collections
+import os
+import signal
+import sys
+import threading
+from datetime import datetime
+from . import logger
+
+class StackSampler:
+    """Samples the Python stacks of all other threads at a fixed interval"""
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.counts = collections.Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.counts[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def write_collapsed(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.counts.most_common():
+                f.write(f"{stack} {count}\n")
+
+class ProfilingSession:
+    """One cProfile run on the calling thread plus an optional stack sampler"""
+
+    def __init__(self, sampling=False, interval=0.005):
+        self.started_at = datetime.now()
+        self.profile = cProfile.Profile()
+        self.sampler = StackSampler(interval) if sampling else None
+
+    def start(self):
+        if self.sampler is not None:
+            self.sampler.start()
+        self.profile.enable()
+
+    def stop(self, output_dir):
+        """Stop profiling and write the results; returns the written paths"""
+        self.profile.disable()
+        if self.sampler is not None:
+            self.sampler.stop()
+
+        os.makedirs(output_dir, exist_ok=True)
+        stem = os.path.join(output_dir, f"profile_{self.started_at.strftime('%Y%m%d_%H%M%S')}")
+        paths = [f"{stem}.pstats"]
+        self.profile.dump_stats(paths[0])
+        if self.sampler is not None:
+            paths.append(f"{stem}.collapsed")
+            self.sampler.write_collapsed(paths[1])
+        return paths
+
+_session = None
+_output_dir = None
+_sampling = False
+_lock = threading.Lock()
+
+def configure(output_dir=None, sampling=None):
+    """Set where profiles are written and whether stacks are sampled"""
+    global _output_dir, _sampling
+    if output_dir is not None:
+        _output_dir = output_dir
+    if sampling is not None:
+        _sampling = sampling
+
+def is_active():
+    return _session is not None
+
+def toggle():
+    """Start a profiling session, or stop the running one and save it
+
+    cProfile only sees the thread this is called on, so call it from the
+    Tk thread; other threads are covered by the stack sampler.
+    """
+    global _session
+    with _lock:
+        if _session is None:
+            _session = ProfilingSession(_sampling)
+            _session.start()
+            logger.info("Profiling started")
+            return None
+
+        session, _session = _session, None
+    output_dir = _output_dir or os.path.join(os.path.expanduser("~"), ".pomodoro_app", "profiles")
+    try:
+        paths = session.stop(output_dir)
+        logger.info(f"Profiling stopped, wrote {', '.join(paths)}")
+        return paths
+    except Exception as e:
+        logger.error(f"Failed to write profile: {str(e)}")
+        return None
+
+def install_handler(toggle_signal=getattr(signal, "SIGUSR1", None)):
+    """Toggle profiling when the process receives the given signal"""
+    if toggle_signal is None:
+        return
+    try:
+        # Python runs signal handlers on the main thread, which is the Tk thread
+        signal.signal(toggle_signal, lambda signum, frame: toggle())
+        logger.debug(f"Profiler toggle bound to signal {toggle_signal}")
+    except ValueError:
+        logger.warning("Could not bind profiler signal outside the main thread")
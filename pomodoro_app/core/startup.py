@@ -0,0 +1,43 @@
+# pomodoro_app/core/startup.py
+"""Startup milestones and background loading for a progressive launch.
+
+The window skeleton is painted before any state is read; storage loading,
+history hydration and tray/notification backend initialization run on a
+worker thread and hand their results back to the Tk loop when done.
+"""
+import threading
+import time
+from . import logger
+
+class StartupMetrics:
+    """Records named milestones relative to process start"""
+
+    def __init__(self, started=None):
+        self.started = time.perf_counter() if started is None else started
+        self.marks = {}
+
+    def mark(self, name):
+        elapsed = time.perf_counter() - self.started
+        self.marks[name] = elapsed
+        logger.info(f"Startup: {name.replace('_', ' ')} after {elapsed * 1000:.0f} ms")
+        return elapsed
+
+    def report(self):
+        """Milestones in milliseconds"""
+        return {name: round(elapsed * 1000, 1) for name, elapsed in self.marks.items()}
+
+def load_in_background(root, work, on_done, on_error=None):
+    """Run work() on a worker thread and pass its result to on_done on the Tk loop"""
+    def run():
+        try:
+            result = work()
+        except Exception as e:
+            logger.exception("Background startup failed")
+            if on_error is not None:
+                root.after(0, on_error, e)
+            return
+        root.after(0, on_done, result)
+
+    thread = threading.Thread(target=run, name="startup-loader", daemon=True)
+    thread.start()
+    return thread
@@ -1,15 +1,19 @@
 # pomodoro_app/core/timer.py
-import time
+import math
 import threading
-from . import logger
+from . import logger, trace
+from .events import EventBus
+from .power import WakeupCounter
+from .clock import SystemClock
 from ..utils.notifications import send_notification
 
 class PomodoroTimerCore:
     """Core timer functionality separate from UI"""
     
-    def __init__(self, storage_manager=None):
+    def __init__(self, storage_manager=None, events=None, clock=None):
         logger.info("Initializing PomodoroTimerCore")
         self.storage_manager = storage_manager
+        self.clock = clock or SystemClock()
         
         # Timer default values
         self.default_pomodoro = 25 * 60  # 25 minutes
@@ -25,156 +29,267 @@ class PomodoroTimerCore:
         self.current_mode = "pomodoro"
         self.pomodoro_count = 0
         
-        # Callback functions to be set by UI
-        self.on_tick = None
-        self.on_pomodoro_complete = None
-        self.on_break_complete = None
+        # Event bus notifying the UI and other subscribers
+        # Events: "tick" (time_left, mode), "pomodoro_complete" (count), "break_complete" ()
+        self.events = events or EventBus()
         
-        # Timer thread
+        # Commands may come from the Tk thread, the tray thread and remote
+        # clients at once; this lock serializes them with the timer thread.
+        # Ticks are published while holding it, so a superseded timer thread
+        # can never publish after a command has replaced it. Storage writes
+        # happen after it is released: state is copied under the lock with a
+        # sequence number, and a copy older than one already written is skipped.
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()
+        self._save_seq = 0
+        self._saved_seq = 0
+        
+        # Timer thread, woken early by pause/reset/mode changes
         self.timer_thread = None
+        self._wake = threading.Event()
+        self._generation = 0
+        self._deadline = None
+        
+        # In background mode the timer thread sleeps until the session deadline
+        # instead of waking every second to publish ticks
+        self.background = False
+        self.wakeups = WakeupCounter("timer")
         
         # Load saved state if storage manager is provided
         if self.storage_manager:
             self._load_state()
     
+    def attach_storage(self, storage_manager):
+        """Adopt a storage manager opened after construction and load its state"""
+        with self._lock:
+            if self.timer_running:
+                logger.warning("Cannot load timer state while the timer is running")
+                return False
+            self.storage_manager = storage_manager
+            self._load_state()
+            return True
+    
     def start(self):
         """Start or resume the timer"""
-        if self.timer_running:
-            logger.warning("Attempted to start timer that is already running")
-            return False
+        with self._lock:
+            if self.timer_running:
+                logger.warning("Attempted to start timer that is already running")
+                return False
+                
+            logger.info(f"Starting timer in {self.current_mode} mode")
+            self._deadline = self.clock.monotonic() + self.current_time_left
+            self._generation += 1
+            self.timer_running = True
             
-        logger.info(f"Starting timer in {self.current_mode} mode")
-        self.timer_running = True
-        
-        # Start timer thread
-        self.timer_thread = threading.Thread(target=self._run_timer, daemon=True)
-        self.timer_thread.start()
-        self._save_state()
+            # Start timer thread
+            self.timer_thread = threading.Thread(target=self._run_timer, args=(self._generation,),
+                                                 name="pomodoro-timer", daemon=True)
+            self.timer_thread.start()
+            pending = self._copy_state()
+        self._write_state(pending)
         return True
     
     def pause(self):
         """Pause the timer"""
+        with self._lock:
+            if not self._pause():
+                return False
+            pending = self._copy_state()
+        self._write_state(pending)
+        return True
+    
+    def _pause(self):
+        """Stop the running session, keeping its time left; called with the lock held"""
         if not self.timer_running:
             logger.warning("Attempted to pause timer that is not running")
             return False
             
+        self.current_time_left = self.get_time_left()
         logger.info(f"Pausing timer with {self.current_time_left} seconds left")
         self.timer_running = False
-        self._save_state()
+        self._wake.set()
         return True
     
     def reset(self):
         """Reset the timer"""
-        was_running = self.timer_running
-        self.timer_running = False
-        
-        # Wait for timer thread to stop if it was running
-        if was_running and self.timer_thread and self.timer_thread.is_alive():
-            logger.debug("Waiting for timer thread to stop")
-            self.timer_thread.join(timeout=1.0)
-        
-        # Reset timer state
-        if self.current_mode == "pomodoro":
-            logger.info(f"Resetting pomodoro timer to {self.pomodoro_time} seconds")
-            self.current_time_left = self.pomodoro_time
-        else:
-            logger.info(f"Resetting break timer to {self.break_time} seconds")
-            self.current_time_left = self.break_time
-        
-        # Notify UI
-        if self.on_tick:
-            self.on_tick(self.current_time_left, self.current_mode)
-        
-        self._save_state()
+        with self._lock:
+            # The timer thread checks timer_running under the lock, so it
+            # cannot act on the old session once this returns; no need to join it
+            self.timer_running = False
+            self._wake.set()
+            
+            # Reset timer state
+            if self.current_mode == "pomodoro":
+                logger.info(f"Resetting pomodoro timer to {self.pomodoro_time} seconds")
+                self.current_time_left = self.pomodoro_time
+            else:
+                logger.info(f"Resetting break timer to {self.break_time} seconds")
+                self.current_time_left = self.break_time
+            
+            # Notify subscribers
+            self.events.publish("tick", self.current_time_left, self.current_mode)
+            pending = self._copy_state()
+        self._write_state(pending)
         return True
     
-    def _run_timer(self):
-        """The main timer loop (runs in a separate thread)"""
-        logger.debug(f"Timer thread started in {self.current_mode} mode")
-        
-        while self.current_time_left > 0 and self.timer_running:
-            # Notify UI of current time
-            if self.on_tick:
-                self.on_tick(self.current_time_left, self.current_mode)
+    def switch_mode(self):
+        """Stop the timer and switch between pomodoro and break, resetting the time left"""
+        with self._lock:
+            if self.timer_running:
+                self._pause()
             
-            # Wait one second
-            time.sleep(1)
+            self.current_mode = "break" if self.current_mode == "pomodoro" else "pomodoro"
+            self.current_time_left = self.pomodoro_time if self.current_mode == "pomodoro" else self.break_time
+            logger.info(f"Switched to {self.current_mode} mode")
             
-            # Decrement time if still running
-            if self.timer_running:
-                self.current_time_left -= 1
-                # Save state periodically (every 10 seconds to reduce disk writes)
-                if self.current_time_left % 10 == 0:
-                    self._save_state()
+            # Notify subscribers
+            self.events.publish("tick", self.current_time_left, self.current_mode)
+            mode = self.current_mode
+            pending = self._copy_state()
+        self._write_state(pending)
+        return mode
+    
+    def get_time_left(self):
+        """Seconds left in the current session, derived from the deadline while running"""
+        with self._lock:
+            if self.timer_running and self._deadline is not None:
+                return max(0, math.ceil(self._deadline - self.clock.monotonic()))
+            return self.current_time_left
+    
+    def set_background_mode(self, enabled):
+        """Switch between per-second ticking and sleeping until the deadline"""
+        with self._lock:
+            if enabled == self.background:
+                return
+            logger.info(f"Timer {'entering' if enabled else 'leaving'} background mode")
+            self.wakeups.report("background" if self.background else "foreground")
+            self.background = enabled
+            self.wakeups.reset()
+            self._wake.set()
+    
+    def _is_current(self, generation):
+        return self.timer_running and generation == self._generation
+    
+    def _run_timer(self, generation):
+        """The main timer loop (runs in a separate thread)"""
+        logger.debug(f"Timer thread started in {self.current_mode} mode")
+        last_saved = self.current_time_left
+        notification = None
         
-        # Check if timer completed (not just paused or reset)
-        if self.timer_running:
-            if self.current_mode == "pomodoro":
-                logger.info("Pomodoro completed")
-                self.pomodoro_count += 1
-                
-                # Notify UI
-                if self.on_pomodoro_complete:
-                    self.on_pomodoro_complete(self.pomodoro_count)
-                
-                # Switch to break mode
-                self.current_mode = "break"
-                self.current_time_left = self.break_time
-                self.timer_running = False
+        while True:
+            self.wakeups.tick()
+            pending = None
+            with self._lock:
+                # Paused, reset or restarted while this thread was waiting
+                if not self._is_current(generation):
+                    break
+                # Cleared before reading the state: a command arriving after
+                # this point sets the event again and cuts the wait short
+                self._wake.clear()
+                trace.record(trace.TIMER_WAKE, self.current_time_left)
+                remaining = self._deadline - self.clock.monotonic()
+                self.current_time_left = max(0, math.ceil(remaining))
+                if self.current_time_left <= 0:
+                    notification = self._complete_session()
+                    pending = self._copy_state()
+                    break
                 
-                # Send notification
-                send_notification(
-                    "Pomodoro Completed! 🎉",
-                    "Time for a break!"
-                )
-            else:
-                logger.info("Break completed")
-                
-                # Notify UI
-                if self.on_break_complete:
-                    self.on_break_complete()
-                
-                # Switch to pomodoro mode
-                self.current_mode = "pomodoro"
-                self.current_time_left = self.pomodoro_time
-                self.timer_running = False
+                if self.background:
+                    # Sleep until the session ends unless woken by a command
+                    timeout = remaining
+                else:
+                    # Notify subscribers of current time, then wait for the next second
+                    trace.record(trace.TIMER_TICK, self.current_time_left)
+                    self.events.publish("tick", self.current_time_left, self.current_mode)
+                    timeout = remaining - (self.current_time_left - 1)
                 
-                # Send notification
-                send_notification(
-                    "Break Finished!",
-                    "Ready to focus again?"
-                )
+                # Save state periodically (every 10 seconds to reduce disk writes)
+                if last_saved - self.current_time_left >= 10:
+                    last_saved = self.current_time_left
+                    pending = self._copy_state()
             
-            # Save state after completing a timer session
-            self._save_state()
+            self._write_state(pending)
+            self.clock.wait(self._wake, timeout)
         
+        # Save the completed session outside the lock
+        self._write_state(pending)
+        # Desktop notifications can be slow; send them without holding up commands
+        if notification:
+            send_notification(*notification)
         logger.debug("Timer thread ending")
     
+    def _complete_session(self):
+        """Finish the running session and switch modes; called with the lock held"""
+        trace.record(trace.TIMER_COMPLETE, self.current_mode)
+        if self.current_mode == "pomodoro":
+            logger.info("Pomodoro completed")
+            self.pomodoro_count += 1
+            
+            # Notify subscribers
+            self.events.publish("pomodoro_complete", self.pomodoro_count)
+            
+            # Switch to break mode
+            self.current_mode = "break"
+            self.current_time_left = self.break_time
+            notification = ("Pomodoro Completed! 🎉", "Time for a break!")
+        else:
+            logger.info("Break completed")
+            
+            # Notify subscribers
+            self.events.publish("break_complete")
+            
+            # Switch to pomodoro mode
+            self.current_mode = "pomodoro"
+            self.current_time_left = self.pomodoro_time
+            notification = ("Break Finished!", "Ready to focus again?")
+        self.timer_running = False
+        return notification
+    
     def set_timer_duration(self, pomodoro_time, break_time):
         """Update timer durations"""
-        self.pomodoro_time = pomodoro_time
-        self.break_time = break_time
-        
-        # If timer is not running, update current_time_left
-        if not self.timer_running:
-            if self.current_mode == "pomodoro":
-                self.current_time_left = pomodoro_time
-            else:
-                self.current_time_left = break_time
-        
-        self._save_state()
+        with self._lock:
+            self.pomodoro_time = pomodoro_time
+            self.break_time = break_time
+            
+            # If timer is not running, update current_time_left
+            if not self.timer_running:
+                if self.current_mode == "pomodoro":
+                    self.current_time_left = pomodoro_time
+                else:
+                    self.current_time_left = break_time
+            
+            pending = self._copy_state()
+        self._write_state(pending)
     
     def _save_state(self):
         """Save timer state using storage manager"""
-        if self.storage_manager:
-            state = {
-                "pomodoro_time": self.pomodoro_time,
-                "break_time": self.break_time,
-                "current_time_left": self.current_time_left,
-                "current_mode": self.current_mode,
-                "pomodoro_count": self.pomodoro_count
-            }
+        with self._lock:
+            pending = self._copy_state()
+        self._write_state(pending)
+    
+    def _copy_state(self):
+        """Copy the state to save and number it; called with the lock held"""
+        if not self.storage_manager:
+            return None
+        self._save_seq += 1
+        return self._save_seq, {
+            "pomodoro_time": self.pomodoro_time,
+            "break_time": self.break_time,
+            "current_time_left": self.get_time_left(),
+            "current_mode": self.current_mode,
+            "pomodoro_count": self.pomodoro_count
+        }
+    
+    def _write_state(self, pending):
+        """Write a state copied by _copy_state; call without holding the core lock"""
+        if pending is None:
+            return
+        seq, state = pending
+        with self._save_lock:
+            if seq <= self._saved_seq:
+                return
             self.storage_manager.save_state(state)
+            self._saved_seq = seq
     
     def _load_state(self):
         """Load timer state using storage manager"""
@@ -0,0 +1,135 @@
+# pomodoro_app/core/trace.py
+"""Fixed-size in-memory ring buffer of structured trace events.
+
+Hot paths (timer ticks, display and tray updates) record events here
+instead of writing debug log lines. The buffer is preallocated, recording
+is a handful of list stores, and nothing touches the disk until the buffer
+is dumped on demand, on a signal or when the app crashes.
+"""
+import itertools
+import os
+import signal
+import sys
+import threading
+import time
+from datetime import datetime
+from . import logger
+
+# Event ids recorded by the hot paths
+TIMER_WAKE = 1
+TIMER_TICK = 2
+TIMER_COMPLETE = 3
+DISPLAY_UPDATE = 4
+TRAY_UPDATE = 5
+TRAY_IMAGE = 6
+BUBBLE_UPDATE = 7
+BACKGROUND_UPDATE = 8
+
+EVENT_NAMES = {
+    TIMER_WAKE: "timer_wake",
+    TIMER_TICK: "timer_tick",
+    TIMER_COMPLETE: "timer_complete",
+    DISPLAY_UPDATE: "display_update",
+    TRAY_UPDATE: "tray_update",
+    TRAY_IMAGE: "tray_image",
+    BUBBLE_UPDATE: "bubble_update",
+    BACKGROUND_UPDATE: "background_update"
+}
+
+class TraceBuffer:
+    """Preallocated ring buffer holding the most recent trace events"""
+
+    def __init__(self, size=4096):
+        # Round up to a power of two so the slot index is a cheap mask
+        self.size = 1 << max(size - 1, 1).bit_length()
+        self._mask = self.size - 1
+        self._counter = itertools.count()
+        self._seqs = [-1] * self.size
+        self._times = [0] * self.size
+        self._threads = [0] * self.size
+        self._events = [0] * self.size
+        self._payloads = [None] * self.size
+
+    def record(self, event, payload=None):
+        """Record an event; safe to call from any thread"""
+        seq = next(self._counter)
+        i = seq & self._mask
+        self._seqs[i] = seq
+        self._times[i] = time.perf_counter_ns()
+        self._threads[i] = threading.get_ident()
+        self._events[i] = event
+        self._payloads[i] = payload
+
+    def snapshot(self):
+        """Return the buffered events as tuples, oldest first"""
+        rows = [
+            (self._seqs[i], self._times[i], self._threads[i], self._events[i], self._payloads[i])
+            for i in range(self.size) if self._seqs[i] >= 0
+        ]
+        rows.sort()
+        return rows
+
+    def dump(self, path):
+        """Write the buffered events to a text file, one event per line"""
+        rows = self.snapshot()
+        thread_names = {t.ident: t.name for t in threading.enumerate()}
+        base = rows[0][1] if rows else 0
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("# seq\tt_us\tthread\tevent\tpayload\n")
+            for seq, t_ns, thread_id, event, payload in rows:
+                thread = thread_names.get(thread_id, str(thread_id))
+                name = EVENT_NAMES.get(event, str(event))
+                f.write(f"{seq}\t{(t_ns - base) // 1000}\t{thread}\t{name}\t{payload!r}\n")
+        return len(rows)
+
+_buffer = TraceBuffer()
+_dump_dir = None
+
+def record(event, payload=None):
+    _buffer.record(event, payload)
+
+def get_buffer():
+    return _buffer
+
+def configure(size=None, dump_dir=None):
+    """Resize the buffer and/or set where dumps are written"""
+    global _buffer, _dump_dir
+    if size is not None and size != _buffer.size:
+        _buffer = TraceBuffer(size)
+    if dump_dir is not None:
+        _dump_dir = dump_dir
+
+def dump(reason="manual"):
+    """Dump the buffer to a timestamped file in the dump directory"""
+    dump_dir = _dump_dir or os.path.join(os.path.expanduser("~"), ".pomodoro_app", "traces")
+    try:
+        os.makedirs(dump_dir, exist_ok=True)
+        path = os.path.join(dump_dir, f"trace_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_{reason}.tsv")
+        count = _buffer.dump(path)
+        logger.info(f"Dumped {count} trace events to {path}")
+        return path
+    except Exception as e:
+        logger.error(f"Failed to dump trace buffer: {str(e)}")
+        return None
+
+def install_handlers(dump_signal=getattr(signal, "SIGUSR2", None)):
+    """Dump the buffer on the given signal and on uncaught exceptions"""
+    if dump_signal is not None:
+        try:
+            signal.signal(dump_signal, lambda signum, frame: dump("signal"))
+            logger.debug(f"Trace dump bound to signal {dump_signal}")
+        except ValueError:
+            # Signals can only be bound from the main thread
+            logger.warning("Could not bind trace dump signal outside the main thread")
+
+    previous_excepthook = sys.excepthook
+    def excepthook(exc_type, exc, tb):
+        dump("crash")
+        previous_excepthook(exc_type, exc, tb)
+    sys.excepthook = excepthook
+
+    previous_thread_excepthook = threading.excepthook
+    def thread_excepthook(args):
+        dump("crash")
+        previous_thread_excepthook(args)
+    threading.excepthook = thread_excepthook
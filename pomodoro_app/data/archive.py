@@ -0,0 +1,114 @@
+# pomodoro_app/data/archive.py
+import gzip
+import json
+import lzma
+import os
+import tempfile
+import threading
+from datetime import datetime
+from ..core import logger
+
+COMPRESSORS = {
+    "gzip": (".jsonl.gz", gzip.open),
+    "lzma": (".jsonl.xz", lzma.open)
+}
+
+class HistoryArchive:
+    """Immutable, compressed monthly segments of old task history entries
+
+    Each archive run writes new segment files (never rewriting old ones)
+    and records them in a small JSON index with the month, entry count and
+    the time range covered, so readers only open segments they need.
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, archive_path, compression="gzip"):
+        if compression not in COMPRESSORS:
+            raise ValueError(f"Unknown compression '{compression}', choose from: {', '.join(COMPRESSORS)}")
+        self.archive_path = archive_path
+        self.compression = compression
+        self._lock = threading.Lock()
+        self._index = None
+
+    @property
+    def index(self):
+        if self._index is None:
+            try:
+                with open(os.path.join(self.archive_path, self.INDEX_FILE), encoding="utf-8") as f:
+                    self._index = json.load(f)
+            except FileNotFoundError:
+                self._index = {"segments": []}
+        return self._index
+
+    def __len__(self):
+        return sum(segment["count"] for segment in self.index["segments"])
+
+    def _write_atomic(self, path, write):
+        fd, tmp_path = tempfile.mkstemp(dir=self.archive_path)
+        os.close(fd)
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def append(self, entries):
+        """Archive entries (newest first), grouped into per-month segments"""
+        if not entries:
+            return 0
+        os.makedirs(self.archive_path, exist_ok=True)
+
+        months = {}
+        for entry in entries:
+            month = datetime.fromtimestamp(entry["started_at"]).strftime("%Y-%m")
+            months.setdefault(month, []).append(entry)
+
+        suffix, opener = COMPRESSORS[self.compression]
+        with self._lock:
+            index = self.index
+            for month, month_entries in sorted(months.items()):
+                part = sum(1 for segment in index["segments"] if segment["month"] == month)
+                name = f"{month}{suffix}" if part == 0 else f"{month}.{part}{suffix}"
+
+                def write(path, month_entries=month_entries):
+                    with opener(path, "wt", encoding="utf-8") as f:
+                        for entry in month_entries:
+                            f.write(json.dumps(entry, separators=(",", ":")))
+                            f.write("\n")
+                self._write_atomic(os.path.join(self.archive_path, name), write)
+
+                index["segments"].append({
+                    "file": name,
+                    "month": month,
+                    "count": len(month_entries),
+                    "first_started_at": min(e["started_at"] for e in month_entries),
+                    "last_started_at": max(e["started_at"] for e in month_entries)
+                })
+                logger.info(f"Archived {len(month_entries)} history entries to {name}")
+
+            def write_index(path):
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump(index, f)
+            self._write_atomic(os.path.join(self.archive_path, self.INDEX_FILE), write_index)
+        return len(entries)
+
+    def iter_entries(self, since=None):
+        """Yield archived entries newest first, skipping months older than since"""
+        months = {}
+        for segment in self.index["segments"]:
+            if since is None or segment["last_started_at"] >= since:
+                months.setdefault(segment["month"], []).append(segment)
+
+        for month in sorted(months, reverse=True):
+            entries = []
+            for segment in months[month]:
+                opener = gzip.open if segment["file"].endswith(".gz") else lzma.open
+                with opener(os.path.join(self.archive_path, segment["file"]), "rt", encoding="utf-8") as f:
+                    entries.extend(json.loads(line) for line in f)
+            entries.sort(key=lambda e: e["started_at"], reverse=True)
+            for entry in entries:
+                if since is not None and entry["started_at"] < since:
+                    return
+                yield entry
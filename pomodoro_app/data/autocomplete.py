@@ -0,0 +1,140 @@
+# pomodoro_app/data/autocomplete.py
+import heapq
+from ..core import logger
+
+class _TrieNode:
+    __slots__ = ("children", "top")
+
+    def __init__(self):
+        self.children = {}
+        self.top = []
+
+class TaskNameCompleter:
+    """Prefix trie of task names ranked by frequency and recency
+
+    Every use of a task name adds a weight that grows geometrically with the
+    use counter, so a name used ``half_life`` uses ago counts half as much as
+    one used now. Scores therefore only ever increase, which lets each trie
+    node cache its ``max_suggestions`` best names and answer a lookup in
+    O(len(prefix)) regardless of how many names are stored.
+    """
+
+    # Rescale all scores before the geometric weights overflow a float
+    _RESCALE_LIMIT = 1e200
+
+    def __init__(self, max_suggestions=8, half_life=1000):
+        self.max_suggestions = max_suggestions
+        self.growth = 2 ** (1.0 / half_life)
+        self.root = _TrieNode()
+        self.scores = {}
+        self.display = {}
+        self.weight = 1.0
+
+    def __len__(self):
+        return len(self.scores)
+
+    def build(self, task_history):
+        """Build the trie from a newest-first task history list"""
+        self.root = _TrieNode()
+        self.scores = {}
+        self.display = {}
+        self.weight = 1.0
+
+        # Aggregate final scores first so every name is inserted only once
+        for entry in reversed(task_history):
+            task = entry.get("task", "").strip()
+            if not task:
+                continue
+            key = task.lower()
+            self.scores[key] = self.scores.get(key, 0.0) + self._next_weight()
+            self.display[key] = task
+
+        # Insert every name, then fill the cached rankings bottom-up
+        root = self.root
+        for key in self.scores:
+            node = root
+            for char in key:
+                child = node.children.get(char)
+                if child is None:
+                    child = node.children[char] = _TrieNode()
+                node = child
+            node.top.append(key)
+        self._rank_subtree(root)
+        logger.debug(f"Built task name completer with {len(self.scores)} names")
+
+    def record(self, task):
+        """Record a use of a task name"""
+        task = task.strip()
+        if not task:
+            return
+        key = task.lower()
+        self.scores[key] = self.scores.get(key, 0.0) + self._next_weight()
+        self.display[key] = task
+        self._update_path(key)
+
+    def suggest(self, prefix, limit=None):
+        """Return the best task names starting with prefix"""
+        node = self.root
+        for char in prefix.lower():
+            node = node.children.get(char)
+            if node is None:
+                return []
+        top = node.top if limit is None else node.top[:limit]
+        return [self.display[key] for key in top]
+
+    def _next_weight(self):
+        if self.weight > self._RESCALE_LIMIT:
+            self._rescale(1.0 / self.weight)
+        weight = self.weight
+        self.weight *= self.growth
+        return weight
+
+    def _rescale(self, factor):
+        """Scale every score uniformly, which keeps all cached rankings valid"""
+        logger.debug("Rescaling task name completer scores")
+        self.weight *= factor
+        for key in self.scores:
+            self.scores[key] *= factor
+
+    def _rank_subtree(self, root):
+        """Compute cached top names for every node in post-order"""
+        rank = self.scores.__getitem__
+        limit = self.max_suggestions
+        stack = [(root, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if not expanded:
+                stack.append((node, True))
+                stack.extend((child, False) for child in node.children.values())
+                continue
+            candidates = node.top
+            for child in node.children.values():
+                candidates.extend(child.top)
+            node.top = heapq.nlargest(limit, candidates, key=rank)
+
+    def _update_path(self, key):
+        """Refresh the cached top names along the path of key"""
+        scores = self.scores
+        score = scores[key]
+        limit = self.max_suggestions
+        rank = scores.__getitem__
+        node = self.root
+        self._update_top(node, key, score, limit, rank)
+        for char in key:
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = _TrieNode()
+            node = child
+            self._update_top(node, key, score, limit, rank)
+
+    @staticmethod
+    def _update_top(node, key, score, limit, rank):
+        top = node.top
+        if key in top:
+            top.sort(key=rank, reverse=True)
+        elif len(top) < limit:
+            top.append(key)
+            top.sort(key=rank, reverse=True)
+        elif score > rank(top[-1]):
+            top[-1] = key
+            top.sort(key=rank, reverse=True)
@@ -0,0 +1,44 @@
+# pomodoro_app/data/projects.py
+"""Projects and tags written inline in task names.
+
+A task such as ``"Draft intro @work/acme/website #writing #urgent"``
+belongs to the project path ``work/acme/website`` and carries the tags
+``writing`` and ``urgent``. The task name itself is left unchanged.
+"""
+import re
+
+LABEL_PATTERN = re.compile(r"(?<!\S)([@#])([^\s@#]+)")
+
+def parse_labels(task):
+    """Return (project, tags) found in a task name; project is None if absent"""
+    project = None
+    tags = []
+    for marker, value in LABEL_PATTERN.findall(task or ""):
+        if marker == "@":
+            if project is None:
+                project = "/".join(part for part in value.lower().split("/") if part) or None
+        elif value.lower() not in tags:
+            tags.append(value.lower())
+    return project, tags
+
+def entry_labels(entry):
+    """Project and tags of a history entry, parsing names saved before labels existed"""
+    if "project" in entry:
+        return entry["project"], entry.get("tags", [])
+    return parse_labels(entry.get("task"))
+
+def project_ancestors(project):
+    """'a/b/c' -> ['a', 'a/b', 'a/b/c']"""
+    if not project:
+        return []
+    parts = project.split("/")
+    return ["/".join(parts[:i]) for i in range(1, len(parts) + 1)]
+
+def matches_labels(entry, project=None, tag=None):
+    """Check an entry against a project (including sub-projects) and a tag filter"""
+    if project is None and tag is None:
+        return True
+    entry_project, tags = entry_labels(entry)
+    if project is not None and not (entry_project == project or (entry_project or "").startswith(project + "/")):
+        return False
+    return tag is None or tag in tags
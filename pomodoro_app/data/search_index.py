@@ -0,0 +1,123 @@
+# pomodoro_app/data/search_index.py
+import bisect
+import heapq
+import re
+from ..core import logger
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+def tokenize(text):
+    """Split text into lowercase word tokens"""
+    return _TOKEN_RE.findall(text.lower())
+
+def _contains(sorted_ids, seq):
+    """Check membership in a sorted posting list"""
+    i = bisect.bisect_left(sorted_ids, seq)
+    return i < len(sorted_ids) and sorted_ids[i] == seq
+
+def matches_query(text, query):
+    """Check a single task name against a query without using the index"""
+    tokens = tokenize(query)
+    if not tokens:
+        return False
+    words = tokenize(text)
+    return (all(token in words for token in tokens[:-1])
+            and any(word.startswith(tokens[-1]) for word in words))
+
+class TaskSearchIndex:
+    """Inverted index over task names in the task history
+
+    Entries are identified by their sequence number, i.e. their position
+    counted from the oldest history entry, so ids stay stable while new
+    tasks are inserted at the top of the history.
+    """
+
+    def __init__(self):
+        self.postings = {}
+        self.vocabulary = []
+        self.size = 0
+
+    def clear(self):
+        self.postings = {}
+        self.vocabulary = []
+        self.size = 0
+
+    def rebuild(self, task_history):
+        """Rebuild the index from a newest-first task history list"""
+        self.clear()
+        postings = self.postings
+        for seq, entry in enumerate(reversed(task_history)):
+            for token in set(tokenize(entry.get("task", ""))):
+                ids = postings.get(token)
+                if ids is None:
+                    postings[token] = [seq]
+                else:
+                    ids.append(seq)
+        self.vocabulary = sorted(postings)
+        self.size = len(task_history)
+        logger.debug(f"Built search index: {self.size} entries, {len(self.vocabulary)} tokens")
+
+    def add(self, task):
+        """Index a task that was just added to the top of the history"""
+        seq = self.size
+        self.size += 1
+        for token in set(tokenize(task)):
+            ids = self.postings.get(token)
+            if ids is None:
+                self.postings[token] = [seq]
+                bisect.insort(self.vocabulary, token)
+            else:
+                ids.append(seq)
+        return seq
+
+    def _prefix_tokens(self, prefix):
+        """Return the indexed tokens starting with prefix"""
+        start = bisect.bisect_left(self.vocabulary, prefix)
+        end = bisect.bisect_left(self.vocabulary, prefix + "\uffff")
+        return self.vocabulary[start:end]
+
+    def search(self, query, get_text=None):
+        """Yield matching sequence numbers lazily, newest first
+
+        Every query token must match a whole token, except the last one which
+        is treated as a prefix so results update while the user is typing.
+        ``get_text`` maps a sequence number back to its task name and lets
+        the prefix be checked directly instead of via the posting lists.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return
+        prefix = tokens[-1]
+
+        exact = []
+        for token in tokens[:-1]:
+            ids = self.postings.get(token)
+            if not ids:
+                return
+            exact.append(ids)
+
+        if not exact:
+            prefix_lists = [self.postings[token] for token in self._prefix_tokens(prefix)]
+            if len(prefix_lists) == 1:
+                yield from reversed(prefix_lists[0])
+                return
+            last = None
+            for seq in heapq.merge(*[reversed(ids) for ids in prefix_lists], reverse=True):
+                if seq != last:
+                    last = seq
+                    yield seq
+            return
+
+        if get_text is None:
+            prefix_lists = [self.postings[token] for token in self._prefix_tokens(prefix)]
+            if not prefix_lists:
+                return
+            matches_prefix = lambda seq: any(_contains(ids, seq) for ids in prefix_lists)
+        else:
+            matches_prefix = lambda seq: any(token.startswith(prefix) for token in tokenize(get_text(seq)))
+
+        exact.sort(key=len)
+        base, others = exact[0], exact[1:]
+        for seq in reversed(base):
+            if all(_contains(ids, seq) for ids in others) and matches_prefix(seq):
+                yield seq
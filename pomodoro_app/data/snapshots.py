@@ -0,0 +1,188 @@
+# pomodoro_app/data/snapshots.py
+"""Immutable, versioned snapshots of the state store for lock-free readers.
+
+The writer publishes each saved state as a new generation:
+
+* every pickled value is written once to a content-addressed ``blob-<sha1>``
+  file, so unchanged keys cost nothing on later generations
+* a small ``gen-<n>`` manifest maps keys to blobs
+* ``CURRENT`` names the newest generation
+
+Every file is written under a temporary name and renamed into place, so a
+reader sees either the previous or the new generation, never a mix. Readers
+take no locks and the writer never waits for them; old generations are
+kept for a while so a slow reader can finish, and a reader that loses the
+race simply retries on the newer generation.
+
+There is a single writer per directory: a publisher holds an exclusive
+lock on ``LOCK`` for as long as it is open, and a second one fails to
+start instead of numbering generations on its own.
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+import time
+from collections import deque
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+CURRENT_FILE = "CURRENT"
+LOCK_FILE = "LOCK"
+MANIFEST_PREFIX = "gen-"
+BLOB_PREFIX = "blob-"
+
+def snapshot_dir(storage_path, storage_file):
+    """Directory holding the snapshots published for a store"""
+    return os.path.join(storage_path, f"{storage_file}.snapshots")
+
+def _write_atomic(directory, name, data):
+    # Snapshots only need to be consistent, not durable: the store itself is
+    # the durable copy, so there is no fsync on this path
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, os.path.join(directory, name))
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def _manifest_name(generation):
+    return f"{MANIFEST_PREFIX}{generation:012d}"
+
+class PublisherLockedError(OSError):
+    """Another publisher already owns the snapshot directory"""
+
+class SnapshotPublisher:
+    """Writer side: publishes pickled state values as numbered generations
+
+    Raises PublisherLockedError if another process is publishing to the
+    same directory. Call ``close`` to hand the directory over.
+    """
+
+    def __init__(self, directory, keep=8):
+        self.directory = directory
+        self.keep = keep
+        os.makedirs(directory, exist_ok=True)
+        self._lock_file = self._lock()
+        self.generation = read_generation(directory) or 0
+        self._blobs = {name for name in os.listdir(directory) if name.startswith(BLOB_PREFIX)}
+        self._recent = deque(maxlen=keep)
+
+    def publish(self, values):
+        """Publish a mapping of key -> pickled bytes as the next generation"""
+        keys = {}
+        for key, data in values.items():
+            name = BLOB_PREFIX + hashlib.sha1(data).hexdigest()
+            if name not in self._blobs:
+                _write_atomic(self.directory, name, data)
+                self._blobs.add(name)
+            keys[key] = name
+
+        # Never reuse a number, even if the directory was published to meanwhile
+        generation = max(self.generation, read_generation(self.directory) or 0) + 1
+        manifest = {"generation": generation, "published_at": time.time(), "keys": keys}
+        _write_atomic(self.directory, _manifest_name(generation), pickle.dumps(manifest, pickle.HIGHEST_PROTOCOL))
+        # The generation counter flips last; until then readers keep using the previous one
+        _write_atomic(self.directory, CURRENT_FILE, str(generation).encode("ascii"))
+        self.generation = generation
+        self._recent.append(set(keys.values()))
+        self._collect()
+        return generation
+
+    def close(self):
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def _lock(self):
+        if fcntl is None:
+            return None
+        lock_file = open(os.path.join(self.directory, LOCK_FILE), "a+")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            raise PublisherLockedError(f"Snapshots in {self.directory} are published by another process")
+        return lock_file
+
+    def _collect(self):
+        """Remove generations older than the last ``keep`` and blobs no longer referenced"""
+        oldest_kept = self.generation - self.keep + 1
+        referenced = set().union(*self._recent)
+        for name in os.listdir(self.directory):
+            if name.startswith(MANIFEST_PREFIX):
+                stale = int(name[len(MANIFEST_PREFIX):]) < oldest_kept
+            elif name.startswith(BLOB_PREFIX):
+                # Blobs from before this process started are unknown to _recent
+                # until a full window of generations has been published
+                stale = len(self._recent) == self.keep and name not in referenced
+            else:
+                continue
+            if not stale:
+                continue
+            try:
+                os.unlink(os.path.join(self.directory, name))
+            except OSError:
+                # Windows refuses while a reader has it open; try again next time
+                continue
+            self._blobs.discard(name)
+
+def read_generation(directory):
+    """Number of the newest published generation, or None if nothing was published"""
+    try:
+        with open(os.path.join(directory, CURRENT_FILE), "rb") as f:
+            return int(f.read())
+    except (FileNotFoundError, ValueError):
+        return None
+
+class Snapshot:
+    """One published generation, holding the pickled values it was made of"""
+
+    def __init__(self, generation, published_at, blobs):
+        self.generation = generation
+        self.published_at = published_at
+        self._blobs = blobs
+
+    def keys(self):
+        return self._blobs.keys()
+
+    def get(self, key, default=None):
+        if key not in self._blobs:
+            return default
+        # Hand out copies like the storage backends do; the snapshot stays immutable
+        return pickle.loads(self._blobs[key])
+
+class SnapshotReader:
+    """Reader side: opens the newest generation without taking any lock"""
+
+    def __init__(self, directory, retries=10):
+        self.directory = directory
+        self.retries = retries
+        self._snapshot = None
+
+    def read(self):
+        """Return the newest Snapshot, or None if nothing was published yet"""
+        for attempt in range(self.retries):
+            generation = read_generation(self.directory)
+            if generation is None:
+                return None
+            if self._snapshot is not None and self._snapshot.generation == generation:
+                return self._snapshot
+            try:
+                with open(os.path.join(self.directory, _manifest_name(generation)), "rb") as f:
+                    manifest = pickle.load(f)
+                blobs = {}
+                for key, name in manifest["keys"].items():
+                    with open(os.path.join(self.directory, name), "rb") as f:
+                        blobs[key] = f.read()
+            except FileNotFoundError:
+                # The writer moved on and collected this generation meanwhile
+                continue
+            self._snapshot = Snapshot(generation, manifest["published_at"], blobs)
+            return self._snapshot
+        raise IOError(f"Could not read a consistent snapshot from {self.directory}")
@@ -0,0 +1,145 @@
+# pomodoro_app/data/stats.py
+from datetime import date, datetime, timedelta
+from ..core import logger
+from .projects import entry_labels, project_ancestors
+
+def _empty_rollup():
+    return {"pomodoros": 0, "focus_seconds": 0, "interrupted": 0}
+
+def entry_time(entry):
+    """When an entry counts in the rollups: the day its pomodoro started
+
+    Every change to an entry, including a later reversal, lands in that
+    same bucket. None for legacy entries without timestamps.
+    """
+    started_at = entry.get("started_at")
+    return datetime.fromtimestamp(started_at) if started_at else None
+
+def week_key(day):
+    """ISO year-week key such as '2024-W07'"""
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+class ProductivityStats:
+    """Per-day, per-week and per-task rollups maintained incrementally
+
+    Every status change of a history entry is applied as a delta, so the
+    rollups never need to be recomputed from the task history and every
+    query is a handful of dictionary lookups.
+    """
+
+    def __init__(self, data=None):
+        data = data or {}
+        self.days = data.get("days", {})
+        self.weeks = data.get("weeks", {})
+        self.tasks = data.get("tasks", {})
+        # Label rollups: {"total": rollup, "months": {"YYYY-MM": rollup}} per
+        # project path (every ancestor included) and per tag
+        self.projects = data.get("projects", {})
+        self.tags = data.get("tags", {})
+        self.last_active_day = data.get("last_active_day")
+        self.current_streak = data.get("current_streak", 0)
+        self.best_streak = data.get("best_streak", 0)
+
+    def to_dict(self):
+        return {
+            "days": self.days,
+            "weeks": self.weeks,
+            "tasks": self.tasks,
+            "projects": self.projects,
+            "tags": self.tags,
+            "last_active_day": self.last_active_day,
+            "current_streak": self.current_streak,
+            "best_streak": self.best_streak
+        }
+
+    def apply_change(self, task, old_status, new_status, focus_delta=0, when=None, project=None, tags=()):
+        """Apply a status change and extra focus time of one history entry
+
+        The project's rollups are updated at every level of its path, so
+        aggregate queries never have to walk sub-projects. ``when`` should
+        be the entry's ``entry_time`` so that changes cancel out in the day
+        and week they were counted in; it defaults to now.
+        """
+        day = (when or datetime.now()).date()
+        month = day.strftime("%Y-%m")
+        rollups = [
+            self.days.setdefault(day.isoformat(), _empty_rollup()),
+            self.weeks.setdefault(week_key(day), _empty_rollup()),
+            self.tasks.setdefault(task, _empty_rollup())
+        ]
+        labels = [self.projects.setdefault(path, {"total": _empty_rollup(), "months": {}})
+                  for path in project_ancestors(project)]
+        labels += [self.tags.setdefault(tag, {"total": _empty_rollup(), "months": {}}) for tag in tags]
+        for label in labels:
+            rollups.append(label["total"])
+            rollups.append(label["months"].setdefault(month, _empty_rollup()))
+
+        # A pomodoro resumed and finished after an interruption only counts as completed
+        completed = int(new_status == "completed") - int(old_status == "completed")
+        interrupted = int(new_status == "interrupted") - int(old_status == "interrupted")
+        for rollup in rollups:
+            rollup["pomodoros"] += completed
+            rollup["interrupted"] += interrupted
+            rollup["focus_seconds"] += focus_delta
+
+        if completed > 0:
+            self._update_streak(day)
+
+    def _update_streak(self, day):
+        last = date.fromisoformat(self.last_active_day) if self.last_active_day else None
+        if last is not None and day <= last:
+            # Same day, or an older entry arriving late (sync)
+            return
+        if last is not None and day - last == timedelta(days=1):
+            self.current_streak += 1
+        else:
+            self.current_streak = 1
+        self.last_active_day = day.isoformat()
+        self.best_streak = max(self.best_streak, self.current_streak)
+
+    def day(self, day=None):
+        day = day or date.today()
+        return self.days.get(day.isoformat(), _empty_rollup())
+
+    def week(self, day=None):
+        day = day or date.today()
+        return self.weeks.get(week_key(day), _empty_rollup())
+
+    def task(self, task):
+        return self.tasks.get(task, _empty_rollup())
+
+    def project(self, path, month=None):
+        """Rollup of a project and all its sub-projects, optionally for one 'YYYY-MM'"""
+        return self._label(self.projects, path, month)
+
+    def tag(self, tag, month=None):
+        return self._label(self.tags, tag, month)
+
+    def _label(self, labels, key, month):
+        label = labels.get(key)
+        if label is None:
+            return _empty_rollup()
+        if month is None:
+            return label["total"]
+        return label["months"].get(month, _empty_rollup())
+
+    def streak(self, today=None):
+        """Current streak of days with a completed pomodoro, still alive today or yesterday"""
+        if not self.last_active_day:
+            return 0
+        today = today or date.today()
+        if today - date.fromisoformat(self.last_active_day) > timedelta(days=1):
+            return 0
+        return self.current_streak
+
+    def rebuild(self, task_history):
+        """Backfill rollups from history entries that carry timestamps"""
+        self.__init__()
+        for entry in reversed(task_history):
+            if "started_at" not in entry:
+                continue
+            project, tags = entry_labels(entry)
+            self.apply_change(entry["task"], "ongoing", entry["status"], entry.get("focus_seconds", 0),
+                              entry_time(entry), project, tags)
+        logger.info(f"Rebuilt productivity stats for {len(self.days)} days")
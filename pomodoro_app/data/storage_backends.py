@@ -0,0 +1,265 @@
+# pomodoro_app/data/storage_backends.py
+import copy
+import json
+import os
+import pathlib
+import pickle
+import sqlite3
+import tempfile
+import threading
+from ..core import logger
+from .snapshots import SnapshotReader, snapshot_dir
+from .storage_manager import DEFAULT_STORAGE_PATH, BaseStorageManager, StorageManager
+
+class SqliteStorageManager(BaseStorageManager):
+    """Stores application state as pickled values in a SQLite key/value table"""
+
+    backend_name = "sqlite"
+
+    def __init__(self, storage_file="pomodoro_data.sqlite3", storage_path=None, read_only=False):
+        super().__init__(storage_file, storage_path, read_only)
+        self._lock = threading.Lock()
+        if read_only:
+            uri = pathlib.Path(os.path.abspath(self.full_path)).as_uri() + "?mode=ro"
+            if not os.path.exists(self.full_path + "-wal"):
+                # Closed cleanly, so everything is in the main file; immutable
+                # keeps SQLite from creating -shm/-wal files next to it
+                uri += "&immutable=1"
+            self._conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            return
+        self._conn = sqlite3.connect(self.full_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value BLOB NOT NULL)")
+        self._conn.commit()
+
+    def save_state(self, state_dict):
+        """Save application state in a single transaction"""
+        if self._refuse_save():
+            return False
+        logger.info("Saving application state")
+        rows = [(key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL)) for key, value in state_dict.items()]
+        try:
+            with self._lock, self._conn:
+                self._conn.executemany("INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)", rows)
+            logger.info("Application state saved successfully")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save application state: {str(e)}")
+            return False
+
+    def load_state(self, default_state=None):
+        """Load application state from persistent storage"""
+        logger.info("Loading application state")
+        state = {} if default_state is None else default_state.copy()
+        if not state:
+            return state
+
+        try:
+            placeholders = ",".join("?" * len(state))
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM state WHERE key IN ({placeholders})", list(state)
+                ).fetchall()
+            for key, value in rows:
+                state[key] = pickle.loads(value)
+                logger.debug(f"Loaded state item: {key}")
+            logger.info("Application state loaded successfully")
+        except Exception as e:
+            logger.error(f"Failed to load application state: {str(e)}")
+
+        return state
+
+    def export_state(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT key, value FROM state").fetchall()
+        return {key: pickle.loads(value) for key, value in rows}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class JsonStorageManager(BaseStorageManager):
+    """Keeps state in memory and writes atomic JSON snapshots on every save"""
+
+    backend_name = "json"
+
+    def __init__(self, storage_file="pomodoro_data.json", storage_path=None, read_only=False):
+        super().__init__(storage_file, storage_path, read_only)
+        self._lock = threading.Lock()
+        self._data = None
+
+    def _read(self):
+        if self._data is None:
+            try:
+                with open(self.full_path, encoding="utf-8") as f:
+                    self._data = json.load(f)
+            except FileNotFoundError:
+                self._data = {}
+        return self._data
+
+    def _write(self, data):
+        # Write to a temporary file and rename it so readers never see a partial snapshot
+        fd, tmp_path = tempfile.mkstemp(prefix=self.storage_file, dir=self.storage_path)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.full_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def save_state(self, state_dict):
+        """Save application state as a new snapshot"""
+        if self._refuse_save():
+            return False
+        logger.info("Saving application state")
+        try:
+            # Round-tripped through JSON: the copies hold what a reload would
+            # return, and later in-place mutation by callers is not persisted
+            fresh = json.loads(json.dumps(state_dict, separators=(",", ":")))
+            with self._lock:
+                data = dict(self._read())
+                data.update(fresh)
+                self._write(data)
+                # Only once the snapshot is on disk, so a failed write leaves
+                # memory matching the file
+                self._data = data
+            logger.info("Application state saved successfully")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save application state: {str(e)}")
+            return False
+
+    def load_state(self, default_state=None):
+        """Load application state from persistent storage"""
+        logger.info("Loading application state")
+        state = {} if default_state is None else default_state.copy()
+
+        try:
+            with self._lock:
+                data = self._read()
+                for key in state.keys():
+                    if key in data:
+                        state[key] = copy.deepcopy(data[key])
+                        logger.debug(f"Loaded state item: {key}")
+            logger.info("Application state loaded successfully")
+        except Exception as e:
+            logger.error(f"Failed to load application state: {str(e)}")
+
+        return state
+
+    def export_state(self):
+        with self._lock:
+            return dict(self._read())
+
+class MemoryStorageManager(BaseStorageManager):
+    """Non-persistent storage, useful for tests, benchmarks and throwaway sessions"""
+
+    backend_name = "memory"
+
+    def __init__(self, storage_file="pomodoro_data", storage_path=None, read_only=False):
+        logger.info("Initializing MemoryStorageManager")
+        self.storage_file = storage_file
+        self.storage_path = storage_path
+        self.read_only = read_only
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def save_state(self, state_dict):
+        if self._refuse_save():
+            return False
+        with self._lock:
+            # Store copies so later in-place mutation by callers is not persisted
+            self._data.update(pickle.loads(pickle.dumps(state_dict, pickle.HIGHEST_PROTOCOL)))
+        return True
+
+    def load_state(self, default_state=None):
+        state = {} if default_state is None else default_state.copy()
+        with self._lock:
+            for key in state.keys():
+                if key in self._data:
+                    state[key] = pickle.loads(pickle.dumps(self._data[key], pickle.HIGHEST_PROTOCOL))
+        return state
+
+    def export_state(self):
+        with self._lock:
+            return pickle.loads(pickle.dumps(self._data, pickle.HIGHEST_PROTOCOL))
+
+class SnapshotStorageManager(BaseStorageManager):
+    """Read-only view of the newest snapshot published by the shelve backend
+
+    Lets reporting tools use the usual storage interface while the app is
+    writing: every load sees one complete generation and takes no lock.
+    Not listed in BACKENDS since the app cannot run on it.
+    """
+
+    backend_name = "snapshot"
+
+    def __init__(self, storage_file="pomodoro_data", storage_path=None):
+        self.storage_file = storage_file
+        self.storage_path = storage_path or DEFAULT_STORAGE_PATH
+        self.read_only = True
+        self.reader = SnapshotReader(snapshot_dir(self.storage_path, storage_file))
+
+    def save_state(self, state_dict):
+        logger.warning("Snapshot storage is read-only, not saving state")
+        return False
+
+    def load_state(self, default_state=None):
+        state = {} if default_state is None else default_state.copy()
+        snapshot = self.reader.read()
+        if snapshot is None:
+            logger.warning(f"No snapshot published in {self.reader.directory}")
+            return state
+        for key in state.keys():
+            state[key] = snapshot.get(key, state[key])
+        return state
+
+    def export_state(self):
+        snapshot = self.reader.read()
+        if snapshot is None:
+            return {}
+        return {key: snapshot.get(key) for key in snapshot.keys()}
+
+BACKENDS = {
+    StorageManager.backend_name: StorageManager,
+    SqliteStorageManager.backend_name: SqliteStorageManager,
+    JsonStorageManager.backend_name: JsonStorageManager,
+    MemoryStorageManager.backend_name: MemoryStorageManager
+}
+
+# Environment variable used when no backend is given on the command line
+BACKEND_ENV_VAR = "POMODORO_STORAGE_BACKEND"
+
+def create_storage_manager(backend=None, storage_path=None, storage_file=None, publish_snapshots=False,
+                           read_only=False):
+    """Create a storage manager for the named backend
+
+    Falls back to the POMODORO_STORAGE_BACKEND environment variable and
+    then to the shelve backend. publish_snapshots is meant for the app's
+    own store and only applies to the shelve backend; read_only opens an
+    existing store without creating or changing any file.
+    """
+    backend = backend or os.environ.get(BACKEND_ENV_VAR) or StorageManager.backend_name
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown storage backend '{backend}', choose from: {', '.join(BACKENDS)}")
+
+    logger.info(f"Using '{backend}' storage backend")
+    kwargs = {"storage_path": storage_path}
+    if storage_file:
+        kwargs["storage_file"] = storage_file
+    if publish_snapshots and issubclass(BACKENDS[backend], StorageManager):
+        kwargs["publish_snapshots"] = True
+    if read_only:
+        kwargs["read_only"] = True
+    return BACKENDS[backend](**kwargs)
+
+def migrate_state(source, target):
+    """Copy every stored key from one storage manager to another"""
+    state = source.export_state()
+    logger.info(f"Migrating {len(state)} keys from {source.backend_name} to {target.backend_name}")
+    if not target.save_state(state):
+        raise IOError(f"Failed to write migrated state to {target.backend_name} storage")
+    return len(state)
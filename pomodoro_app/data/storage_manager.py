@@ -1,52 +1,197 @@
 # pomodoro_app/data/storage_manager.py
 import os
+import pickle
 import shelve
+import threading
 from ..core import logger
+from .snapshots import SnapshotPublisher, snapshot_dir
 
-class StorageManager:
-    """Manages persistent storage of application state using shelve"""
-    
-    def __init__(self, storage_file="pomodoro_data"):
+DEFAULT_STORAGE_PATH = os.path.join(os.path.expanduser("~"), ".pomodoro_app")
+
+class BaseStorageManager:
+    """Interface shared by all storage backends
+
+    Backends persist a flat mapping of state keys to picklable values.
+    ``save_state`` writes the given keys and leaves all others untouched;
+    ``load_state`` returns the defaults updated with any stored values.
+    A read-only manager never creates or modifies files and refuses saves.
+    """
+
+    backend_name = None
+
+    def __init__(self, storage_file="pomodoro_data", storage_path=None, read_only=False):
         """Initialize the storage manager with a default storage file"""
-        logger.info(f"Initializing StorageManager with file: {storage_file}")
+        logger.info(f"Initializing {type(self).__name__} with file: {storage_file}")
         self.storage_file = storage_file
-        self.storage_path = os.path.join(os.path.expanduser("~"), ".pomodoro_app")
-        
+        self.storage_path = storage_path or DEFAULT_STORAGE_PATH
+        self.read_only = read_only
+
         # Create storage directory if it doesn't exist
-        if not os.path.exists(self.storage_path):
+        if not read_only and not os.path.exists(self.storage_path):
             os.makedirs(self.storage_path)
             logger.info(f"Created storage directory at {self.storage_path}")
-    
+
+    @property
+    def full_path(self):
+        return os.path.join(self.storage_path, self.storage_file)
+
+    def save_state(self, state_dict):
+        """Save application state to persistent storage"""
+        raise NotImplementedError
+
+    def _refuse_save(self):
+        """Check for read-only mode before a save"""
+        if self.read_only:
+            logger.warning(f"{type(self).__name__} is read-only, not saving state")
+        return self.read_only
+
+    def load_state(self, default_state=None):
+        """Load application state from persistent storage"""
+        raise NotImplementedError
+
+    def export_state(self):
+        """Return every stored key and value, used for migrations"""
+        raise NotImplementedError
+
+    def close(self):
+        """Release any resources held by the backend"""
+
+class StorageManager(BaseStorageManager):
+    """Manages persistent storage of application state using shelve
+
+    A write-through cache keeps the pickled form of every stored value in
+    memory. Reads are served from the cache and saves only touch keys whose
+    pickled value actually changed. The cache is dropped whenever the shelve
+    files are modified by someone else (mtime, inode or size differ from
+    what our last read or write left behind).
+
+    With ``publish_snapshots`` (the app's own store) every save also
+    publishes the cache as an immutable snapshot generation (see
+    ``snapshots``), which external readers use instead of opening the
+    shelve while the app writes to it. Tools leave it off; only one
+    process can publish for a store at a time.
+    """
+
+    backend_name = "shelve"
+
+    # File suffixes the dbm modules used by shelve may create
+    _DBM_SUFFIXES = ("", ".db", ".dat", ".dir", ".bak", ".pag")
+
+    def __init__(self, storage_file="pomodoro_data", storage_path=None, publish_snapshots=False, read_only=False):
+        super().__init__(storage_file, storage_path, read_only)
+        self._lock = threading.RLock()
+        self._cache = None
+        self._signature = None
+        self._snapshots = None
+        if publish_snapshots and not read_only:
+            try:
+                self._snapshots = SnapshotPublisher(snapshot_dir(self.storage_path, self.storage_file))
+            except OSError as e:
+                logger.warning(f"Not publishing state snapshots: {str(e)}")
+
+    def _file_signature(self):
+        """Identify the current on-disk version of the shelve files"""
+        signature = []
+        for suffix in self._DBM_SUFFIXES:
+            try:
+                st = os.stat(self.full_path + suffix)
+            except OSError:
+                continue
+            signature.append((suffix, st.st_ino, st.st_mtime_ns, st.st_size))
+        return tuple(signature)
+
+    def _ensure_cache(self):
+        """Load the cache from disk unless it is still current"""
+        signature = self._file_signature()
+        if self._cache is not None and signature == self._signature:
+            return self._cache
+
+        if self._cache is not None:
+            logger.info("Storage file changed externally, reloading cache")
+        with shelve.open(self.full_path, flag="r" if self.read_only else "c") as storage:
+            # Not every dbm module supports items(), so fetch key by key
+            db, encoding = storage.dict, storage.keyencoding
+            self._cache = {key.decode(encoding): bytes(db[key]) for key in db.keys()}
+        self._signature = self._file_signature()
+        if self._snapshots is not None and self._snapshots.generation == 0:
+            # Give readers something to open before the first save
+            self._publish_snapshot()
+        return self._cache
+
+    def _publish_snapshot(self):
+        """Publish the cache as the next snapshot generation; never fails a save"""
+        try:
+            self._snapshots.publish(self._cache)
+        except OSError as e:
+            logger.warning(f"Failed to publish state snapshot: {str(e)}")
+
+    def invalidate_cache(self):
+        """Force the next access to reload from disk"""
+        with self._lock:
+            self._cache = None
+            self._signature = None
+
     def save_state(self, state_dict):
         """Save application state to persistent storage"""
+        if self._refuse_save():
+            return False
         logger.info("Saving application state")
         try:
-            full_path = os.path.join(self.storage_path, self.storage_file)
-            with shelve.open(full_path) as storage:
+            with self._lock:
+                cache = self._ensure_cache()
+                changed = {}
                 for key, value in state_dict.items():
-                    storage[key] = value
-                    logger.debug(f"Saved state item: {key}")
+                    data = pickle.dumps(value, pickle.DEFAULT_PROTOCOL)
+                    if cache.get(key) != data:
+                        changed[key] = data
+
+                if not changed:
+                    logger.debug("No state items changed, skipping write")
+                    return True
+
+                with shelve.open(self.full_path) as storage:
+                    encoding = storage.keyencoding
+                    for key, data in changed.items():
+                        storage.dict[key.encode(encoding)] = data
+                        logger.debug(f"Saved state item: {key}")
+                cache.update(changed)
+                self._signature = self._file_signature()
+                if self._snapshots is not None:
+                    self._publish_snapshot()
             logger.info("Application state saved successfully")
             return True
         except Exception as e:
             logger.error(f"Failed to save application state: {str(e)}")
+            self.invalidate_cache()
             return False
-    
+
     def load_state(self, default_state=None):
         """Load application state from persistent storage"""
         logger.info("Loading application state")
         state = {} if default_state is None else default_state.copy()
-        
+
         try:
-            full_path = os.path.join(self.storage_path, self.storage_file)
-            with shelve.open(full_path) as storage:
-                # Update state with stored values
+            with self._lock:
+                cache = self._ensure_cache()
+                # Update state with stored values; unpickling hands out fresh objects
                 for key in state.keys():
-                    if key in storage:
-                        state[key] = storage[key]
+                    if key in cache:
+                        state[key] = pickle.loads(cache[key])
                         logger.debug(f"Loaded state item: {key}")
             logger.info("Application state loaded successfully")
         except Exception as e:
             logger.error(f"Failed to load application state: {str(e)}")
-        
+
         return state
+
+    def export_state(self):
+        """Return every stored key and value, used for migrations"""
+        with self._lock:
+            return {key: pickle.loads(data) for key, data in self._ensure_cache().items()}
+
+    def close(self):
+        """Stop publishing snapshots so another process may take over"""
+        with self._lock:
+            if self._snapshots is not None:
+                self._snapshots.close()
+                self._snapshots = None
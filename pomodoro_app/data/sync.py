@@ -0,0 +1,269 @@
+# pomodoro_app/data/sync.py
+"""Delta replication of task history, current task and timer state between replicas.
+
+Every local change is stamped with a revision ``[replica_id, seq, lamport]``.
+Each replica keeps a version vector holding the highest ``seq`` it has seen
+from every replica, so a peer only needs to be sent records whose latest
+revision is newer than what its vector says. Concurrent status updates of
+the same history entry are resolved last-writer-wins by (lamport clock,
+replica id) and the current task follows the most recently started entry,
+so every replica reaches the same state whatever order deltas arrive in.
+
+Timer state keys are written by the timer core, which knows nothing about
+revisions; each key carries its own revision, stamped when a sync finds
+its stored value differs from the one last replicated, and is merged
+last-writer-wins like history entries.
+"""
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import uuid
+from ..core import logger
+from .projects import entry_labels
+from .stats import entry_time
+
+# Keys saved by PomodoroTimerCore that are replicated along with the history
+TIMER_STATE_KEYS = ("pomodoro_time", "break_time", "current_time_left", "current_mode", "pomodoro_count")
+
+class SyncState:
+    """Replica identity, sequence counters and version vector"""
+
+    def __init__(self, data=None):
+        data = data or {}
+        self.replica_id = data.get("replica_id") or uuid.uuid4().hex[:12]
+        self.seq = data.get("seq", 0)
+        self.lamport = data.get("lamport", 0)
+        self.vector = data.get("vector", {})
+        # Last replicated timer state: {key: {"value": value, "rev": rev}}
+        self.timer = data.get("timer", {})
+
+    def to_dict(self):
+        return {
+            "replica_id": self.replica_id,
+            "seq": self.seq,
+            "lamport": self.lamport,
+            "vector": self.vector,
+            "timer": self.timer
+        }
+
+    def next_rev(self):
+        """Revision for a new local change"""
+        self.seq += 1
+        self.lamport += 1
+        self.vector[self.replica_id] = self.seq
+        return [self.replica_id, self.seq, self.lamport]
+
+    def observe(self, rev):
+        """Account for a revision received from another replica"""
+        replica, seq, lamport = rev
+        self.lamport = max(self.lamport, lamport)
+        if seq > self.vector.get(replica, 0):
+            self.vector[replica] = seq
+
+def rev_key(rev):
+    """Total order used for last-writer-wins conflict resolution"""
+    if rev is None:
+        return (-1, "")
+    return (rev[2], rev[0])
+
+def entry_id(entry):
+    """Stable id of a history entry
+
+    TaskManager gives every entry an id when it is recorded or, for entries
+    older than replication, when the store is loaded. The content-derived
+    fallback only serves entries from stores never loaded since; it is not
+    unique, as undated entries of one task at the same time of day collide.
+    """
+    if "id" in entry:
+        return entry["id"]
+    digest = hashlib.sha1(f"{entry.get('started_at', entry.get('time'))}|{entry.get('task')}".encode("utf-8"))
+    return f"legacy:{digest.hexdigest()[:16]}"
+
+class Replicator:
+    """Computes and applies deltas for a TaskManager"""
+
+    def __init__(self, task_manager):
+        self.task_manager = task_manager
+        self.track_timer_state()
+
+    @property
+    def state(self):
+        return self.task_manager.sync_state
+
+    def vector(self):
+        return dict(self.state.vector)
+
+    def _load_timer_state(self):
+        storage = self.task_manager.storage_manager
+        if storage is None:
+            return {}
+        stored = storage.load_state({key: None for key in TIMER_STATE_KEYS})
+        return {key: value for key, value in stored.items() if value is not None}
+
+    def track_timer_state(self):
+        """Stamp timer state keys changed locally since they were last replicated"""
+        records = self.state.timer
+        stamped = 0
+        for key, value in self._load_timer_state().items():
+            record = records.get(key)
+            if record is None or record["value"] != value:
+                records[key] = {"value": value, "rev": self.state.next_rev()}
+                stamped += 1
+        if stamped:
+            # Persist the revisions before they can be sent, so their seqs are never reused
+            self.task_manager._save_state()
+            logger.debug(f"Stamped {stamped} changed timer state keys")
+        return stamped
+
+    def delta_for(self, peer_vector):
+        """Records the peer has not seen yet, as a JSON-serializable dict"""
+        def is_new(rev):
+            return rev is not None and rev[1] > peer_vector.get(rev[0], 0)
+
+        # Archived entries too: the peer may have synced before they were archived here
+        entries = [entry for entry in self.task_manager.iter_history() if is_new(entry.get("rev"))]
+        timer = {key: record for key, record in self.state.timer.items() if is_new(record["rev"])}
+        return {"from": self.state.replica_id, "vector": self.vector(), "entries": entries, "timer": timer}
+
+    def apply_delta(self, delta):
+        """Merge a peer's delta; returns the number of entries and timer keys added or updated"""
+        task_manager = self.task_manager
+        history = task_manager.task_history
+        by_id = {entry_id(entry): i for i, entry in enumerate(history)}
+        archived = set()
+        if task_manager.archive is not None:
+            archived = {entry_id(entry) for entry in task_manager.archive.iter_entries()}
+        newest = history[0] if history else None
+        changed = 0
+
+        for incoming in delta.get("entries", []):
+            rev = incoming.get("rev")
+            if rev is None:
+                continue
+            self.state.observe(rev)
+            if entry_id(incoming) in archived:
+                # Archive segments are immutable; the local copy stands
+                continue
+            index = by_id.get(entry_id(incoming))
+            if index is None:
+                history.append(incoming)
+                by_id[entry_id(incoming)] = len(history) - 1
+                task_manager.stats.apply_change(
+                    incoming["task"], "ongoing", incoming["status"], incoming.get("focus_seconds", 0),
+                    entry_time(incoming), *entry_labels(incoming))
+                task_manager.completer.record(incoming["task"])
+                changed += 1
+            elif rev_key(rev) > rev_key(history[index].get("rev")):
+                local = history[index]
+                focus_delta = incoming.get("focus_seconds", 0) - local.get("focus_seconds", 0)
+                task_manager.stats.apply_change(
+                    local["task"], local["status"], incoming["status"], max(0, focus_delta), entry_time(local),
+                    *entry_labels(local))
+                history[index] = incoming
+                changed += 1
+        entries_changed = changed
+
+        timer_updates = {}
+        for key, record in delta.get("timer", {}).items():
+            if key not in TIMER_STATE_KEYS:
+                continue
+            self.state.observe(record["rev"])
+            local = self.state.timer.get(key)
+            if local is None or rev_key(record["rev"]) > rev_key(local["rev"]):
+                self.state.timer[key] = record
+                timer_updates[key] = record["value"]
+        if timer_updates and task_manager.storage_manager is not None:
+            task_manager.storage_manager.save_state(timer_updates)
+            changed += len(timer_updates)
+
+        if entries_changed:
+            history.sort(key=lambda e: (e.get("started_at") or 0, entry_id(e)), reverse=True)
+            task_manager.search_index.rebuild(history)
+            # Every set_task starts an entry, so the most recently started
+            # entry across all replicas decides the current task
+            if history[0] is not newest:
+                logger.info(f"Current task replaced by replica {history[0]['rev'][0]}: '{history[0]['task']}'")
+                task_manager.current_task = history[0]["task"]
+        task_manager._save_state()
+        logger.info(f"Applied delta from replica {delta.get('from')}: {entries_changed} entries "
+                    f"and {len(timer_updates)} timer state keys merged")
+        return changed
+
+def encode_delta(delta):
+    return gzip.compress(json.dumps(delta, separators=(",", ":")).encode("utf-8"))
+
+def decode_delta(data):
+    return json.loads(gzip.decompress(data).decode("utf-8"))
+
+def _write_atomic(path, data):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def sync_via_directory(replicator, drop_dir):
+    """One round of file-drop replication through a shared directory
+
+    Publishes this replica's version vector, imports deltas addressed to
+    it and writes a delta for every peer whose vector is present. Running
+    it on both machines (in any order, repeatedly) converges both stores.
+    Returns (records merged, bytes written).
+    """
+    os.makedirs(drop_dir, exist_ok=True)
+    me = replicator.state.replica_id
+    merged = 0
+
+    for name in sorted(os.listdir(drop_dir)):
+        if name.endswith(f"_to_{me}.delta.gz"):
+            path = os.path.join(drop_dir, name)
+            with open(path, "rb") as f:
+                merged += replicator.apply_delta(decode_delta(f.read()))
+            os.unlink(path)
+
+    written = 0
+    for name in sorted(os.listdir(drop_dir)):
+        if not name.endswith(".vector.json") or name == f"{me}.vector.json":
+            continue
+        peer = name[:-len(".vector.json")]
+        with open(os.path.join(drop_dir, name), encoding="utf-8") as f:
+            peer_vector = json.load(f)
+        delta = replicator.delta_for(peer_vector)
+        if delta["entries"] or delta["timer"]:
+            data = encode_delta(delta)
+            _write_atomic(os.path.join(drop_dir, f"{me}_to_{peer}.delta.gz"), data)
+            written += len(data)
+
+    _write_atomic(os.path.join(drop_dir, f"{me}.vector.json"), json.dumps(replicator.vector()).encode("utf-8"))
+    logger.info(f"Directory sync: merged {merged} records, wrote {written} bytes")
+    return merged, written
+
+def _send_frame(conn, data):
+    conn.sendall(len(data).to_bytes(4, "big") + data)
+
+def _recv_frame(conn):
+    header = _recv_exact(conn, 4)
+    return _recv_exact(conn, int.from_bytes(header, "big"))
+
+def _recv_exact(conn, size):
+    data = b""
+    while len(data) < size:
+        chunk = conn.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("Peer closed the sync connection")
+        data += chunk
+    return data
+
+def sync_over_socket(replicator, conn):
+    """Symmetric replication over a connected socket
+
+    Both ends exchange version vectors, then send each other exactly the
+    records the other side is missing. Returns (records merged, bytes sent).
+    """
+    _send_frame(conn, json.dumps(replicator.vector()).encode("utf-8"))
+    peer_vector = json.loads(_recv_frame(conn).decode("utf-8"))
+    data = encode_delta(replicator.delta_for(peer_vector))
+    _send_frame(conn, data)
+    merged = replicator.apply_delta(decode_delta(_recv_frame(conn)))
+    return merged, len(data)
@@ -1,19 +1,48 @@
 # pomodoro_app/data/task_manager.py
+import os
+import time
 from datetime import datetime
 from ..core import logger
+from .task_queue import TaskQueue, parse_task_lines
+from .search_index import TaskSearchIndex, matches_query
+from .autocomplete import TaskNameCompleter
+from .stats import ProductivityStats, entry_time
+from .archive import HistoryArchive
+from .sync import SyncState, entry_id
+from .projects import entry_labels, matches_labels, parse_labels
+
+# How often saving history also re-applies the retention window, in seconds
+RETENTION_CHECK_INTERVAL = 3600
 
 class TaskManager:
     """Manages task history and status updates"""
     
-    def __init__(self, storage_manager=None):
+    def __init__(self, storage_manager=None, retention_days=None, archive_compression="gzip", events=None):
         logger.info("Initializing TaskManager")
         self.storage_manager = storage_manager
+        
+        # Optional event bus; publishes "task_status" (entry) on every status change
+        self.events = events
+        
+        # Entries older than retention_days move to compressed archive segments
+        self.retention_days = retention_days
+        self.archive = None
+        storage_path = getattr(storage_manager, "storage_path", None)
+        if storage_path:
+            self.archive = HistoryArchive(os.path.join(storage_path, "archive"), archive_compression)
         self.task_history = []
         self.current_task = "No task set"
+        self.task_queue = TaskQueue()
+        self.search_index = TaskSearchIndex()
+        self.completer = TaskNameCompleter()
+        self.stats = ProductivityStats()
+        self.sync_state = SyncState()
+        self._next_retention = 0
         
         # Load saved state if storage manager is provided
         if self.storage_manager:
             self._load_state()
+            self.apply_retention()
     
     def get_current_task(self):
         """Get the current task"""
@@ -29,41 +58,212 @@ class TaskManager:
         self.current_task = task
         
         # Add to history immediately
-        timestamp = datetime.now().strftime("%H:%M")
-        self.task_history.insert(0, {
-            "time": timestamp, 
-            "task": self.current_task, 
-            "status": "ongoing"
-        })
-        logger.debug(f"Added task to history: '{task}' at {timestamp}")
+        entry = self._add_entry(task, time.time())
+        logger.debug(f"Added task to history: '{task}' at {entry['time']}")
+        if self.events is not None:
+            self.events.publish("task_status", entry)
         
         # Save state if storage manager is available
         self._save_state()
         return True
     
-    def update_task_status(self, status):
-        """Update the status of the current task in history"""
+    def _add_entry(self, task, started_at):
+        """Insert a new ongoing history entry for task at the top of the history"""
+        rev = self.sync_state.next_rev()
+        project, tags = parse_labels(task)
+        entry = {
+            "id": f"{rev[0]}:{rev[1]}",
+            "rev": rev,
+            "time": datetime.fromtimestamp(started_at).strftime("%H:%M"), 
+            "task": task, 
+            "project": project,
+            "tags": tags,
+            "status": "ongoing",
+            "started_at": started_at,
+            "ended_at": None,
+            "focus_seconds": 0
+        }
+        self.task_history.insert(0, entry)
+        self.search_index.add(task)
+        self.completer.record(task)
+        return entry
+    
+    def update_task_status(self, status, focus_seconds=0):
+        """Update the status of the current task in history
+
+        focus_seconds is the focus time spent since the previous update of
+        the entry; it is added to the entry and to the rollups.
+        """
         if not self.task_history:
             logger.warning(f"Attempted to update task status to '{status}' but history is empty")
             return False
             
         if self.task_history[0]["task"] == self.current_task:
             logger.info(f"Updating task '{self.current_task}' status to '{status}'")
-            self.task_history[0]["status"] = status
-            
-            # Save state if storage manager is available
-            self._save_state()
+            self._apply_status(self._pomodoro_entry(focus_seconds), status, focus_seconds)
             return True
         else:
             logger.warning(f"Task '{self.current_task}' not found at top of history")
             return False
     
+    def complete_pomodoro(self, focus_seconds):
+        """Record one completed pomodoro of the current task
+
+        The entry of the pomodoro in progress is completed; when there is
+        none (the task's last pomodoro already completed, or no entry for
+        the current task) a new entry is added, so every completion counts.
+        """
+        if self.current_task == "No task set":
+            logger.warning("Pomodoro completed without a task")
+            return False
+        
+        logger.info(f"Pomodoro of '{self.current_task}' completed")
+        self._apply_status(self._pomodoro_entry(focus_seconds), "completed", focus_seconds)
+        return True
+    
+    def _pomodoro_entry(self, focus_seconds):
+        """Entry of the current task's pomodoro in progress, started now if there is none"""
+        entry = self.task_history[0] if self.task_history else None
+        if entry is None or entry["task"] != self.current_task or entry["status"] == "completed":
+            entry = self._add_entry(self.current_task, time.time() - (focus_seconds or 0))
+            logger.debug(f"Added history entry for another pomodoro of '{self.current_task}'")
+        return entry
+    
+    def _apply_status(self, entry, status, focus_seconds):
+        old_status = entry["status"]
+        entry["status"] = status
+        focus_seconds = max(0, focus_seconds or 0)
+        entry["focus_seconds"] = entry.get("focus_seconds", 0) + focus_seconds
+        if status != "ongoing":
+            entry["ended_at"] = time.time()
+        entry.setdefault("id", entry_id(entry))
+        entry["rev"] = self.sync_state.next_rev()
+        project, tags = entry_labels(entry)
+        self.stats.apply_change(entry["task"], old_status, status, focus_seconds, entry_time(entry), project, tags)
+        if self.events is not None:
+            self.events.publish("task_status", entry)
+        
+        # Save state if storage manager is available
+        self._save_state()
+    
+    def apply_retention(self, now=None):
+        """Move entries older than the retention window into the archive
+
+        Entries recorded before timestamps existed have no date to archive
+        them under and stay live.
+        """
+        if not self.retention_days or self.archive is None:
+            return 0
+        self._next_retention = time.time() + RETENTION_CHECK_INTERVAL
+        cutoff = (now or time.time()) - self.retention_days * 86400
+        
+        # History is newest first, so expired entries are found near the tail
+        expired = [entry for entry in reversed(self.task_history)
+                   if entry.get("started_at") is not None and entry["started_at"] < cutoff]
+        if not expired:
+            return 0
+        
+        expired.reverse()
+        archived = {id(entry) for entry in expired}
+        self.archive.append(expired)
+        self.task_history = [entry for entry in self.task_history if id(entry) not in archived]
+        self.search_index.rebuild(self.task_history)
+        self._save_state()
+        logger.info(f"Archived {len(expired)} history entries older than {self.retention_days} days")
+        return len(expired)
+    
+    def iter_history(self, since=None):
+        """Yield history entries newest first, reading archives when needed"""
+        for entry in self.task_history:
+            if since is not None and entry.get("started_at") is not None and entry["started_at"] < since:
+                return
+            yield entry
+        if self.archive is not None:
+            yield from self.archive.iter_entries(since)
+    
+    def filter_history(self, status="all", project=None, tag=None):
+        """History entries with the given status, project (or sub-project) and tag"""
+        return [entry for entry in self.task_history
+                if (status == "all" or entry["status"] == status) and matches_labels(entry, project, tag)]
+    
+    def search_history(self, query, status="all", limit=None, include_archive=False, project=None, tag=None):
+        """Find history entries whose task name matches query, newest first
+
+        With include_archive, archived entries follow the live ones; every
+        segment is decompressed and scanned, so callers should only ask for
+        it on an explicit request rather than on every keystroke.
+        """
+        results = []
+        last_seq = len(self.task_history) - 1
+        get_text = lambda seq: self.task_history[last_seq - seq]["task"]
+        for seq in self.search_index.search(query, get_text):
+            entry = self.task_history[last_seq - seq]
+            if (status == "all" or entry["status"] == status) and matches_labels(entry, project, tag):
+                results.append(entry)
+                if limit is not None and len(results) >= limit:
+                    break
+        
+        # Archived entries are not indexed; scan them only if the limit is not reached
+        if include_archive and self.archive is not None and (limit is None or len(results) < limit):
+            for entry in self.archive.iter_entries():
+                if ((status == "all" or entry["status"] == status) and matches_query(entry["task"], query)
+                        and matches_labels(entry, project, tag)):
+                    results.append(entry)
+                    if limit is not None and len(results) >= limit:
+                        break
+        logger.debug(f"Search '{query}' ({status}) matched {len(results)} entries")
+        return results
+    
+    def suggest_tasks(self, prefix, limit=None):
+        """Suggest previously used task names starting with prefix"""
+        return self.completer.suggest(prefix, limit)
+    
+    def plan_task(self, task, priority=0, estimate=1):
+        """Add a task to the planned task queue"""
+        if not task:
+            logger.warning("Attempted to plan empty task")
+            return False
+        
+        logger.info(f"Planning task: '{task}' (priority={priority}, estimate={estimate})")
+        self.task_queue.push(task, priority, estimate)
+        self._save_state()
+        return True
+    
+    def import_tasks(self, lines):
+        """Bulk-load planned tasks from lines of text in a single save"""
+        added = self.task_queue.extend(parse_task_lines(lines))
+        logger.info(f"Imported {added} planned tasks ({len(self.task_queue)} queued)")
+        if added:
+            self._save_state()
+        return added
+    
+    def has_planned_tasks(self):
+        """Check whether any planned tasks are waiting in the queue"""
+        return bool(self.task_queue)
+    
+    def start_next_planned_task(self):
+        """Pop the next planned task and make it the current task"""
+        entry = self.task_queue.pop()
+        if entry is None:
+            logger.debug("No planned tasks in queue")
+            return None
+        
+        logger.info(f"Starting next planned task: '{entry['task']}'")
+        self.set_task(entry["task"])
+        return entry
+    
     def _save_state(self):
         """Save task state using storage manager"""
         if self.storage_manager:
+            # A long-running app keeps archiving; apply_retention saves when it moves entries
+            if self.retention_days and time.time() >= self._next_retention and self.apply_retention():
+                return
             state = {
                 "task_history": self.task_history,
-                "current_task": self.current_task
+                "current_task": self.current_task,
+                "task_queue": self.task_queue.to_list(),
+                "stats": self.stats.to_dict(),
+                "sync_state": self.sync_state.to_dict()
             }
             self.storage_manager.save_state(state)
     
@@ -72,10 +272,43 @@ class TaskManager:
         if self.storage_manager:
             default_state = {
                 "task_history": self.task_history,
-                "current_task": self.current_task
+                "current_task": self.current_task,
+                "task_queue": [],
+                "stats": None,
+                "sync_state": None
             }
             state = self.storage_manager.load_state(default_state)
             
             self.task_history = state.get("task_history", [])
             self.current_task = state.get("current_task", "No task set")
-            logger.info(f"Loaded {len(self.task_history)} tasks from storage")
+            self.task_queue = TaskQueue(state.get("task_queue", []))
+            self.sync_state = SyncState(state.get("sync_state"))
+            stamped = self._stamp_legacy_entries()
+            self.search_index.rebuild(self.task_history)
+            self.completer.build(self.task_history)
+            if state.get("stats") is not None and "projects" in state["stats"]:
+                self.stats = ProductivityStats(state["stats"])
+            else:
+                # First run with rollups or label rollups: backfill once from timestamped history
+                self.stats.rebuild(self.task_history)
+            logger.info(f"Loaded {len(self.task_history)} tasks and {len(self.task_queue)} planned tasks from storage")
+            # Read-only stores (exports, reports) get revisions again on every load
+            if stamped and not getattr(self.storage_manager, "read_only", False):
+                self._save_state()
+    
+    def _stamp_legacy_entries(self):
+        """Give entries recorded before replication existed an id and a revision
+        
+        Stamped oldest first so they replicate like entries recorded here;
+        done before retention archives anything, since segments are immutable.
+        The id comes from the revision like any new entry's: legacy entries
+        carry no date, so their content does not tell them apart.
+        """
+        legacy = [entry for entry in reversed(self.task_history) if entry.get("rev") is None]
+        for entry in legacy:
+            rev = self.sync_state.next_rev()
+            entry["id"] = f"{rev[0]}:{rev[1]}"
+            entry["rev"] = rev
+        if legacy:
+            logger.info(f"Assigned sync revisions to {len(legacy)} legacy history entries")
+        return len(legacy)
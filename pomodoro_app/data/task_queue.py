@@ -0,0 +1,130 @@
+# pomodoro_app/data/task_queue.py
+import heapq
+import itertools
+from ..core import logger
+
+class TaskQueue:
+    """Priority queue of planned tasks backed by a binary heap
+
+    Tasks with a higher priority come first; ties are broken by the smaller
+    estimated number of pomodoros and then by insertion order.
+    """
+
+    def __init__(self, entries=None):
+        self._heap = []
+        self._counter = itertools.count()
+        if entries:
+            self.extend(entries)
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __bool__(self):
+        return bool(self._heap)
+
+    def push(self, task, priority=0, estimate=1):
+        """Add a single planned task in O(log n)"""
+        heapq.heappush(self._heap, self._make_entry(task, priority, estimate))
+
+    def extend(self, entries):
+        """Add many planned tasks at once in O(n)
+
+        Each entry is a (task, priority, estimate) tuple or a dict with the
+        same keys, as written by ``to_list``. A dict's "seq" keeps its place
+        among equal tasks. Returns the number of tasks added.
+        """
+        parsed = []
+        for entry in entries:
+            if isinstance(entry, dict):
+                task = entry.get("task")
+                priority = entry.get("priority", 0)
+                estimate = entry.get("estimate", 1)
+                seq = entry.get("seq")
+            else:
+                task, priority, estimate = entry
+                seq = None
+            if task:
+                parsed.append((task, priority, estimate, seq))
+
+        # Tasks added later must sort after every restored one
+        restored = [seq for _, _, _, seq in parsed if seq is not None]
+        if restored:
+            self._counter = itertools.count(max(next(self._counter), max(restored) + 1))
+        for task, priority, estimate, seq in parsed:
+            self._heap.append(self._make_entry(task, priority, estimate, seq))
+        heapq.heapify(self._heap)
+        return len(parsed)
+
+    def pop(self):
+        """Remove and return the next planned task as a dict, or None"""
+        if not self._heap:
+            return None
+        return self._to_dict(heapq.heappop(self._heap))
+
+    def peek(self):
+        """Return the next planned task without removing it, or None"""
+        if not self._heap:
+            return None
+        return self._to_dict(self._heap[0])
+
+    def clear(self):
+        self._heap = []
+
+    def to_list(self):
+        """Serialize the queue as a list of dicts in O(n)
+
+        The heap array is written as it is rather than sorted, since it is
+        saved with every state change; ``extend`` heapifies it back.
+        """
+        return [dict(self._to_dict(entry), seq=entry[2]) for entry in self._heap]
+
+    def _make_entry(self, task, priority, estimate, seq=None):
+        if seq is None:
+            seq = next(self._counter)
+        return (-int(priority), max(int(estimate), 1), int(seq), task)
+
+    @staticmethod
+    def _to_dict(entry):
+        neg_priority, estimate, _, task = entry
+        return {"task": task, "priority": -neg_priority, "estimate": estimate}
+
+def parse_task_line(line):
+    """Parse a planned task line of the form "[priority,[estimate,]]task"
+
+    Returns a (task, priority, estimate) tuple, or None for blank lines and
+    comments.
+    """
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+
+    priority, estimate = 0, 1
+    parts = line.split(",", 2)
+    numbers = []
+    for part in parts[:-1]:
+        try:
+            numbers.append(int(part.strip()))
+        except ValueError:
+            break
+
+    if len(numbers) == 2:
+        priority, estimate = numbers
+        task = parts[2]
+    elif len(numbers) == 1:
+        priority = numbers[0]
+        task = line.split(",", 1)[1]
+    else:
+        task = line
+
+    task = task.strip()
+    if not task:
+        logger.warning(f"Skipping planned task line without a task name: '{line}'")
+        return None
+    return task, priority, estimate
+
+def parse_task_lines(lines):
+    """Parse an iterable of planned task lines, skipping blank ones"""
+    for line in lines:
+        parsed = parse_task_line(line)
+        if parsed:
+            yield parsed
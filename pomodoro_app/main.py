@@ -1,22 +1,127 @@
 # pomodoro_app/main.py
-import tkinter as tk
+import time
+# Taken before the heavier imports so startup milestones include them
+PROCESS_STARTED = time.perf_counter()
+
+import os
 import sys
 import argparse
 import atexit
-from pomodoro_app.core.logger import get_logger, logging
-from pomodoro_app.core.timer import PomodoroTimerCore
-from pomodoro_app.data.task_manager import TaskManager
-from pomodoro_app.data.storage_manager import StorageManager
-from pomodoro_app.utils.tray_icon import SystemTrayIcon
-from pomodoro_app.ui.main_window import MainWindow
+from pomodoro_app.core.logger import configure as configure_logging, get_logger, logging
+from pomodoro_app.core import profiler, trace
+from pomodoro_app.core.instance import SingleInstance, send_command
+from pomodoro_app.data.storage_backends import BACKENDS, BACKEND_ENV_VAR, create_storage_manager
+from pomodoro_app.core.http_sink import SINK_TOKEN_ENV_VAR, SINK_URL_ENV_VAR
 
-def parse_args():
-    """Parse command line arguments"""
+def build_parser():
+    """Command line parser; its defaults tell which options were given"""
     parser = argparse.ArgumentParser(description="Pomodoro Timer Application")
     parser.add_argument('--debug', action='store_true', help='Enable debug logging')
     parser.add_argument('--pomodoro', type=int, help='Set pomodoro time in minutes', default=25)
     parser.add_argument('--break', type=int, help='Set break time in minutes', default=5)
-    return parser.parse_args()
+    parser.add_argument('--log-budget-mb', type=float, default=20,
+                        help='Disk space kept for current and rotated log files')
+    parser.add_argument('--trace-size', type=int, default=4096,
+                        help='Number of events kept in the in-memory trace buffer')
+    parser.add_argument('--profile-sampling', action='store_true',
+                        help='Also sample all thread stacks while profiling (toggled with SIGUSR1)')
+    parser.add_argument('--retention-days', type=int, default=90,
+                        help='Archive task history older than this many days (0 keeps everything live)')
+    parser.add_argument('--archive-compression', choices=['gzip', 'lzma'], default='gzip',
+                        help='Compression used for archived history segments')
+    parser.add_argument('--storage', choices=sorted(BACKENDS),
+                        help=f'Storage backend (defaults to ${BACKEND_ENV_VAR} or shelve)')
+    parser.add_argument('--sink-url',
+                        help=f'POST completed sessions and status changes here (defaults to ${SINK_URL_ENV_VAR})')
+    parser.add_argument('--start', action='store_true', help='Start the timer')
+    parser.add_argument('--pause', action='store_true', help='Pause the timer')
+    parser.add_argument('--task', help='Set the current task')
+    parser.add_argument('--import-tasks', metavar='FILE',
+                        help='Bulk-load planned tasks ("[priority,[estimate,]]task" per line, "-" for stdin)')
+    return parser
+
+def parse_args():
+    """Parse command line arguments"""
+    return build_parser().parse_args()
+
+# Options a later launch forwards to the running instance; --debug only
+# affects the launch itself. Anything else cannot be applied once running
+FORWARDED_OPTIONS = {"task", "start", "pause", "import_tasks", "debug"}
+
+def read_task_lines(path):
+    """Read planned task lines from a file or stdin; None if it cannot be read"""
+    try:
+        if path == '-':
+            return sys.stdin.readlines()
+        with open(path, encoding='utf-8') as f:
+            return f.readlines()
+    except OSError as e:
+        get_logger().error(f"Failed to import planned tasks from {path}: {str(e)}")
+        return None
+
+def import_planned_tasks(task_manager, path):
+    """Load planned tasks from a file or stdin into the task queue"""
+    lines = read_task_lines(path)
+    if lines is None:
+        return 0
+    return task_manager.import_tasks(lines)
+
+def start_http_sink(args, storage_manager, events):
+    """Deliver session events to the configured endpoint, if any"""
+    url = args.sink_url or os.environ.get(SINK_URL_ENV_VAR)
+    if not url:
+        return None
+    from pomodoro_app.core.http_sink import HttpSink
+    spool_dir = os.path.join(storage_manager.storage_path, "spool")
+    try:
+        sink = HttpSink(url, spool_dir, token=os.environ.get(SINK_TOKEN_ENV_VAR))
+    except ValueError as e:
+        get_logger().error(str(e))
+        return None
+    sink.attach(events)
+    sink.start()
+    atexit.register(sink.stop)
+    return sink
+
+def build_command(args):
+    """Build the command forwarded to an already running instance"""
+    if args.task:
+        return {"action": "set_task", "task": args.task, "start": args.start}
+    if args.start:
+        return {"action": "start"}
+    if args.pause:
+        return {"action": "pause"}
+    return {"action": "open"}
+
+def ignored_options(args):
+    """Options given on the command line that the running instance cannot apply"""
+    parser = build_parser()
+    return sorted(f"--{dest.replace('_', '-')}" for dest, value in vars(args).items()
+                  if dest not in FORWARDED_OPTIONS and value != parser.get_default(dest))
+
+def forward_to_running_instance(args):
+    """Send this launch's commands to the running instance; returns the exit code"""
+    logger = get_logger()
+    ignored = ignored_options(args)
+    if ignored:
+        logger.error(f"Cannot apply {', '.join(ignored)} while another instance is running; close it first")
+        return 2
+    
+    commands = []
+    if args.import_tasks:
+        lines = read_task_lines(args.import_tasks)
+        if lines is None:
+            return 1
+        commands.append({"action": "import_tasks", "lines": lines})
+    if not commands or args.task or args.start or args.pause:
+        commands.append(build_command(args))
+    
+    for command in commands:
+        if not send_command(command):
+            logger.error("Another instance holds the lock but did not respond")
+            return 1
+        logger.info(f"Forwarded '{command['action']}' to running instance")
+    return 0
 
 def main():
     """Main application entry point"""
@@ -25,30 +130,45 @@ def main():
     
     # Configure logging level based on arguments
     log_level = logging.DEBUG if args.debug else logging.INFO
+    configure_logging(budget_bytes=int(args.log_budget_mb * 1024 * 1024))
     logger = get_logger()
     logger.setLevel(log_level)
     
     logger.info("Starting Pomodoro Timer Application")
     
+    # Keep recent hot-path events in memory; dump them with SIGUSR2 or on a crash
+    trace.configure(size=args.trace_size)
+    
+    # Hand off to the running instance instead of starting a second one
+    instance = SingleInstance()
+    if not instance.acquire():
+        return forward_to_running_instance(args)
+    atexit.register(instance.release)
+    trace.install_handlers()
+    profiler.configure(sampling=args.profile_sampling)
+    profiler.install_handler()
+    
+    # Heavy UI imports are deferred until we know we are the primary instance
+    import tkinter as tk
+    from pomodoro_app.core.startup import StartupMetrics, load_in_background
+    from pomodoro_app.core.timer import PomodoroTimerCore
+    from pomodoro_app.data.task_manager import TaskManager
+    from pomodoro_app.utils.notifications import preload as preload_notifications
+    from pomodoro_app.utils.tray_icon import SystemTrayIcon
+    from pomodoro_app.ui.main_window import MainWindow
+    
+    metrics = StartupMetrics(PROCESS_STARTED)
     try:
-        # Create the storage manager
-        storage_manager = StorageManager()
-        
         # Create the root Tkinter window
         root = tk.Tk()
         root.title("Pomodoro Timer")
         root.geometry("400x900")
         root.resizable(False, True)
         
-        # Initialize core components with storage manager
-        timer_core = PomodoroTimerCore(storage_manager)
-        task_manager = TaskManager(storage_manager)
-        
-        # Create a placeholder for SystemTrayIcon
+        # Build the window skeleton from defaults; state is filled in once loaded
+        timer_core = PomodoroTimerCore()
         tray_icon = SystemTrayIcon(None)
-        
-        # Create the main window
-        app = MainWindow(root, timer_core, task_manager, tray_icon)
+        app = MainWindow(root, timer_core, TaskManager(), tray_icon, loading=True)
         
         # Update the tray icon with the real app
         tray_icon.app = app
@@ -59,6 +179,56 @@ def main():
         # Handle window close event
         root.protocol("WM_DELETE_WINDOW", app.on_close)
         
+        # Tk reports callback errors itself, so dump the trace from there too
+        def report_callback_exception(exc_type, exc, tb):
+            trace.dump("crash")
+            logger.error("Exception in Tk callback", exc_info=(exc_type, exc, tb))
+        root.report_callback_exception = report_callback_exception
+        
+        # Paint the skeleton before touching storage
+        root.update()
+        metrics.mark("first_paint")
+        
+        def load_state():
+            # Runs on the loader thread; nothing here may touch Tk
+            # Only the app publishes snapshots; tools read them without locking
+            storage_manager = create_storage_manager(args.storage, publish_snapshots=True)
+            task_manager = TaskManager(storage_manager, args.retention_days, args.archive_compression,
+                                       events=timer_core.events)
+            if args.import_tasks:
+                import_planned_tasks(task_manager, args.import_tasks)
+            tray_icon.preload()
+            preload_notifications()
+            start_http_sink(args, storage_manager, timer_core.events)
+            return storage_manager, task_manager
+        
+        def on_state_loaded(result):
+            storage_manager, task_manager = result
+            metrics.mark("state_loaded")
+            timer_core.attach_storage(storage_manager)
+            app.hydrate(task_manager)
+            root.update_idletasks()
+            metrics.mark("interactive")
+            logger.info(f"Startup milestones (ms): {metrics.report()}")
+        
+        def on_load_failed(error):
+            logger.critical(f"Failed to load application state: {str(error)}")
+            trace.dump("crash")
+            root.destroy()
+        
+        load_in_background(root, load_state, on_state_loaded, on_load_failed)
+        
+        # Accept commands from later launches
+        def forward_to_ui(command):
+            # Commands arrive on the listener thread; run them on the Tk loop
+            root.after(0, app.handle_remote_command, command)
+            return True
+        instance.serve(forward_to_ui)
+        
+        # Apply this launch's own command-line actions once state is loaded
+        if args.task or args.start:
+            root.after(0, app.handle_remote_command, build_command(args))
+        
         # Start the Tkinter event loop
         logger.info("Entering main event loop")
         root.mainloop()
@@ -67,6 +237,7 @@ def main():
     
     except Exception as e:
         logger.critical(f"Unhandled exception: {str(e)}")
+        trace.dump("crash")
         logger.exception("Exception details:")
         return 1
     
@@ -0,0 +1,156 @@
+# pomodoro_app/tools/async_timer_benchmark.py
+"""Compare the asyncio timer with the threaded core at scale.
+
+Runs the same workload, many timers each going through a pomodoro and a
+break on an accelerated clock, once with AsyncPomodoroTimer instances
+sharing one event loop and once with PomodoroTimerCore instances. Each
+variant runs in a fresh process, which reports CPU time, wall time, peak
+RSS, peak thread count and the ticks and completions it saw.
+
+Usage:
+    python -m pomodoro_app.tools.async_timer_benchmark --timers 1000
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import resource
+import sys
+import threading
+import time
+from .soak import rss_bytes
+
+def quiet():
+    from ..core.logger import get_logger
+    get_logger().setLevel(logging.ERROR)
+
+def measure(run_workload, args):
+    """Run a workload and collect process-level costs"""
+    quiet()
+    rss_before = rss_bytes()
+    peak_threads = [threading.active_count()]
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    ticks, completions = run_workload(args, peak_threads)
+    return {
+        "cpu_seconds": round(time.process_time() - cpu_start, 3),
+        "wall_seconds": round(time.perf_counter() - wall_start, 3),
+        "rss_growth_mb": round((rss_bytes() - rss_before) / 2**20, 2),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 2),
+        "peak_threads": max(peak_threads),
+        "ticks": ticks,
+        "completions": completions
+    }
+
+def run_async(args, peak_threads):
+    import asyncio
+    from ..core.async_timer import AsyncPomodoroTimer
+    from ..core.clock import AcceleratedClock
+
+    async def workload():
+        clock = AcceleratedClock(args.speed)
+        counts = {"ticks": 0, "completions": 0}
+
+        async def drive(timer):
+            # Consume ticks through the async iterator, as an embedding app would
+            async def count_ticks(stream):
+                async with stream:
+                    async for event in stream:
+                        counts["ticks"] += event.name == "tick"
+            consumer = asyncio.create_task(count_ticks(timer.events()))
+            for _ in range(args.sessions):
+                timer.start()
+                await timer.completed()
+                counts["completions"] += 1
+            consumer.cancel()
+
+        timers = []
+        for _ in range(args.timers):
+            timer = AsyncPomodoroTimer(clock=clock, resolution=args.resolution)
+            timer.set_timer_duration(args.session_seconds, args.session_seconds)
+            timers.append(timer)
+        peak_threads.append(threading.active_count())
+        await asyncio.gather(*(drive(timer) for timer in timers))
+        peak_threads.append(threading.active_count())
+        return counts["ticks"], counts["completions"]
+
+    return asyncio.run(workload())
+
+def run_threaded(args, peak_threads):
+    from ..core import timer as timer_module
+    from ..core.clock import AcceleratedClock
+    from ..core.events import SYNC
+    from ..core.timer import PomodoroTimerCore
+
+    # The async timer does not notify by default either
+    timer_module.send_notification = lambda *args, **kwargs: True
+    clock = AcceleratedClock(args.speed)
+    counts = {"ticks": 0, "completions": 0}
+    lock = threading.Lock()
+
+    def on_tick(time_left, mode):
+        with lock:
+            counts["ticks"] += 1
+
+    def on_complete(*args):
+        with lock:
+            counts["completions"] += 1
+
+    timers = []
+    for _ in range(args.timers):
+        timer = PomodoroTimerCore(clock=clock)
+        timer.set_timer_duration(args.session_seconds, args.session_seconds)
+        timer.events.subscribe("benchmark", {"tick": on_tick, "pomodoro_complete": on_complete,
+                                             "break_complete": on_complete}, mode=SYNC)
+        timers.append(timer)
+
+    # Start the next session of every timer whose previous one finished
+    started = [0] * len(timers)
+    total = args.timers * args.sessions
+    while counts["completions"] < total:
+        for i, timer in enumerate(timers):
+            if not timer.timer_running and started[i] < args.sessions:
+                if timer.start():
+                    started[i] += 1
+        peak_threads.append(threading.active_count())
+        time.sleep(0.005)
+    return counts["ticks"], counts["completions"]
+
+VARIANTS = {"async": run_async, "threaded": run_threaded}
+
+def run_variant(name, args):
+    return measure(VARIANTS[name], args)
+
+def run(args):
+    results = {}
+    with multiprocessing.Pool(1, maxtasksperchild=1) as pool:
+        for name in args.variants:
+            results[name] = pool.apply(run_variant, (name, args))
+    report = {
+        "timers": args.timers,
+        "sessions": args.sessions,
+        "session_seconds": args.session_seconds,
+        "speed": args.speed,
+        "resolution": args.resolution,
+        "results": results
+    }
+    print(json.dumps(report, indent=2))
+    return 0
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the asyncio timer with the threaded core")
+    parser.add_argument('--timers', type=int, default=1000, help='Concurrent timers')
+    parser.add_argument('--sessions', type=int, default=2, help='Sessions per timer (pomodoro, break, ...)')
+    parser.add_argument('--session-seconds', type=int, default=60, help='Pomodoro and break length')
+    parser.add_argument('--speed', type=float, default=60.0, help='Clock acceleration factor')
+    parser.add_argument('--resolution', type=float, default=1.0, help='Async tick interval; 0 disables ticks')
+    parser.add_argument('--variants', nargs='+', choices=sorted(VARIANTS), default=["async", "threaded"])
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    quiet()
+    return run(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+# pomodoro_app/tools/export_history.py
+"""Export task history, including archived segments, to CSV.
+
+Usage:
+    python -m pomodoro_app.tools.export_history history.csv [--since 2024-01-01]
+"""
+import argparse
+import csv
+import logging
+import sys
+from datetime import datetime
+from ..core.instance import SingleInstance
+from ..core.logger import get_logger
+from ..data.storage_backends import BACKENDS, SnapshotStorageManager, create_storage_manager
+from ..data.task_manager import TaskManager
+
+FIELDS = ["started_at", "ended_at", "time", "task", "status", "focus_seconds"]
+
+def format_timestamp(value):
+    return datetime.fromtimestamp(value).isoformat(timespec="seconds") if value else ""
+
+def export(task_manager, output, since=None):
+    writer = csv.writer(output)
+    writer.writerow(FIELDS)
+    count = 0
+    for entry in task_manager.iter_history(since):
+        writer.writerow([
+            format_timestamp(entry.get("started_at")),
+            format_timestamp(entry.get("ended_at")),
+            entry.get("time", ""),
+            entry.get("task", ""),
+            entry.get("status", ""),
+            entry.get("focus_seconds", "")
+        ])
+        count += 1
+    return count
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Export Pomodoro task history to CSV")
+    parser.add_argument('output', help='CSV file to write ("-" for stdout)')
+    parser.add_argument('--since', type=datetime.fromisoformat, help='Only export entries started on or after this date')
+    parser.add_argument('--storage', choices=sorted(BACKENDS), help='Storage backend')
+    parser.add_argument('--path', help='Storage directory (defaults to ~/.pomodoro_app)')
+    parser.add_argument('--snapshot', action='store_true',
+                        help='Read the newest published snapshot; safe while the app is running')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    get_logger().setLevel(logging.WARNING)
+    instance = None
+    if args.snapshot:
+        storage = SnapshotStorageManager(storage_path=args.path)
+    else:
+        # The live store is only consistent while the app is not writing it
+        instance = SingleInstance(args.path)
+        if not instance.acquire():
+            print("The Pomodoro app is running; use --snapshot to export while it runs", file=sys.stderr)
+            return 1
+        storage = create_storage_manager(args.storage, args.path, read_only=True)
+    try:
+        task_manager = TaskManager(storage)
+        since = args.since.timestamp() if args.since else None
+
+        if args.output == "-":
+            count = export(task_manager, sys.stdout, since)
+        else:
+            with open(args.output, "w", newline="", encoding="utf-8") as f:
+                count = export(task_manager, f, since)
+    finally:
+        storage.close()
+        if instance is not None:
+            instance.release()
+    print(f"Exported {count} history entries", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+# pomodoro_app/tools/fleet_analytics.py
+"""Aggregate reports over many users' Pomodoro stores.
+
+Discovers stores under a directory (one ``.pomodoro_app`` style folder per
+person), loads them read-only in parallel worker processes, turns each
+task history (archived segments included) into NumPy columns and writes
+vectorized aggregates to CSV files as each store finishes.
+
+Usage:
+    python -m pomodoro_app.tools.fleet_analytics BACKUP_DIR --output reports/
+"""
+import argparse
+import csv
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from ..core.logger import disable_file_logging, get_logger
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Marker files identifying a store and the backend that wrote it
+STORE_MARKERS = {
+    "pomodoro_data.sqlite3": "sqlite",
+    "pomodoro_data.json": "json",
+    "pomodoro_data.dat": "shelve",
+    "pomodoro_data.db": "shelve",
+    "pomodoro_data": "shelve"
+}
+
+STATUS_CODES = {"ongoing": 0, "completed": 1, "interrupted": 2}
+
+def discover_stores(root):
+    """Yield (person, path, backend) for every store below root"""
+    for dirpath, dirnames, filenames in os.walk(root):
+        names = set(filenames)
+        for marker, backend in STORE_MARKERS.items():
+            if marker in names:
+                person = os.path.relpath(dirpath, root)
+                if os.path.basename(person) == ".pomodoro_app":
+                    person = os.path.dirname(person) or person
+                yield person, dirpath, backend
+                break
+        dirnames.sort()
+
+def history_to_columns(task_history):
+    """Convert a history list into columnar arrays
+
+    Entries written before timestamps were recorded get NaN start times and
+    only count towards the status ratios.
+    """
+    size = len(task_history)
+    started_at = np.fromiter(
+        (entry.get("started_at") or np.nan for entry in task_history), dtype=np.float64, count=size)
+    focus = np.fromiter(
+        (entry.get("focus_seconds") or 0 for entry in task_history), dtype=np.float64, count=size)
+    status = np.fromiter(
+        (STATUS_CODES.get(entry.get("status"), 0) for entry in task_history), dtype=np.int8, count=size)
+    return started_at, focus, status
+
+def aggregate(started_at, focus, status, utc_offset_hours=0.0):
+    """Vectorized per-store aggregates"""
+    completed = int(np.count_nonzero(status == STATUS_CODES["completed"]))
+    interrupted = int(np.count_nonzero(status == STATUS_CODES["interrupted"]))
+
+    timed = ~np.isnan(started_at)
+    local = started_at[timed] + utc_offset_hours * 3600
+    days = np.floor_divide(local, 86400).astype(np.int64)
+    # 1970-01-01 was a Thursday; shift so weeks start on Monday
+    week_start = days - (days + 3) % 7
+    weeks, inverse = np.unique(week_start, return_inverse=True)
+    weekly_hours = np.bincount(inverse, weights=focus[timed], minlength=len(weeks)) / 3600.0
+
+    hours = (np.floor_divide(local, 3600).astype(np.int64)) % 24
+    hour_counts = np.bincount(hours, minlength=24)
+
+    return {
+        "entries": len(status),
+        "completed": completed,
+        "interrupted": interrupted,
+        "weeks": weeks,
+        "weekly_hours": weekly_hours,
+        "hour_counts": hour_counts
+    }
+
+def init_worker():
+    """Worker process initializer: console-only logging at WARNING
+
+    Workers share the parent's log file otherwise, and several processes
+    rotating one file lose or clobber each other's records.
+    """
+    disable_file_logging()
+    get_logger().setLevel(logging.WARNING)
+
+def process_store(person, path, backend, utc_offset_hours):
+    """Worker entry point: load one store and aggregate it"""
+    from ..data.archive import HistoryArchive
+    from ..data.storage_backends import create_storage_manager
+    # Backups may sit on read-only media; never create or touch files in them
+    storage = create_storage_manager(backend, path, read_only=True)
+    try:
+        history = storage.load_state({"task_history": []})["task_history"]
+    finally:
+        storage.close()
+    # Entries moved out by the retention policy still count
+    history.extend(HistoryArchive(os.path.join(path, "archive")).iter_entries())
+    return person, aggregate(*history_to_columns(history), utc_offset_hours)
+
+def week_label(week_start_day):
+    return str(np.datetime64(int(week_start_day), "D"))
+
+def run(root, output_dir, workers=None, utc_offset_hours=0.0):
+    os.makedirs(output_dir, exist_ok=True)
+    stores = list(discover_stores(root))
+    print(f"Found {len(stores)} stores under {root}", file=sys.stderr)
+
+    start = time.perf_counter()
+    total_entries = 0
+    with open(os.path.join(output_dir, "weekly_focus.csv"), "w", newline="") as weekly_file, \
+         open(os.path.join(output_dir, "ratios.csv"), "w", newline="") as ratios_file, \
+         open(os.path.join(output_dir, "hour_of_day.csv"), "w", newline="") as hours_file:
+        weekly = csv.writer(weekly_file)
+        ratios = csv.writer(ratios_file)
+        hours = csv.writer(hours_file)
+        weekly.writerow(["person", "week_start", "focus_hours"])
+        ratios.writerow(["person", "entries", "completed", "interrupted", "completion_ratio"])
+        hours.writerow(["person"] + [f"h{h:02d}" for h in range(24)])
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+            futures = [pool.submit(process_store, person, path, backend, utc_offset_hours)
+                       for person, path, backend in stores]
+            for future in as_completed(futures):
+                try:
+                    person, result = future.result()
+                except Exception as e:
+                    print(f"Skipping store: {e}", file=sys.stderr)
+                    continue
+                total_entries += result["entries"]
+                for week, focus_hours in zip(result["weeks"], result["weekly_hours"]):
+                    weekly.writerow([person, week_label(week), f"{focus_hours:.3f}"])
+                finished = result["completed"] + result["interrupted"]
+                ratio = result["completed"] / finished if finished else 0.0
+                ratios.writerow([person, result["entries"], result["completed"], result["interrupted"], f"{ratio:.4f}"])
+                hours.writerow([person] + result["hour_counts"].tolist())
+
+    elapsed = time.perf_counter() - start
+    print(f"Processed {total_entries} entries from {len(stores)} stores in {elapsed:.2f}s", file=sys.stderr)
+    return len(stores)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Aggregate Pomodoro statistics across many stores")
+    parser.add_argument('root', help='Directory containing per-person stores')
+    parser.add_argument('--output', default='fleet_reports', help='Directory for the CSV reports')
+    parser.add_argument('--workers', type=int, help='Worker processes (defaults to CPU count)')
+    parser.add_argument('--utc-offset', type=float, default=0.0,
+                        help='Hours added to timestamps before bucketing by week and hour')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if np is None:
+        print("fleet_analytics requires NumPy: pip install -r requirements-tools.txt", file=sys.stderr)
+        return 1
+    get_logger().setLevel(logging.WARNING)
+    run(args.root, args.output, args.workers, args.utc_offset)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+# pomodoro_app/tools/migrate_storage.py
+"""Copy application state from one storage backend to another.
+
+Usage:
+    python -m pomodoro_app.tools.migrate_storage --from shelve --to sqlite
+"""
+import argparse
+import sys
+from ..core import logger
+from ..data.storage_backends import BACKENDS, create_storage_manager, migrate_state
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Migrate Pomodoro state between storage backends")
+    parser.add_argument('--from', dest='source', required=True, choices=sorted(BACKENDS),
+                        help='Backend to read state from')
+    parser.add_argument('--to', dest='target', required=True, choices=sorted(BACKENDS),
+                        help='Backend to write state to')
+    parser.add_argument('--path', help='Storage directory (defaults to ~/.pomodoro_app)')
+    parser.add_argument('--target-path', help='Storage directory for the target backend (defaults to --path)')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.source == args.target and not args.target_path:
+        print("Source and target backends are the same", file=sys.stderr)
+        return 1
+
+    source = create_storage_manager(args.source, args.path)
+    target = create_storage_manager(args.target, args.target_path or args.path)
+    try:
+        count = migrate_state(source, target)
+    except Exception as e:
+        logger.error(f"Migration failed: {str(e)}")
+        return 1
+    finally:
+        source.close()
+        target.close()
+
+    print(f"Migrated {count} keys from {args.source} to {args.target}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+# pomodoro_app/tools/sink_check.py
+"""Exercise the HTTP sink against a local stand-in endpoint.
+
+Starts a threaded HTTP server on localhost that accepts JSON batches,
+optionally failing a fraction of requests or going offline for a while,
+publishes session events through an event bus and reports delivery
+throughput, retries and the remaining backlog. Exits non-zero if any
+record was lost or duplicated.
+
+Usage:
+    python -m pomodoro_app.tools.sink_check --records 5000 --fail-rate 0.2
+"""
+import argparse
+import json
+import logging
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from ..core.events import EventBus
+from ..core.logger import get_logger
+from ..core.http_sink import HttpSink
+
+class StandInEndpoint(ThreadingHTTPServer):
+    """Collects posted records; fails requests at random or while offline"""
+
+    daemon_threads = True
+
+    def __init__(self, fail_rate=0.0):
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.fail_rate = fail_rate
+        self.offline = False
+        self.records = []
+        self.requests = 0
+        self.connections = set()
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/events"
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        with server.lock:
+            server.requests += 1
+            server.connections.add(self.client_address)
+            failed = server.offline or random.random() < server.fail_rate
+            if not failed:
+                server.records.extend(json.loads(body))
+        self.send_response(503 if failed else 204)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+def run(args):
+    spool_dir = tempfile.mkdtemp(prefix="pomodoro_sink_")
+    server = StandInEndpoint(args.fail_rate)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    events = EventBus()
+    sink = HttpSink(server.url, spool_dir, batch_size=args.batch_size, flush_interval=args.flush_interval,
+                    min_backoff=0.05, max_backoff=0.5)
+    sink.attach(events)
+    sink.start()
+    try:
+        start = time.perf_counter()
+        for i in range(args.records):
+            if i == args.records // 3 and args.offline_seconds:
+                server.offline = True
+                threading.Timer(args.offline_seconds, setattr, (server, "offline", False)).start()
+            if i % 2:
+                events.publish("pomodoro_complete", i)
+            else:
+                events.publish("task_status", {"task": f"Task {i % 20}", "status": "completed", "seq": i})
+        sink.flush()
+
+        deadline = time.monotonic() + args.timeout
+        while len(server.records) < args.records and time.monotonic() < deadline:
+            time.sleep(0.01)
+        elapsed = time.perf_counter() - start
+        stats = sink.stats()
+    finally:
+        sink.stop()
+        server.shutdown()
+        shutil.rmtree(spool_dir, ignore_errors=True)
+
+    received = len(server.records)
+    unique = len({(r["type"], r.get("count"), r.get("seq")) for r in server.records})
+    report = {
+        "records": args.records,
+        "received": received,
+        "unique": unique,
+        "requests": server.requests,
+        "connections": len(server.connections),
+        "elapsed_seconds": round(elapsed, 3),
+        "records_per_second": round(received / elapsed, 1) if elapsed else 0.0,
+        "sink": stats
+    }
+    print(json.dumps(report, indent=2))
+    # Retried batches must arrive exactly once
+    return 0 if received == unique == args.records else 1
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Check HTTP sink delivery against a local endpoint")
+    parser.add_argument('--records', type=int, default=2000)
+    parser.add_argument('--batch-size', type=int, default=50)
+    parser.add_argument('--flush-interval', type=float, default=0.2)
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='Fraction of requests answered with 503')
+    parser.add_argument('--offline-seconds', type=float, default=0.0,
+                        help='Take the endpoint offline for this long a third of the way in')
+    parser.add_argument('--timeout', type=float, default=30.0)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    get_logger().setLevel(logging.ERROR)
+    return run(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
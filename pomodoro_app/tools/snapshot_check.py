@@ -0,0 +1,196 @@
+# pomodoro_app/tools/snapshot_check.py
+"""Check snapshot isolation with concurrent reader processes and a writer.
+
+A writer process saves state through the shelve backend as fast as it can
+while reader processes open the published snapshots in a loop. Every
+saved state carries redundant fields (a counter, the newest history
+entry's sequence number and a checksum over the history), so a reader can
+tell a torn or mixed view from a consistent one. The writer runs once
+alone and once with readers; given spare cores its save latency should not
+change, since it never waits for a reader.
+
+Rival processes meanwhile keep trying to publish to the same directory,
+as a tool opening the store with snapshots enabled would; every attempt
+must be refused, or the generation counter would fork.
+Exits non-zero on any inconsistent read, generation going backwards or
+rival that got to publish.
+
+Usage:
+    python -m pomodoro_app.tools.snapshot_check --readers 8 --seconds 10
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import shutil
+import sys
+import tempfile
+import time
+from .ui_latency import summarize
+
+def make_state(counter, history_size):
+    history = [{"seq": seq, "task": f"Task {seq % 50}", "status": "completed"}
+               for seq in range(counter, max(0, counter - history_size), -1)]
+    return {
+        "counter": counter,
+        "current_task": f"Task {counter % 50}",
+        "task_history": history,
+        "checksum": sum(entry["seq"] for entry in history)
+    }
+
+def writer(storage_path, seconds, history_size, results, started):
+    from ..core.logger import get_logger
+    from ..data.storage_manager import StorageManager
+    get_logger().setLevel(logging.ERROR)
+
+    storage = StorageManager(storage_path=storage_path, publish_snapshots=True)
+    started.set()
+    latencies = []
+    counter = 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        counter += 1
+        state = make_state(counter, history_size)
+        start = time.perf_counter()
+        if not storage.save_state(state):
+            raise IOError("Writer failed to save state")
+        latencies.append((time.perf_counter() - start) * 1000)
+    storage.close()
+    results.put(("writer", {"saves": counter, "save_latency": summarize(latencies)}))
+
+def rival(storage_path, poll_interval, stop, results):
+    from ..core.logger import get_logger
+    from ..data.snapshots import PublisherLockedError, SnapshotPublisher, snapshot_dir
+    get_logger().setLevel(logging.ERROR)
+
+    directory = snapshot_dir(storage_path, "pomodoro_data")
+    attempts = published = 0
+    while not stop.wait(poll_interval):
+        attempts += 1
+        try:
+            publisher = SnapshotPublisher(directory)
+        except PublisherLockedError:
+            continue
+        # Only possible before the writer started; afterwards it is a fork
+        published += 1
+        publisher.publish({})
+        publisher.close()
+    results.put(("rival", {"attempts": attempts, "published": published}))
+
+def reader(storage_path, poll_interval, stop, results):
+    from ..core.logger import get_logger
+    from ..data.snapshots import SnapshotReader, snapshot_dir
+    get_logger().setLevel(logging.ERROR)
+
+    snapshots = SnapshotReader(snapshot_dir(storage_path, "pomodoro_data"))
+    reads = generations = violations = regressions = 0
+    last_generation = 0
+    latencies = []
+    while not stop.wait(poll_interval):
+        start = time.perf_counter()
+        snapshot = snapshots.read()
+        if snapshot is None:
+            continue
+        reads += 1
+        if snapshot.generation == last_generation:
+            continue
+        if snapshot.generation < last_generation:
+            regressions += 1
+        last_generation = snapshot.generation
+        generations += 1
+
+        counter = snapshot.get("counter")
+        history = snapshot.get("task_history", [])
+        latencies.append((time.perf_counter() - start) * 1000)
+        if counter is None:
+            # The snapshot published before the first save is empty
+            continue
+        consistent = (
+            snapshot.get("current_task") == f"Task {counter % 50}"
+            and history and history[0]["seq"] == counter
+            and snapshot.get("checksum") == sum(entry["seq"] for entry in history)
+        )
+        if not consistent:
+            violations += 1
+    results.put(("reader", {"reads": reads, "generations": generations, "violations": violations,
+                            "regressions": regressions, "read_latency": summarize(latencies)}))
+
+def run_phase(args, readers, rivals=0):
+    storage_path = tempfile.mkdtemp(prefix="pomodoro_snapshots_")
+    results = multiprocessing.Queue()
+    stop = multiprocessing.Event()
+    writer_started = multiprocessing.Event()
+    try:
+        processes = [multiprocessing.Process(target=reader, args=(storage_path, args.poll_interval, stop, results))
+                     for _ in range(readers)]
+        for process in processes:
+            process.start()
+        writer_process = multiprocessing.Process(target=writer,
+                                                 args=(storage_path, args.seconds, args.history, results,
+                                                       writer_started))
+        writer_process.start()
+        # Rivals start once the writer owns the directory
+        writer_started.wait(60)
+        rival_processes = [multiprocessing.Process(target=rival,
+                                                   args=(storage_path, args.poll_interval, stop, results))
+                           for _ in range(rivals)]
+        for process in rival_processes:
+            process.start()
+        processes += rival_processes
+        writer_process.join()
+        stop.set()
+
+        collected = [results.get(timeout=60) for _ in range(readers + rivals + 1)]
+        for process in processes:
+            process.join()
+        if writer_process.exitcode:
+            raise RuntimeError("Writer process failed")
+    finally:
+        shutil.rmtree(storage_path, ignore_errors=True)
+
+    report = {"readers": [r for kind, r in collected if kind == "reader"],
+              "rivals": [r for kind, r in collected if kind == "rival"]}
+    report["writer"] = next(r for kind, r in collected if kind == "writer")
+    return report
+
+def run(args):
+    alone = run_phase(args, 0)
+    loaded = run_phase(args, args.readers, args.rivals)
+    readers = loaded["readers"]
+    violations = sum(r["violations"] for r in readers)
+    regressions = sum(r["regressions"] for r in readers)
+    rival_publishes = sum(r["published"] for r in loaded["rivals"])
+    report = {
+        "writer_alone": alone["writer"],
+        "writer_with_readers": loaded["writer"],
+        "readers": len(readers),
+        "reads": sum(r["reads"] for r in readers),
+        "generations_seen": sum(r["generations"] for r in readers),
+        "violations": violations,
+        "regressions": regressions,
+        "rival_attempts": sum(r["attempts"] for r in loaded["rivals"]),
+        "rival_publishes": rival_publishes,
+        "read_latency_p99_ms": max((r["read_latency"]["p99_ms"] for r in readers), default=0.0)
+    }
+    print(json.dumps(report, indent=2))
+    return 1 if violations or regressions or rival_publishes else 0
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Check snapshot isolation under concurrent readers")
+    parser.add_argument('--readers', type=int, default=4, help='Reader processes')
+    parser.add_argument('--seconds', type=float, default=5.0, help='How long the writer runs per phase')
+    parser.add_argument('--rivals', type=int, default=1,
+                        help='Processes that try to publish to the same snapshot directory')
+    parser.add_argument('--history', type=int, default=1000, help='History entries in each saved state')
+    parser.add_argument('--poll-interval', type=float, default=0.001,
+                        help='Seconds each reader sleeps between reads; 0 spins')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    from ..core.logger import get_logger
+    get_logger().setLevel(logging.ERROR)
+    return run(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+# pomodoro_app/tools/soak.py
+"""Long-run soak harness for the Tk UI with leak detection.
+
+Drives MainWindow on a virtual display with an accelerated clock through
+many minimize/restore, set-task, start/pause and completion cycles. It
+samples RSS, tracemalloc, Python object counts, pending Tk ``after``
+callbacks, widgets and threads, and fails when growth after warm-up
+exceeds the configured budgets.
+
+Usage:
+    python -m pomodoro_app.tools.soak --cycles 2000
+"""
+import argparse
+import gc
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+def rss_bytes():
+    """Resident set size of this process"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def count_widgets(widget):
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+class SoakHarness:
+    def __init__(self, speed, storage, session_seconds):
+        # Imported here so the virtual display is up before Tk and pystray load
+        os.environ.setdefault("PYSTRAY_BACKEND", "dummy")
+        import tkinter as tk
+        from ..core.clock import AcceleratedClock
+        from ..core.timer import PomodoroTimerCore
+        from ..data.storage_backends import create_storage_manager
+        from ..data.task_manager import TaskManager
+        from ..ui.main_window import MainWindow
+        from ..utils.tray_icon import SystemTrayIcon
+
+        self.storage_path = tempfile.mkdtemp(prefix="pomodoro_soak_")
+        self.root = tk.Tk()
+        self.storage = create_storage_manager(storage, self.storage_path)
+        self.timer_core = PomodoroTimerCore(self.storage, clock=AcceleratedClock(speed))
+        self.timer_core.set_timer_duration(session_seconds, session_seconds)
+        self.task_manager = TaskManager(self.storage)
+        self.tray_icon = SystemTrayIcon(None)
+        self.app = MainWindow(self.root, self.timer_core, self.task_manager, self.tray_icon, interactive=False)
+        self.tray_icon.app = self.app
+
+    def pump(self, seconds=0.0):
+        """Process Tk events for the given real time"""
+        deadline = time.monotonic() + seconds
+        while True:
+            self.root.update()
+            if time.monotonic() >= deadline:
+                return
+            time.sleep(0.001)
+
+    def wait_for_completion(self, timeout=10.0):
+        deadline = time.monotonic() + timeout
+        while self.timer_core.timer_running:
+            if time.monotonic() > deadline:
+                raise RuntimeError("Session did not complete in time")
+            self.pump(0.005)
+
+    def cycle(self, i, set_task_every):
+        app = self.app
+        if i % set_task_every == 0:
+            app.handle_remote_command({"action": "set_task", "task": f"Soak task {i % 50}"})
+
+        # Start, pause and resume the session
+        app.start_timer()
+        self.pump()
+        app.start_timer()
+        self.pump()
+        app.start_timer()
+
+        # Let the session finish while minimized, then restore
+        app.minimize_to_tray()
+        self.pump()
+        self.wait_for_completion()
+        app.open_main_window()
+        app.update_history_display()
+        self.pump()
+
+    def sample(self):
+        gc.collect()
+        return {
+            "rss": rss_bytes(),
+            "traced": tracemalloc.get_traced_memory()[0],
+            "objects": len(gc.get_objects()),
+            "after": len(self.root.tk.splitlist(self.root.tk.call("after", "info"))),
+            "widgets": count_widgets(self.root),
+            "threads": threading.active_count()
+        }
+
+    def close(self):
+        try:
+            self.app.quit_app()
+        except Exception:
+            pass
+        self.storage.close()
+        shutil.rmtree(self.storage_path, ignore_errors=True)
+
+BUDGETS = {
+    "rss": ("rss_budget_mb", 1024 * 1024),
+    "traced": ("traced_budget_mb", 1024 * 1024),
+    "objects": ("objects_budget", 1),
+    "after": ("after_budget", 1),
+    "widgets": ("widgets_budget", 1),
+    "threads": ("threads_budget", 1)
+}
+
+def check_budgets(baseline, final, args):
+    """Return a list of human-readable budget violations"""
+    failures = []
+    for key, (option, scale) in BUDGETS.items():
+        budget = getattr(args, option) * scale
+        growth = final[key] - baseline[key]
+        if growth > budget:
+            failures.append(f"{key} grew by {growth} (budget {budget})")
+    return failures
+
+def run(args):
+    from .virtual_display import virtual_display
+
+    with virtual_display(force=args.xvfb):
+        tracemalloc.start()
+        harness = SoakHarness(args.speed, args.storage, args.session_seconds)
+        samples = []
+        try:
+            baseline = None
+            for i in range(args.cycles):
+                harness.cycle(i, args.set_task_every)
+                if i + 1 == args.warmup:
+                    baseline = harness.sample()
+                    samples.append(dict(baseline, cycle=i + 1))
+                elif (i + 1) % args.sample_every == 0:
+                    samples.append(dict(harness.sample(), cycle=i + 1))
+            final = harness.sample()
+            samples.append(dict(final, cycle=args.cycles))
+        finally:
+            harness.close()
+            tracemalloc.stop()
+
+    baseline = baseline or samples[0]
+    failures = check_budgets(baseline, final, args)
+    report = {"cycles": args.cycles, "baseline": baseline, "final": final,
+              "samples": samples, "failures": failures}
+    print(json.dumps(report, indent=2))
+    return 1 if failures else 0
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Soak test the Pomodoro UI for leaks")
+    parser.add_argument('--cycles', type=int, default=2000)
+    parser.add_argument('--warmup', type=int, default=50, help='Cycles before the baseline sample')
+    parser.add_argument('--sample-every', type=int, default=100)
+    parser.add_argument('--set-task-every', type=int, default=10)
+    parser.add_argument('--speed', type=float, default=1000.0, help='Clock acceleration factor')
+    parser.add_argument('--session-seconds', type=int, default=60, help='Pomodoro and break length')
+    parser.add_argument('--storage', default='shelve', help='Storage backend to use')
+    parser.add_argument('--xvfb', action='store_true', help='Start Xvfb even if DISPLAY is set')
+    parser.add_argument('--rss-budget-mb', type=float, default=32)
+    parser.add_argument('--traced-budget-mb', type=float, default=8)
+    parser.add_argument('--objects-budget', type=int, default=20000)
+    parser.add_argument('--after-budget', type=int, default=2)
+    parser.add_argument('--widgets-budget', type=int, default=2)
+    parser.add_argument('--threads-budget', type=int, default=2)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    from ..core.logger import get_logger
+    # Per-action info logging would dominate a multi-thousand cycle run
+    get_logger().setLevel(logging.WARNING)
+    return run(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
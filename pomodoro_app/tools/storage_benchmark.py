@@ -0,0 +1,110 @@
+# pomodoro_app/tools/storage_benchmark.py
+"""Run identical workloads against every storage backend and compare them.
+
+Usage:
+    python -m pomodoro_app.tools.storage_benchmark [--backends shelve sqlite ...]
+"""
+import argparse
+import logging
+import shutil
+import sys
+import tempfile
+import time
+from ..core.logger import get_logger
+from ..data.storage_backends import BACKENDS, MemoryStorageManager, create_storage_manager
+
+def make_history(size):
+    """Build a synthetic newest-first task history"""
+    statuses = ("completed", "interrupted", "ongoing")
+    return [
+        {"time": f"{(i // 60) % 24:02d}:{i % 60:02d}", "task": f"Task {i % 500}", "status": statuses[i % 3]}
+        for i in range(size)
+    ]
+
+def bench_tick_saves(storage, count):
+    """Periodic timer state saves as done by PomodoroTimerCore"""
+    start = time.perf_counter()
+    for i in range(count):
+        storage.save_state({
+            "pomodoro_time": 1500,
+            "break_time": 300,
+            "current_time_left": 1500 - i % 1500,
+            "current_mode": "pomodoro",
+            "pomodoro_count": i // 150
+        })
+    return time.perf_counter() - start
+
+def bench_task_churn(storage, count, history_size):
+    """set_task followed by a status update, each saving the history"""
+    history = make_history(history_size)
+    start = time.perf_counter()
+    for i in range(count):
+        history.insert(0, {"time": "12:00", "task": f"Churn {i}", "status": "ongoing"})
+        storage.save_state({"task_history": history, "current_task": f"Churn {i}"})
+        history[0]["status"] = "completed"
+        storage.save_state({"task_history": history, "current_task": f"Churn {i}"})
+    return time.perf_counter() - start
+
+def bench_cold_load(backend, path, history_size):
+    """Write a history of the given size, then time a fresh manager loading it"""
+    storage = create_storage_manager(backend, path)
+    storage.save_state({"task_history": make_history(history_size), "current_task": "Cold"})
+
+    start = time.perf_counter()
+    # The in-memory backend cannot be reopened, so it loads from the same instance
+    if backend != MemoryStorageManager.backend_name:
+        storage.close()
+        storage = create_storage_manager(backend, path)
+    state = storage.load_state({"task_history": [], "current_task": "No task set"})
+    elapsed = time.perf_counter() - start
+    storage.close()
+    assert len(state["task_history"]) == history_size
+    return elapsed
+
+def run(backends, tick_count, churn_count, history_sizes):
+    results = []
+    for backend in backends:
+        path = tempfile.mkdtemp(prefix=f"pomodoro_bench_{backend}_")
+        try:
+            row = {"backend": backend}
+            storage = create_storage_manager(backend, path)
+            row["tick saves/s"] = tick_count / bench_tick_saves(storage, tick_count)
+            row["churn ops/s"] = churn_count / bench_task_churn(storage, churn_count, history_sizes[0])
+            storage.close()
+            for size in history_sizes:
+                cold_path = tempfile.mkdtemp(dir=path)
+                row[f"cold load {size} (ms)"] = bench_cold_load(backend, cold_path, size) * 1000
+            results.append(row)
+        finally:
+            shutil.rmtree(path, ignore_errors=True)
+    return results
+
+def format_table(results):
+    """Render benchmark rows as a plain-text table"""
+    columns = list(results[0])
+    cells = [[row["backend"]] + [f"{row[c]:.1f}" for c in columns[1:]] for row in results]
+    widths = [max(len(c), *(len(r[i]) for r in cells)) for i, c in enumerate(columns)]
+    lines = ["  ".join(c.ljust(w) for c, w in zip(columns, widths))]
+    lines.append("  ".join("-" * w for w in widths))
+    for r in cells:
+        lines.append("  ".join(v.ljust(w) for v, w in zip(r, widths)))
+    return "\n".join(lines)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Pomodoro storage backends")
+    parser.add_argument('--backends', nargs='+', choices=sorted(BACKENDS), default=sorted(BACKENDS))
+    parser.add_argument('--ticks', type=int, default=500, help='Number of tick saves')
+    parser.add_argument('--churn', type=int, default=100, help='Number of task churn cycles')
+    parser.add_argument('--history-sizes', type=int, nargs='+', default=[100, 10000, 100000])
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    # Per-save log lines would dominate the measurements
+    get_logger().setLevel(logging.WARNING)
+    results = run(args.backends, args.ticks, args.churn, args.history_sizes)
+    print(format_table(results))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
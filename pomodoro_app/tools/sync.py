@@ -0,0 +1,81 @@
+# pomodoro_app/tools/sync.py
+"""Replicate task history, the current task and timer state between two stores.
+
+Only records the other side has not seen are exchanged, either through a
+shared drop directory (run on each machine, e.g. on a synced folder) or
+directly over a TCP socket.
+
+Usage:
+    python -m pomodoro_app.tools.sync drop ~/Dropbox/pomodoro-sync
+    python -m pomodoro_app.tools.sync serve --port 8765
+    python -m pomodoro_app.tools.sync connect laptop.local --port 8765
+"""
+import argparse
+import socket
+import sys
+from ..core import logger
+from ..core.instance import SingleInstance
+from ..data.storage_backends import create_storage_manager
+from ..data.sync import Replicator, sync_over_socket, sync_via_directory
+from ..data.task_manager import TaskManager
+
+def run(args, replicator):
+    if args.command == "drop":
+        return sync_via_directory(replicator, args.directory)
+
+    if args.command == "serve":
+        with socket.create_server((args.host, args.port)) as server:
+            print(f"Waiting for a peer on {args.host}:{args.port}", file=sys.stderr)
+            conn, address = server.accept()
+            logger.info(f"Sync peer connected from {address[0]}")
+    else:
+        conn = socket.create_connection((args.host, args.port), timeout=args.timeout)
+    with conn:
+        conn.settimeout(args.timeout)
+        return sync_over_socket(replicator, conn)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Sync Pomodoro task history with another store")
+    parser.add_argument('--storage', help='Storage backend to use')
+    parser.add_argument('--path', help='Storage directory (defaults to ~/.pomodoro_app)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    drop = commands.add_parser('drop', help='Exchange deltas through a shared directory')
+    drop.add_argument('directory')
+
+    serve = commands.add_parser('serve', help='Wait for one peer to connect and sync with it')
+    serve.add_argument('--host', default='0.0.0.0')
+
+    connect = commands.add_parser('connect', help='Connect to a serving peer and sync with it')
+    connect.add_argument('host')
+
+    for sub in (serve, connect):
+        sub.add_argument('--port', type=int, default=8765)
+        sub.add_argument('--timeout', type=float, default=30.0)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # The store must not be written by the app while we merge into it
+    instance = SingleInstance(args.path)
+    if not instance.acquire():
+        print("Close the running Pomodoro app before syncing", file=sys.stderr)
+        return 1
+
+    storage = create_storage_manager(args.storage, args.path)
+    try:
+        replicator = Replicator(TaskManager(storage))
+        merged, transferred = run(args, replicator)
+    except (OSError, ValueError) as e:
+        logger.error(f"Sync failed: {str(e)}")
+        return 1
+    finally:
+        storage.close()
+        instance.release()
+
+    print(f"Merged {merged} records, sent {transferred} bytes")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
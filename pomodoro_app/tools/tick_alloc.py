@@ -0,0 +1,206 @@
+# pomodoro_app/tools/tick_alloc.py
+"""Allocation budget check for the per-second tick path.
+
+Drives the real tick handlers, ``MainWindow.update_timer_display`` and
+``update_tray_icon``, on a window whose widgets are stubbed out, so it
+runs without a display. The tray counts as running with a stub icon, as
+after the window has been minimized once and reopened: every changed
+second redraws its image. Two checks use ``tracemalloc``:
+
+* every handler call is measured on its own: how far the traced peak
+  rises above what is still allocated when the call returns. A per-tick
+  ``divmod`` or f-string shows up here even though it is freed right away.
+* the handlers are then subscribed to the timer core running on an
+  accelerated clock the way the window subscribes them (QUEUED display,
+  THROTTLED tray), so ``_run_timer``, ``EventBus.publish``, the
+  dispatcher and both workers run for real. Blocks they leave allocated
+  per tick, memory retained per tick and the peak rise over the whole run
+  are measured, listing app source lines whose live blocks grew.
+
+Exits non-zero when a budget is exceeded.
+
+Usage:
+    python -m pomodoro_app.tools.tick_alloc --ticks 3000
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+
+class StubLabel:
+    """Stands in for the Tk label showing the time"""
+
+    def __init__(self):
+        self.text = None
+
+    def config(self, text=None):
+        # Named parameter rather than **options, so the stub itself allocates nothing
+        self.text = text
+
+class StubIcon:
+    """Stands in for the pystray icon, which copies the image it is given"""
+
+    def __init__(self):
+        self.icon = None
+
+def headless_window(tray_icon):
+    """MainWindow with just the state its tick handlers use"""
+    from ..ui.main_window import MainWindow
+    app = MainWindow.__new__(MainWindow)
+    app.time_display = StubLabel()
+    app.displayed_time = None
+    app.tray_icon = tray_icon
+    return app
+
+def _call_rise(handler, value, mode):
+    tracemalloc.reset_peak()
+    start = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    handler(value, mode)
+    return tracemalloc.get_traced_memory()[1] - start
+
+def _noop(value, mode):
+    pass
+
+def measure_calls(handler, values, mode="pomodoro"):
+    """Bytes each call raised the traced peak above what was allocated before it
+
+    Measured against the level before the call rather than after it, so a
+    call that frees an older object is not mistaken for one that allocates.
+    The measuring overhead, taken from an empty handler, is subtracted.
+    """
+    for value in values:
+        handler(value, mode)
+    overhead = min(_call_rise(_noop, value, mode) for value in values)
+    rises = [_call_rise(handler, value, mode) - overhead for value in values]
+    return {"calls": len(rises), "mean_bytes": round(sum(rises) / len(rises), 2), "max_bytes": max(rises)}
+
+def run(args):
+    os.environ.setdefault("PYSTRAY_BACKEND", "dummy")
+    from ..core import trace
+    from ..core.clock import AcceleratedClock
+    from ..core.events import QUEUED, THROTTLED
+    from ..core.timer import PomodoroTimerCore
+    from ..utils.time_format import MAX_DURATION
+    from ..utils.tray_icon import SystemTrayIcon
+
+    # A full trace ring recycles its slots; the warm-up must wrap it
+    trace.configure(size=args.trace_size)
+    timer = PomodoroTimerCore(clock=AcceleratedClock(args.speed))
+    timer.set_timer_duration(MAX_DURATION, MAX_DURATION)
+    tray_icon = SystemTrayIcon(None)
+    tray_icon.preload()
+    tray_icon.icon = StubIcon()
+    tray_icon.running = True
+    app = headless_window(tray_icon)
+
+    tracemalloc.start(1)
+    # Every value of a full-length session, counting down like the timer does
+    values = list(range(MAX_DURATION, 0, -1))
+    calls = {
+        "update_timer_display": measure_calls(app.update_timer_display, values),
+        "update_tray_icon": measure_calls(app.update_tray_icon, values)
+    }
+
+    # Subscribed like MainWindow subscribes them
+    timer.events.subscribe("tick_alloc", {"tick": app.update_timer_display}, mode=QUEUED)
+    timer.events.subscribe("tick_alloc_tray", {"tick": app.update_tray_icon}, mode=THROTTLED, rate_hz=1)
+
+    def wait_for(ticks):
+        # Polls the bus counter rather than subscribing, so nothing else runs per tick
+        deadline = time.monotonic() + args.timeout
+        while timer.events.published < ticks and time.monotonic() < deadline:
+            if not timer.timer_running:
+                # A session ended during warm-up; keep ticking through the next one
+                timer.start()
+            time.sleep(0.05)
+
+    # Tracing started before the warm-up, so it replaces every untraced ring
+    # slot and cached object with a traced one before the baseline is taken
+    timer.start()
+    wait_for(args.warmup)
+
+    # Measure inside one fresh session so no completion, notification or
+    # thread start falls into the window
+    timer.reset()
+    timer.start()
+    wait_for(timer.events.published + 10)
+    ticks = min(args.ticks, MAX_DURATION - 20)
+    start_ticks = timer.events.published
+    before = tracemalloc.take_snapshot()
+    start_current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    wait_for(start_ticks + ticks)
+    end_current, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    measured = timer.events.published - start_ticks
+    timer.pause()
+    tracemalloc.stop()
+
+    # Snapshots and this tool's own bookkeeping are not part of the tick path
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, os.path.abspath(__file__))]
+    diffs = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), "lineno")
+    new_blocks = sum(stat.count_diff for stat in diffs)
+    package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    growth = [
+        {"line": f"{os.path.relpath(stat.traceback[0].filename, package_dir)}:{stat.traceback[0].lineno}",
+         "bytes": stat.size_diff, "blocks": stat.count_diff}
+        for stat in diffs
+        if stat.size_diff > 0 and stat.traceback[0].filename.startswith(package_dir)
+    ]
+
+    blocks_per_tick = new_blocks / measured if measured else 0.0
+    retained_per_tick = (end_current - start_current) / measured if measured else 0.0
+    peak_above_start = peak - start_current
+    failures = []
+    for name, result in calls.items():
+        if result["max_bytes"] > args.call_budget:
+            failures.append(f"{name} allocated {result['max_bytes']} B in one call (budget {args.call_budget})")
+    if blocks_per_tick > args.block_budget:
+        failures.append(f"left {new_blocks} new blocks over {measured} ticks (budget {args.block_budget}/tick)")
+    if retained_per_tick > args.retained_budget:
+        failures.append(f"retained {retained_per_tick:.1f} B/tick (budget {args.retained_budget})")
+    if peak_above_start > args.peak_budget:
+        failures.append(f"peak rose {peak_above_start} B (budget {args.peak_budget})")
+
+    report = {
+        "calls": calls,
+        "ticks": measured,
+        "new_blocks": new_blocks,
+        "retained_bytes_per_tick": round(retained_per_tick, 2),
+        "peak_above_start_bytes": peak_above_start,
+        "growth": growth[:args.top],
+        "failures": failures
+    }
+    print(json.dumps(report, indent=2))
+    return 1 if failures else 0
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Check per-tick allocations of the timer hot path")
+    parser.add_argument('--ticks', type=int, default=3000)
+    parser.add_argument('--warmup', type=int, default=2000, help='Ticks before measuring')
+    parser.add_argument('--speed', type=float, default=500.0, help='Clock acceleration factor')
+    parser.add_argument('--trace-size', type=int, default=1024)
+    parser.add_argument('--call-budget', type=int, default=128,
+                        help='Bytes one handler call may hold transiently: a few replaced ints in '
+                             'the trace ring fit, a formatted time string with its divmod (225 B) does not')
+    parser.add_argument('--block-budget', type=float, default=0.0,
+                        help='Blocks the tick path may leave allocated per tick')
+    parser.add_argument('--retained-budget', type=float, default=1.0, help='Bytes retained per tick')
+    parser.add_argument('--peak-budget', type=int, default=16 * 1024,
+                        help='Bytes the traced peak may rise above the steady state')
+    parser.add_argument('--timeout', type=float, default=120.0)
+    parser.add_argument('--top', type=int, default=10, help='Source lines listed in the report')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    from ..core.logger import get_logger
+    get_logger().setLevel(logging.WARNING)
+    return run(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,261 @@
+# pomodoro_app/tools/timer_stress.py
+"""Concurrency stress harness for PomodoroTimerCore.
+
+Many threads issue random timer commands (start, pause, reset, duration
+changes, mode switches, background mode and time queries) against one
+core running on an accelerated clock, so sessions complete constantly
+while commands race with the timer thread. Invariants are checked
+throughout:
+
+* only the current timer thread publishes ticks and at most one timer
+  thread stays alive (one active countdown)
+* the time left is never negative
+* the pomodoro count never decreases and completions arrive in order
+* after each round, with the workers stopped, the persisted state
+  matches the core's memory
+
+Reports sustained command throughput and per-command latency as JSON and
+exits non-zero on any violation or stalled command, so it can gate
+changes to the core.
+
+Usage:
+    python -m pomodoro_app.tools.timer_stress --threads 16 --rounds 10
+"""
+import argparse
+import json
+import logging
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from .ui_latency import summarize
+
+PERSISTED_FIELDS = ("pomodoro_time", "break_time", "current_time_left", "current_mode", "pomodoro_count")
+TIMER_THREAD_NAME = "pomodoro-timer"
+
+class StressHarness:
+    def __init__(self, args):
+        from ..core import timer as timer_module
+        from ..core.clock import AcceleratedClock
+        from ..core.events import SYNC
+        from ..core.timer import PomodoroTimerCore
+        from ..data.storage_backends import create_storage_manager
+
+        self.args = args
+        self.random = random.Random(args.seed)
+        self.storage_path = tempfile.mkdtemp(prefix="pomodoro_stress_")
+        # Snapshots are published as in the app, so saves cost what they do there
+        self.storage = create_storage_manager(args.storage, self.storage_path, publish_snapshots=True)
+        # Completions are constant here; count notifications instead of showing them
+        self.notifications = 0
+        timer_module.send_notification = self._count_notification
+
+        self.timer = PomodoroTimerCore(self.storage, clock=AcceleratedClock(args.speed))
+        self.timer.set_timer_duration(args.session_seconds, args.session_seconds)
+
+        self.lock = threading.Lock()
+        self.violations = {}
+        self.examples = []
+        self.ticks = 0
+        self.completions = 0
+        self.last_completed = self.timer.pomodoro_count
+        self.latencies = {name: [] for name in self.commands()}
+        self.timer.events.subscribe("timer_stress", {
+            "tick": self.on_tick,
+            "pomodoro_complete": self.on_pomodoro_complete,
+            "break_complete": self.on_break_complete
+        }, mode=SYNC)
+
+    def _count_notification(self, title, message, timeout=10):
+        with self.lock:
+            self.notifications += 1
+        return True
+
+    # Invariants -----------------------------------------------------------
+
+    def violation(self, kind, detail):
+        with self.lock:
+            self.violations[kind] = self.violations.get(kind, 0) + 1
+            if len(self.examples) < self.args.examples:
+                self.examples.append(f"{kind}: {detail}")
+
+    def on_tick(self, time_left, mode):
+        with self.lock:
+            self.ticks += 1
+        if time_left < 0:
+            self.violation("negative_time", f"tick with {time_left} seconds left")
+        if mode not in ("pomodoro", "break"):
+            self.violation("bad_mode", f"tick in mode {mode!r}")
+        current = threading.current_thread()
+        if current.name == TIMER_THREAD_NAME and current is not self.timer.timer_thread:
+            self.violation("stale_tick", f"superseded timer thread ticked {time_left}")
+
+    def on_pomodoro_complete(self, count):
+        with self.lock:
+            self.completions += 1
+            last, self.last_completed = self.last_completed, count
+        if count != last + 1:
+            self.violation("completion_order", f"pomodoro_complete {count} after {last}")
+
+    def on_break_complete(self):
+        with self.lock:
+            self.completions += 1
+
+    def monitor(self, stop):
+        """Sample the core while the workers run"""
+        last_count = self.timer.pomodoro_count
+        overlap_since = None
+        while not stop.wait(self.args.monitor_interval):
+            time_left = self.timer.get_time_left()
+            if time_left < 0 or self.timer.current_time_left < 0:
+                self.violation("negative_time", f"sampled {time_left}/{self.timer.current_time_left}")
+            count = self.timer.pomodoro_count
+            if count < last_count:
+                self.violation("count_decreased", f"pomodoro_count went from {last_count} to {count}")
+            last_count = count
+
+            # A superseded timer thread must exit promptly once woken
+            alive = sum(1 for t in threading.enumerate() if t.name == TIMER_THREAD_NAME)
+            if alive > 1:
+                overlap_since = overlap_since or time.monotonic()
+                if time.monotonic() - overlap_since > self.args.grace:
+                    self.violation("concurrent_countdowns", f"{alive} timer threads alive")
+                    overlap_since = None
+            else:
+                overlap_since = None
+
+    def check_persisted(self):
+        """With no commands in flight and the timer paused, storage must match memory"""
+        stored = self.storage.load_state({field: None for field in PERSISTED_FIELDS})
+        for field in PERSISTED_FIELDS:
+            memory = getattr(self.timer, field)
+            if stored[field] != memory:
+                self.violation("persisted_mismatch", f"{field}: stored {stored[field]!r}, memory {memory!r}")
+
+    # Workload -------------------------------------------------------------
+
+    def commands(self):
+        timer = self.timer
+        durations = self.args.durations
+        return {
+            "start": timer.start,
+            "pause": timer.pause,
+            "reset": timer.reset,
+            "switch_mode": timer.switch_mode,
+            "set_timer_duration": lambda: timer.set_timer_duration(
+                self.random.choice(durations), self.random.choice(durations)),
+            "set_background_mode": lambda: timer.set_background_mode(self.random.random() < 0.5),
+            "get_time_left": timer.get_time_left
+        }
+
+    def worker(self, stop, seed):
+        rng = random.Random(seed)
+        commands = list(self.commands().items())
+        weights = [4, 3, 1, 1, 1, 1, 4]
+        local = {name: [] for name, _ in commands}
+        think = self.args.think_ms / 1000
+        # Random pauses between commands let sessions run out, so completions race with commands too
+        while not stop.wait(rng.uniform(0, think)):
+            name, command = rng.choices(commands, weights)[0]
+            start = time.perf_counter()
+            command()
+            local[name].append((time.perf_counter() - start) * 1000)
+        with self.lock:
+            for name, values in local.items():
+                self.latencies[name].extend(values)
+
+    def round(self):
+        stop = threading.Event()
+        threads = [threading.Thread(target=self.worker, args=(stop, self.random.random()), daemon=True)
+                   for _ in range(self.args.threads)]
+        monitor = threading.Thread(target=self.monitor, args=(stop,), daemon=True)
+        for thread in threads + [monitor]:
+            thread.start()
+        time.sleep(self.args.round_seconds)
+        stop.set()
+        for thread in threads + [monitor]:
+            thread.join(self.args.stall_seconds)
+        if any(thread.is_alive() for thread in threads):
+            raise RuntimeError(f"A command stalled for more than {self.args.stall_seconds}s")
+
+        # Quiesce: stop the countdown and let its thread exit before comparing
+        if self.timer.timer_running:
+            self.timer.pause()
+        for thread in threading.enumerate():
+            if thread.name == TIMER_THREAD_NAME:
+                thread.join(self.args.stall_seconds)
+        self.timer.set_background_mode(False)
+        self.check_persisted()
+
+    def close(self):
+        if self.timer.timer_running:
+            self.timer.pause()
+        self.storage.close()
+        shutil.rmtree(self.storage_path, ignore_errors=True)
+
+def run(args):
+    # Switching threads far more often than the default 5 ms exposes races sooner
+    sys.setswitchinterval(args.switch_interval)
+    harness = StressHarness(args)
+    stalled = None
+    start = time.perf_counter()
+    try:
+        for _ in range(args.rounds):
+            harness.round()
+    except RuntimeError as e:
+        stalled = str(e)
+    finally:
+        elapsed = time.perf_counter() - start
+        harness.close()
+
+    total = sum(len(values) for values in harness.latencies.values())
+    report = {
+        "threads": args.threads,
+        "rounds": args.rounds,
+        "commands": total,
+        "commands_per_second": round(total / elapsed, 1) if elapsed else 0.0,
+        "latency": {name: summarize(values) for name, values in harness.latencies.items() if values},
+        "ticks": harness.ticks,
+        "completions": harness.completions,
+        "notifications": harness.notifications,
+        "pomodoro_count": harness.timer.pomodoro_count,
+        "violations": harness.violations,
+        "examples": harness.examples,
+        "stalled": stalled
+    }
+    print(json.dumps(report, indent=2))
+    return 1 if harness.violations or stalled else 0
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Stress the timer core with concurrent commands")
+    parser.add_argument('--threads', type=int, default=8, help='Threads issuing commands')
+    parser.add_argument('--rounds', type=int, default=5, help='Rounds, each ending with a persistence check')
+    parser.add_argument('--round-seconds', type=float, default=2.0)
+    parser.add_argument('--speed', type=float, default=1000.0, help='Clock acceleration factor')
+    parser.add_argument('--session-seconds', type=int, default=3, help='Initial pomodoro and break length')
+    parser.add_argument('--durations', type=int, nargs='+', default=[1, 2, 3, 5, 8],
+                        help='Lengths chosen by set_timer_duration commands')
+    parser.add_argument('--think-ms', type=float, default=2.0,
+                        help='Upper bound of the random pause each thread takes between commands')
+    parser.add_argument('--storage', default='shelve', help='Storage backend to use')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--switch-interval', type=float, default=1e-5,
+                        help='Interpreter thread switch interval in seconds')
+    parser.add_argument('--monitor-interval', type=float, default=0.001)
+    parser.add_argument('--grace', type=float, default=0.5,
+                        help='Seconds a superseded timer thread may linger before it counts as a second countdown')
+    parser.add_argument('--stall-seconds', type=float, default=10.0)
+    parser.add_argument('--examples', type=int, default=10, help='Violation messages kept in the report')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    from ..core.logger import get_logger
+    # Every command logs at info level; keep the log out of the measurement
+    get_logger().setLevel(logging.ERROR)
+    return run(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+# pomodoro_app/tools/ui_latency.py
+"""Interaction latency benchmark for the Tk UI.
+
+Drives MainWindow on a virtual display against histories of increasing
+size. Each action is triggered the way a user or the timer would trigger
+it (synthetic clicks on the canvas buttons, filter button invocations,
+published timer ticks, the tray's minimize/restore calls) and timed until
+Tk has processed every pending event and idle callback, i.e. until the
+change is painted. Reports percentiles per action and history size as
+JSON and exits non-zero when a p99 budget is exceeded.
+
+Usage:
+    python -m pomodoro_app.tools.ui_latency --sizes 10 1000 100000 --output latency.json
+"""
+import argparse
+import json
+import logging
+import math
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ACTIONS = ("tick", "start_timer", "switch_mode", "update_history_display", "minimize_to_tray", "open_main_window")
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+def summarize(samples):
+    values = sorted(samples)
+    return {
+        "samples": len(values),
+        "mean_ms": round(sum(values) / len(values), 3) if values else 0.0,
+        "p50_ms": round(percentile(values, 0.50), 3),
+        "p90_ms": round(percentile(values, 0.90), 3),
+        "p99_ms": round(percentile(values, 0.99), 3),
+        "max_ms": round(values[-1], 3) if values else 0.0
+    }
+
+class LatencyHarness:
+    def __init__(self, storage, history_size):
+        # Imported here so the virtual display is up before Tk and pystray load
+        os.environ.setdefault("PYSTRAY_BACKEND", "dummy")
+        import tkinter as tk
+        import _tkinter
+        from ..core.timer import PomodoroTimerCore
+        from ..data.storage_backends import create_storage_manager
+        from ..data.task_manager import TaskManager
+        from ..ui.main_window import MainWindow
+        from ..utils.time_format import format_time
+        from ..utils.tray_icon import SystemTrayIcon
+        from .storage_benchmark import make_history
+
+        self._idle_flags = _tkinter.ALL_EVENTS | _tkinter.DONT_WAIT
+        self.format_time = format_time
+        self.storage_path = tempfile.mkdtemp(prefix="pomodoro_latency_")
+        self.storage = create_storage_manager(storage, self.storage_path)
+        self.storage.save_state({"task_history": make_history(history_size), "current_task": "No task set"})
+
+        self.root = tk.Tk()
+        self.timer_core = PomodoroTimerCore(self.storage)
+        self.task_manager = TaskManager(self.storage)
+        self.tray_icon = SystemTrayIcon(None)
+        self.app = MainWindow(self.root, self.timer_core, self.task_manager, self.tray_icon, interactive=False)
+        self.tray_icon.app = self.app
+        # A set task keeps the Start button from opening the task dialog
+        self.app.handle_remote_command({"action": "set_task", "task": "Latency task @bench #ui"})
+        self.filter_buttons = [w for w in self.walk(self.root) if isinstance(w, tk.Radiobutton)]
+        self.pump(0.3)
+
+    def walk(self, widget):
+        yield widget
+        for child in widget.winfo_children():
+            yield from self.walk(child)
+
+    def pump(self, seconds=0.0):
+        """Process Tk events for the given real time"""
+        deadline = time.monotonic() + seconds
+        while True:
+            self.root.update()
+            if time.monotonic() >= deadline:
+                return
+            time.sleep(0.001)
+
+    def settle(self):
+        """Run Tk until no event or idle callback is pending"""
+        while self.root.tk.dooneevent(self._idle_flags):
+            pass
+
+    def timed(self, trigger, done=None, timeout=10.0):
+        """Milliseconds from triggering an action until it is painted"""
+        start = time.perf_counter()
+        trigger()
+        self.settle()
+        if done is not None:
+            # Queued subscribers deliver from their own thread; wait for them
+            deadline = time.monotonic() + timeout
+            while not done():
+                if time.monotonic() > deadline:
+                    raise RuntimeError("Action was not painted in time")
+                self.settle()
+                time.sleep(0.0001)
+            self.settle()
+        return (time.perf_counter() - start) * 1000
+
+    def click(self, widget):
+        widget.event_generate("<Button-1>", x=5, y=5)
+
+    def measure(self, repeats):
+        app = self.app
+        samples = {action: [] for action in ACTIONS}
+        for i in range(repeats):
+            # Timer tick published from outside the Tk thread, as the timer does
+            value = 1000 + i % 2
+            samples["tick"].append(self.timed(
+                lambda: self.timer_core.events.publish("tick", value, self.timer_core.current_mode),
+                lambda: app.displayed_time == self.format_time(value)
+            ))
+
+            # Start, then pause, which marks the task interrupted and redraws history
+            samples["start_timer"].append(self.timed(lambda: self.click(app.start_button)))
+            samples["start_timer"].append(self.timed(lambda: self.click(app.start_button)))
+
+            samples["switch_mode"].append(self.timed(lambda: self.click(app.switch_button)))
+
+            button = self.filter_buttons[i % len(self.filter_buttons)]
+            samples["update_history_display"].append(self.timed(button.invoke))
+
+            # The window manager's close button and the tray menu call these directly
+            samples["minimize_to_tray"].append(self.timed(app.minimize_to_tray))
+            samples["open_main_window"].append(self.timed(app.open_main_window))
+        return {action: summarize(values) for action, values in samples.items()}
+
+    def close(self):
+        try:
+            self.app.quit_app()
+        except Exception:
+            pass
+        self.storage.close()
+        shutil.rmtree(self.storage_path, ignore_errors=True)
+
+def check_budget(results, budget_ms):
+    failures = []
+    if not budget_ms:
+        return failures
+    for size, actions in results.items():
+        for action, summary in actions.items():
+            if summary["p99_ms"] > budget_ms:
+                failures.append(f"{action} at {size} entries: p99 {summary['p99_ms']} ms (budget {budget_ms})")
+    return failures
+
+def run(args):
+    from .virtual_display import virtual_display
+
+    results = {}
+    with virtual_display(force=args.xvfb):
+        for size in args.sizes:
+            harness = LatencyHarness(args.storage, size)
+            try:
+                results[str(size)] = harness.measure(args.repeats)
+            finally:
+                harness.close()
+
+    failures = check_budget(results, args.p99_budget_ms)
+    report = {"storage": args.storage, "repeats": args.repeats, "results": results, "failures": failures}
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    print(output)
+    return 1 if failures else 0
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Measure UI interaction latency against large histories")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 10000, 100000],
+                        help='History sizes to measure')
+    parser.add_argument('--repeats', type=int, default=20, help='Samples per action and size')
+    parser.add_argument('--storage', default='shelve', help='Storage backend to use')
+    parser.add_argument('--xvfb', action='store_true', help='Start Xvfb even if DISPLAY is set')
+    parser.add_argument('--p99-budget-ms', type=float, default=0.0, help='Fail when any p99 exceeds this; 0 disables')
+    parser.add_argument('--output', help='Also write the JSON report to this file')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    from ..core.logger import get_logger
+    # Per-action info logging would be part of every measured interaction
+    get_logger().setLevel(logging.WARNING)
+    return run(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
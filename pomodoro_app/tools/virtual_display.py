@@ -0,0 +1,45 @@
+# pomodoro_app/tools/virtual_display.py
+"""Run Tk harnesses against an Xvfb virtual display."""
+import contextlib
+import os
+import shutil
+import subprocess
+
+@contextlib.contextmanager
+def virtual_display(force=False, screen="1280x1024x24"):
+    """Start Xvfb and point DISPLAY at it for the duration of the block
+
+    If a display is already available and ``force`` is false, it is used
+    as is. Raises RuntimeError when no display is available and Xvfb is
+    not installed.
+    """
+    if os.environ.get("DISPLAY") and not force:
+        yield os.environ["DISPLAY"]
+        return
+
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        raise RuntimeError("No DISPLAY set and Xvfb is not installed")
+
+    # Let Xvfb pick a free display number and report it on a pipe
+    read_fd, write_fd = os.pipe()
+    process = subprocess.Popen(
+        [xvfb, "-displayfd", str(write_fd), "-screen", "0", screen, "-nolisten", "tcp"],
+        pass_fds=(write_fd,), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    os.close(write_fd)
+    previous = os.environ.get("DISPLAY")
+    try:
+        with os.fdopen(read_fd) as f:
+            number = f.readline().strip()
+        if not number:
+            raise RuntimeError("Xvfb failed to start")
+        os.environ["DISPLAY"] = f":{number}"
+        yield os.environ["DISPLAY"]
+    finally:
+        process.terminate()
+        process.wait(timeout=5)
+        if previous is None:
+            os.environ.pop("DISPLAY", None)
+        else:
+            os.environ["DISPLAY"] = previous
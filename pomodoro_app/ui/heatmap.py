@@ -0,0 +1,255 @@
+# heatmap.py
+
+import base64
+import calendar
+import io
+import json
+import os
+import tempfile
+import tkinter as tk
+from datetime import date
+from PIL import Image, ImageDraw, ImageFont
+from ..constants.styling import COLORS, FONTS
+from ..core import logger
+from .components import RoundedButton
+
+CELL = 12
+GAP = 2
+HEADER = 16
+TILE_WIDTH = 7 * (CELL + GAP) + GAP
+TILE_HEIGHT = HEADER + 6 * (CELL + GAP) + GAP
+
+# Fixed thresholds keep a tile's colors independent of other months, so a
+# tile only changes when its own days change
+LEVELS = (1, 3, 5, 8)
+EMPTY_COLOR = (235, 230, 230)
+
+def _hex_to_rgb(color):
+    return tuple(int(color[i:i + 2], 16) for i in (1, 3, 5))
+
+def _palette():
+    high = _hex_to_rgb(COLORS["primary"])
+    steps = len(LEVELS)
+    return [EMPTY_COLOR] + [
+        tuple(round(EMPTY_COLOR[c] + (high[c] - EMPTY_COLOR[c]) * (i + 1) / steps) for c in range(3))
+        for i in range(steps)
+    ]
+
+PALETTE = _palette()
+
+def level(count):
+    return sum(1 for threshold in LEVELS if count >= threshold)
+
+def month_counts(stats, year, month):
+    """Completed pomodoros per day of the month, read from the daily rollups"""
+    days = calendar.monthrange(year, month)[1]
+    return [stats.days.get(date(year, month, day).isoformat(), {}).get("pomodoros", 0)
+            for day in range(1, days + 1)]
+
+def render_tile(year, month, counts, today=None):
+    """Render one month as PNG bytes: a header and a Monday-first 7x6 day grid"""
+    today = today or date.today()
+    image = Image.new("RGB", (TILE_WIDTH, TILE_HEIGHT), _hex_to_rgb(COLORS["bg"]))
+    draw = ImageDraw.Draw(image)
+    draw.text((GAP, 2), calendar.month_abbr[month], font=ImageFont.load_default(), fill=_hex_to_rgb(COLORS["text"]))
+
+    first_weekday = date(year, month, 1).weekday()
+    for day, count in enumerate(counts, start=1):
+        slot = first_weekday + day - 1
+        x = GAP + (slot % 7) * (CELL + GAP)
+        y = HEADER + GAP + (slot // 7) * (CELL + GAP)
+        if date(year, month, day) > today:
+            draw.rectangle([x, y, x + CELL - 1, y + CELL - 1], outline=EMPTY_COLOR)
+        else:
+            draw.rectangle([x, y, x + CELL - 1, y + CELL - 1], fill=PALETTE[level(count)])
+
+    output = io.BytesIO()
+    image.save(output, format="PNG")
+    return output.getvalue()
+
+class HeatmapTiles:
+    """Rendered month tiles cached on disk, keyed by the month's day counts
+
+    Each tile is stored as ``YYYY-MM.png`` next to an index holding the day
+    counts it was rendered from. A tile is re-rendered only when those
+    counts change, which after a completed session is the current month.
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir
+        self._index = None
+        self._dirty = False
+        self._memory = {}
+        self.listeners = []
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = {}
+            if self.cache_dir:
+                try:
+                    with open(os.path.join(self.cache_dir, self.INDEX_FILE), encoding="utf-8") as f:
+                        self._index = json.load(f)
+                except (OSError, ValueError):
+                    pass
+        return self._index
+
+    def tile(self, stats, year, month, today=None):
+        """PNG bytes for the month, rendering only when its counts changed"""
+        today = today or date.today()
+        key = f"{year:04d}-{month:02d}"
+        counts = month_counts(stats, year, month)
+        # Months still in progress also change as days pass
+        signature = ",".join(map(str, counts))
+        if (year, month) == (today.year, today.month):
+            signature += f"@{today.day}"
+
+        if self.index.get(key) == signature:
+            data = self._memory.get(key) or self._read(key)
+            if data is not None:
+                return data
+
+        data = render_tile(year, month, counts, today)
+        self._memory[key] = data
+        self.index[key] = signature
+        self._write(key, data)
+        logger.debug(f"Rendered heatmap tile {key}")
+        return data
+
+    def refresh(self, stats, day=None):
+        """Re-render the tile holding day and notify open views; call on the Tk thread"""
+        day = day or date.today()
+        data = self.tile(stats, day.year, day.month, day)
+        self.save_index()
+        for listener in list(self.listeners):
+            listener(day.year, day.month, data)
+
+    def _read(self, key):
+        if not self.cache_dir:
+            return None
+        try:
+            with open(os.path.join(self.cache_dir, f"{key}.png"), "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        self._memory[key] = data
+        return data
+
+    def _write(self, key, data):
+        self._dirty = True
+        if not self.cache_dir:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir)
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, os.path.join(self.cache_dir, f"{key}.png"))
+        except OSError as e:
+            logger.warning(f"Could not cache heatmap tile {key}: {str(e)}")
+
+    def save_index(self):
+        if not self._dirty or not self.cache_dir:
+            return
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self.index, f)
+            os.replace(tmp_path, os.path.join(self.cache_dir, self.INDEX_FILE))
+            self._dirty = False
+        except OSError as e:
+            logger.warning(f"Could not save heatmap index: {str(e)}")
+
+def _photo(master, data):
+    return tk.PhotoImage(master=master, data=base64.b64encode(data))
+
+def show_heatmap(root, stats, tiles, year=None):
+    """
+    Display a year of completed pomodoros as a grid of month tiles.
+
+    Args:
+        root: The parent window
+        stats: ProductivityStats instance holding the daily rollups
+        tiles: HeatmapTiles cache the month images come from
+        year: Year shown first, defaults to the current year
+    """
+    logger.info("Opening heatmap window")
+    today = date.today()
+    state = {"year": year or today.year}
+    columns = 4
+
+    heatmap_window = tk.Toplevel(root)
+    heatmap_window.title("Year Overview")
+    heatmap_window.resizable(False, False)
+    heatmap_window.config(bg=COLORS["bg"])
+    heatmap_window.transient(root)
+
+    header = tk.Frame(heatmap_window, bg=COLORS["bg"])
+    header.pack(pady=(15, 5))
+    title = tk.Label(header, font=FONTS["medium"], bg=COLORS["bg"], fg=COLORS["text"], width=6)
+
+    grid = tk.Frame(heatmap_window, bg=COLORS["bg"])
+    grid.pack(padx=15)
+    month_labels = []
+    for month in range(12):
+        label = tk.Label(grid, bg=COLORS["bg"], borderwidth=0)
+        label.grid(row=month // columns, column=month % columns, padx=4, pady=4)
+        month_labels.append(label)
+
+    total_label = tk.Label(heatmap_window, font=FONTS["list"], bg=COLORS["bg"], fg=COLORS["primary"])
+    total_label.pack(pady=(5, 0))
+
+    def set_tile(month, data):
+        label = month_labels[month - 1]
+        label.image = _photo(heatmap_window, data)
+        label.config(image=label.image)
+
+    def update_total():
+        total = sum(sum(month_counts(stats, state["year"], month)) for month in range(1, 13))
+        total_label.config(text=f"🍅 × {total} in {state['year']}")
+
+    def show_year(new_year):
+        state["year"] = new_year
+        title.config(text=str(new_year))
+        for month in range(1, 13):
+            set_tile(month, tiles.tile(stats, new_year, month, today))
+        tiles.save_index()
+        update_total()
+
+    tk.Button(header, text="◀", font=FONTS["list"], bg=COLORS["bg"], relief=tk.FLAT, borderwidth=0,
+            command=lambda: show_year(state["year"] - 1)).pack(side=tk.LEFT)
+    title.pack(side=tk.LEFT, padx=10)
+    tk.Button(header, text="▶", font=FONTS["list"], bg=COLORS["bg"], relief=tk.FLAT, borderwidth=0,
+            command=lambda: show_year(state["year"] + 1)).pack(side=tk.LEFT)
+
+    # Legend from fewest to most pomodoros
+    legend = tk.Frame(heatmap_window, bg=COLORS["bg"])
+    legend.pack(pady=(5, 0))
+    tk.Label(legend, text="Less", font=FONTS["list"], bg=COLORS["bg"], fg=COLORS["text"]).pack(side=tk.LEFT)
+    for color in PALETTE:
+        tk.Frame(legend, width=CELL, height=CELL, bg="#%02x%02x%02x" % color).pack(side=tk.LEFT, padx=1)
+    tk.Label(legend, text="More", font=FONTS["list"], bg=COLORS["bg"], fg=COLORS["text"]).pack(side=tk.LEFT)
+
+    # Swap in the current month's tile when a session completes
+    def on_tile_updated(tile_year, tile_month, data):
+        if tile_year == state["year"]:
+            set_tile(tile_month, data)
+            update_total()
+    tiles.listeners.append(on_tile_updated)
+
+    # However the window goes away (Close, the window manager or the app
+    # quitting), its labels must not be updated afterwards
+    def on_destroy(event):
+        if event.widget is heatmap_window and on_tile_updated in tiles.listeners:
+            tiles.listeners.remove(on_tile_updated)
+    heatmap_window.bind("<Destroy>", on_destroy)
+
+    def close():
+        heatmap_window.destroy()
+    heatmap_window.protocol("WM_DELETE_WINDOW", close)
+
+    show_year(state["year"])
+    RoundedButton(heatmap_window, "Close", close, COLORS["gray"],
+                width=120, height=35).pack(pady=15)
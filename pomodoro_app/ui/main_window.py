@@ -1,12 +1,29 @@
 # main_window.py
 
+import collections
+import math
+import os
 import tkinter as tk
-from tkinter import simpledialog, messagebox, ttk
+from tkinter import messagebox, ttk
 from ..constants.styling import COLORS, FONTS
-from ..core import logger
+from ..core import logger, profiler, trace
 from .settings_window import show_timer_settings
+from .task_dialog import ask_task
+from .stats_window import show_statistics
+from .heatmap import HeatmapTiles, show_heatmap
+from ..core.events import QUEUED, THROTTLED
+from ..core.power import WakeupCounter
+from ..utils.time_format import format_time
 from .components import RoundedButton, RoundedFrame, round_rect_points
 
+# Maximum number of history entries shown for a search query
+SEARCH_RESULT_LIMIT = 500
+# How often the Tk thread runs timer events forwarded by the event bus, in
+# milliseconds; minimized, only completions arrive and may wait longer
+UI_EVENT_POLL_MS = 50
+UI_EVENT_BACKGROUND_POLL_MS = 1000
+ALL_LABELS = "All labels"
+
 class FloatingBubble(tk.Toplevel):
     """Creates a floating transparent bubble with live timer"""
     
@@ -73,8 +90,8 @@ class FloatingBubble(tk.Toplevel):
         self.bind("<ButtonPress-1>", self._start_drag)
         self.bind("<B1-Motion>", self._on_drag)
         
-        # Update timer display
-        self.update_time()
+        # Last text shown, so the bubble only redraws when it changes
+        self.displayed = None
         
         logger.debug("Floating bubble created successfully")
     
@@ -93,41 +110,35 @@ class FloatingBubble(tk.Toplevel):
         """Handle click on the bubble"""
         self.master.open_main_window()
     
-    def update_time(self):
-        """Update the time display in the bubble"""
-        if not self.winfo_exists():
+    def show(self, time_str, mode):
+        """Update the bubble display; the owner decides how often to call this"""
+        if not self.winfo_exists() or self.displayed == (time_str, mode):
             return
-            
-        # Calculate minutes and seconds
-        mins, secs = divmod(self.timer_core.current_time_left, 60)
-        time_str = f"{mins:02d}:{secs:02d}"
+        self.displayed = (time_str, mode)
+        trace.record(trace.BUBBLE_UPDATE, time_str)
         
         # Update label
         self.time_label.config(text=time_str)
         
         # Update bubble color based on mode
-        current_color = COLORS["primary"] if self.timer_core.current_mode == "pomodoro" else COLORS["secondary"]
+        current_color = COLORS["primary"] if mode == "pomodoro" else COLORS["secondary"]
         if current_color != self.bubble_color:
             self.bubble_color = current_color
             self.configure(bg=self.bubble_color)
             self.time_label.config(bg=self.bubble_color)
             self.mode_label.config(bg=self.bubble_color)
-            mode_text = "POMODORO" if self.timer_core.current_mode == "pomodoro" else "BREAK"
+            mode_text = "POMODORO" if mode == "pomodoro" else "BREAK"
             self.mode_label.config(text=mode_text)
-        
-        # Add pulsing effect if timer is running
-        if self.timer_core.timer_running and secs % 2 == 0:
-            self.time_label.config(fg=COLORS["white"])
-        else:
-            self.time_label.config(fg=COLORS["white"])
-        
-        # Schedule next update
-        self.after(1000, self.update_time)
 
 class MainWindow:
-    def __init__(self, root, timer_core, task_manager, tray_icon):
+    def __init__(self, root, timer_core, task_manager, tray_icon, interactive=True, loading=False):
         logger.info("Initializing MainWindow")
         self.root = root
+        # Modal dialogs on session completion are skipped when not interactive (harnesses)
+        self.interactive = interactive
+        # While loading, the skeleton is shown and input waits for hydrate()
+        self.ready = not loading
+        self.pending_commands = []
         self.root.title("Pomodoro Timer")
         self.root.geometry("400x900")
         self.root.resizable(False, True)
@@ -137,12 +148,34 @@ class MainWindow:
         self.task_manager = task_manager
         self.tray_icon = tray_icon
         
-        # Set callbacks for timer core
-        self.timer_core.on_tick = self.update_timer_display
-        self.timer_core.on_pomodoro_complete = self.on_pomodoro_complete
-        self.timer_core.on_break_complete = self.on_break_complete
+        # Subscribe to timer events; slow UI work must never stall the timer thread.
+        # Ticks may be dropped if the UI falls behind, completions never are.
+        # The bus worker only forwards them: widgets and the task manager are
+        # only ever touched on the Tk thread, which drains ui_events
+        self.ui_events = collections.deque()
+        self.ui_event_job = None
+        self.timer_core.events.subscribe("main_window", {
+            "tick": self.on_tk_thread(self.update_timer_display),
+            "pomodoro_complete": self.on_tk_thread(self.on_pomodoro_complete),
+            "break_complete": self.on_tk_thread(self.on_break_complete)
+        }, mode=QUEUED)
+        self.timer_core.events.subscribe("tray_icon", {
+            "tick": self.update_tray_icon
+        }, mode=THROTTLED, rate_hz=1)
+        
+        # Minute-resolution display refresh used while minimized to tray
+        self.background_job = None
+        self.background_display = None
+        self.background_wakeups = WakeupCounter("tray/bubble")
+        
+        # Heatmap tiles are created when the year overview is first opened
+        self.heatmap_tiles = None
+        
+        # Focus seconds of the current pomodoro already added to the history
+        self.focus_recorded = 0
         
         self.setup_ui()
+        self.drain_ui_events()
         self.root.protocol("WM_DELETE_WINDOW", self.minimize_to_tray)
         logger.info("MainWindow initialized successfully")
     
@@ -169,9 +202,13 @@ class MainWindow:
         # Control buttons
         self.create_buttons(main)
         
-        # Timer settings button
-        RoundedButton(main, "⚙️ Timer Settings", self.show_timer_settings, 
-                    COLORS["gray"], width=360, height=40, radius=10).pack(pady=(5, 15))
+        # Timer settings and statistics buttons
+        tools_frame = tk.Frame(main, bg=COLORS["bg"])
+        tools_frame.pack(pady=(5, 15))
+        RoundedButton(tools_frame, "⚙️ Settings", self.show_timer_settings, 
+                    COLORS["gray"], width=175, height=40, radius=10).pack(side=tk.LEFT, padx=(0, 10))
+        RoundedButton(tools_frame, "📊 Statistics", self.show_statistics, 
+                    COLORS["secondary"], width=175, height=40, radius=10).pack(side=tk.LEFT)
         
         # Task history section
         self.create_history_section(main)
@@ -188,10 +225,9 @@ class MainWindow:
         timer_frame = RoundedFrame(parent, 360, 180, 15, bg=COLORS["primary"])
         timer_frame.pack(pady=(0, 20))
         
-        mins, secs = divmod(self.timer_core.current_time_left, 60)
-        time_str = f"{mins:02d}:{secs:02d}"
+        self.displayed_time = format_time(self.timer_core.current_time_left)
         
-        self.time_display = tk.Label(timer_frame, text=time_str, font=FONTS["large"], 
+        self.time_display = tk.Label(timer_frame, text=self.displayed_time, font=FONTS["large"], 
                                    bg=COLORS["primary"], fg=COLORS["white"])
         timer_frame.create_window(180, 70, window=self.time_display)
         
@@ -238,6 +274,8 @@ class MainWindow:
     # Then add the switch_mode method:
     def switch_mode(self):
         """Switch between Pomodoro and break modes"""
+        if not self.ready:
+            return
         logger.info(f"Switching from {self.timer_core.current_mode} mode")
         
         was_running = self.timer_core.timer_running
@@ -247,23 +285,13 @@ class MainWindow:
         # If in pomodoro mode, mark task as interrupted if running
         if self.timer_core.current_mode == "pomodoro" and was_running:
             if self.timer_core.current_time_left < self.timer_core.pomodoro_time:
-                self.task_manager.update_task_status("interrupted")
+                self.task_manager.update_task_status("interrupted", self.focus_segment())
                 self.update_history_display()
         
-        # Toggle mode
-        new_mode = "break" if self.timer_core.current_mode == "pomodoro" else "pomodoro"
-        self.timer_core.current_mode = new_mode
-        
-        # Reset timer to the appropriate time for the new mode
-        if new_mode == "pomodoro":
-            self.timer_core.current_time_left = self.timer_core.pomodoro_time
-            self.status_label.config(text="Ready to start")
-        else:
-            self.timer_core.current_time_left = self.timer_core.break_time
-            self.status_label.config(text="Break time")
-        
-        # Update the UI
-        self.update_timer_display(self.timer_core.current_time_left, self.timer_core.current_mode)
+        # Toggle mode; the core resets the time left and notifies subscribers
+        new_mode = self.timer_core.switch_mode()
+        self.focus_recorded = 0
+        self.status_label.config(text="Ready to start" if new_mode == "pomodoro" else "Break time")
         
         # Update the button colors
         button_color = COLORS["primary"] if new_mode == "pomodoro" else COLORS["secondary"]
@@ -275,15 +303,16 @@ class MainWindow:
         self.start_button.create_text(55, 20, text=button_text, fill="white", font=FONTS["small"])
         
         # Update switch button
-        switch_color = COLORS["secondary"] if new_mode == "pomodoro" else COLORS["primary"]
-        switch_text = "→ Break" if new_mode == "pomodoro" else "→ Pomodoro"
+        self.update_switch_button(new_mode)
+    
+    def update_switch_button(self, mode):
+        switch_color = COLORS["secondary"] if mode == "pomodoro" else COLORS["primary"]
+        switch_text = "→ Break" if mode == "pomodoro" else "→ Pomodoro"
         
         self.switch_button.delete("all")
         self.switch_button.create_polygon(round_rect_points(0, 0, 110, 40, 10), 
                                     fill=switch_color, smooth=True)
         self.switch_button.create_text(55, 20, text=switch_text, fill="white", font=FONTS["small"])
-        
-        logger.info(f"Switched to {new_mode} mode")
 
     
     def create_history_section(self, parent):
@@ -297,11 +326,25 @@ class MainWindow:
         history_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 5))
         
         history_frame.columnconfigure(0, weight=1)
-        history_frame.rowconfigure(1, weight=1)
+        history_frame.rowconfigure(2, weight=1)
+        
+        # Search box
+        self.search_query = tk.StringVar(value="")
+        search_entry = tk.Entry(history_frame, textvariable=self.search_query, font=FONTS["list"],
+                              bg=COLORS["bg"], fg=COLORS["text"], relief=tk.FLAT)
+        search_entry.grid(row=0, column=0, sticky="ew", padx=5, pady=(5, 0))
+        self.search_query.trace_add("write", lambda *args: self.update_history_display())
+        
+        # Project and tag filter, listing labels known from the rollups
+        self.label_filter = tk.StringVar(value=ALL_LABELS)
+        self.label_box = ttk.Combobox(history_frame, textvariable=self.label_filter, state="readonly",
+                                    width=14, font=FONTS["list"], postcommand=self.update_label_choices)
+        self.label_box.grid(row=0, column=1, sticky="e", padx=(0, 5), pady=(5, 0))
+        self.label_box.bind("<<ComboboxSelected>>", lambda event: self.update_history_display())
         
         # Filter buttons
         filter_frame = tk.Frame(history_frame, bg=COLORS["white"])
-        filter_frame.grid(row=0, column=0, sticky="ew", padx=5, pady=5)
+        filter_frame.grid(row=1, column=0, columnspan=2, sticky="ew", padx=5, pady=5)
         
         self.status_filter = tk.StringVar(value="all")
         
@@ -317,9 +360,16 @@ class MainWindow:
                              borderwidth=0, font=FONTS["list"], indicatoron=0)
             rb.pack(side=tk.LEFT, padx=5)
         
+        # Archived history is only searched on request: it is compressed and not indexed
+        self.search_archive = tk.BooleanVar(value=False)
+        tk.Checkbutton(filter_frame, text="+ Archive", variable=self.search_archive,
+                     command=self.update_history_display, bg=COLORS["white"], fg=COLORS["text"],
+                     selectcolor=COLORS["bg"], borderwidth=0, font=FONTS["list"],
+                     indicatoron=0).pack(side=tk.RIGHT, padx=5)
+        
         # Listbox container
         list_container = tk.Frame(history_frame, bg=COLORS["white"], height=150)
-        list_container.grid(row=1, column=0, sticky="nsew", padx=5, pady=5)
+        list_container.grid(row=2, column=0, columnspan=2, sticky="nsew", padx=5, pady=5)
         list_container.grid_propagate(False)
         
         list_container.columnconfigure(0, weight=1)
@@ -347,10 +397,21 @@ class MainWindow:
     def update_history_display(self):
         logger.debug("Updating history display")
         self.history_listbox.delete(0, tk.END)
+        if not self.ready:
+            self.history_listbox.insert(tk.END, "Loading history...")
+            return
         
         filter_status = self.status_filter.get()
-        filtered_tasks = [task for task in self.task_manager.task_history 
-                        if filter_status == "all" or task["status"] == filter_status]
+        query = self.search_query.get().strip()
+        label = self.label_filter.get()
+        project = label[1:] if label.startswith("@") else None
+        tag = label[1:] if label.startswith("#") else None
+        if query:
+            filtered_tasks = self.task_manager.search_history(query, filter_status, limit=SEARCH_RESULT_LIMIT,
+                                                             include_archive=self.search_archive.get(),
+                                                             project=project, tag=tag)
+        else:
+            filtered_tasks = self.task_manager.filter_history(filter_status, project, tag)
         
         status_colors = {
             "completed": COLORS["success"],
@@ -371,19 +432,20 @@ class MainWindow:
         self.history_listbox.see(0)
         self.root.update_idletasks()
     
+    def update_label_choices(self):
+        stats = self.task_manager.stats
+        self.label_box["values"] = ([ALL_LABELS] + [f"@{path}" for path in sorted(stats.projects)] 
+                                    + [f"#{tag}" for tag in sorted(stats.tags)])
+    
     def show_timer_settings(self):
+        if not self.ready:
+            return
         logger.info("Opening timer settings dialog")
         def update_timer_settings(new_pomodoro, new_break):
             logger.info(f"Updating timer settings: pomodoro={new_pomodoro}, break={new_break}")
-            self.timer_core.pomodoro_time = new_pomodoro
-            self.timer_core.break_time = new_break
-            
+            self.timer_core.set_timer_duration(new_pomodoro, new_break)
             if not self.timer_core.timer_running:
-                if self.timer_core.current_mode == "pomodoro":
-                    self.timer_core.current_time_left = self.timer_core.pomodoro_time
-                else:
-                    self.timer_core.current_time_left = self.timer_core.break_time
-                self.update_timer_display(self.timer_core.current_time_left, self.timer_core.current_mode)
+                self.timer_core.events.publish("tick", self.timer_core.current_time_left, self.timer_core.current_mode)
         
         show_timer_settings(
             self.root,
@@ -392,22 +454,97 @@ class MainWindow:
             update_timer_settings
         )
     
+    def show_statistics(self):
+        if not self.ready:
+            return
+        show_statistics(self.root, self.task_manager.stats, self.task_manager.current_task, 
+                      self.show_heatmap)
+    
+    def show_heatmap(self):
+        if self.heatmap_tiles is None:
+            storage_path = getattr(self.task_manager.storage_manager, "storage_path", None)
+            self.heatmap_tiles = HeatmapTiles(os.path.join(storage_path, "heatmap") if storage_path else None)
+        show_heatmap(self.root, self.task_manager.stats, self.heatmap_tiles)
+    
     def set_task(self):
-        logger.info("Opening set task dialog")
-        task = simpledialog.askstring("Set Task", "What are you working on?", parent=self.root)
+        if not self.ready:
+            return
+        task = ask_task(self.root, self.task_manager.suggest_tasks)
         if task:
             self.task_manager.set_task(task)
             self.task_label.config(text=self.task_manager.current_task)
             self.update_history_display()
             logger.info(f"Task set: '{task}'")
     
+    def handle_remote_command(self, command):
+        """Apply a command forwarded from another launch of the app"""
+        action = command.get("action")
+        if not self.ready:
+            logger.info(f"Deferring remote command until state is loaded: {action}")
+            self.pending_commands.append(command)
+            return
+        logger.info(f"Handling remote command: {action}")
+        
+        if action == "set_task":
+            if self.task_manager.set_task(command.get("task")):
+                self.task_label.config(text=self.task_manager.current_task)
+                self.update_history_display()
+            if command.get("start") and not self.timer_core.timer_running:
+                self.start_timer()
+        elif action == "start":
+            if not self.timer_core.timer_running:
+                self.start_timer()
+        elif action == "pause":
+            if self.timer_core.timer_running:
+                self.start_timer()
+        elif action == "open":
+            self.open_main_window()
+        elif action == "import_tasks":
+            added = self.task_manager.import_tasks(command.get("lines", []))
+            logger.info(f"Imported {added} planned tasks from another launch")
+        else:
+            logger.warning(f"Unknown remote command: {action}")
+    
+    def hydrate(self, task_manager):
+        """Fill in the skeleton once state has been loaded in the background"""
+        logger.info("Hydrating main window with loaded state")
+        self.task_manager = task_manager
+        self.ready = True
+        
+        mode = self.timer_core.current_mode
+        self.task_label.config(text=task_manager.current_task)
+        self.counter_label.config(text=f"🍅 × {self.timer_core.pomodoro_count}")
+        self.status_label.config(text="Ready to start" if mode == "pomodoro" else "Break time")
+        self.update_switch_button(mode)
+        self.timer_core.events.publish("tick", self.timer_core.current_time_left, mode)
+        self.update_history_display()
+        
+        # Replay commands forwarded by other launches while we were loading
+        pending, self.pending_commands = self.pending_commands, []
+        for command in pending:
+            self.handle_remote_command(command)
+    
+    def start_next_planned_task(self):
+        """Make the next planned task current without prompting"""
+        entry = self.task_manager.start_next_planned_task()
+        if entry:
+            self.task_label.config(text=self.task_manager.current_task)
+            self.update_history_display()
+        return entry
+    
     def start_timer(self):
+        if not self.ready:
+            return
         logger.debug("Start timer button clicked")
         if not self.timer_core.timer_running:
             # If no task is set, prompt user
             if self.task_manager.current_task == "No task set":
-                logger.info("No task set, prompting user")
-                self.set_task()
+                if self.task_manager.has_planned_tasks():
+                    logger.info("No task set, using next planned task")
+                    self.start_next_planned_task()
+                else:
+                    logger.info("No task set, prompting user")
+                    self.set_task()
             
             success = self.timer_core.start()
             if success:
@@ -423,7 +560,7 @@ class MainWindow:
                 
                 # Mark as interrupted if pomodoro
                 if self.timer_core.current_mode == "pomodoro" and self.timer_core.current_time_left < self.timer_core.pomodoro_time:
-                    self.task_manager.update_task_status("interrupted")
+                    self.task_manager.update_task_status("interrupted", self.focus_segment())
                     self.update_history_display()
             else:
                 return
@@ -435,17 +572,20 @@ class MainWindow:
         self.start_button.create_text(55, 20, text=button_text, fill="white", font=FONTS["small"])
     
     def reset_timer(self):
+        if not self.ready:
+            return
         logger.info("Reset timer button clicked")
         was_running = self.timer_core.timer_running
         
         # Mark task as interrupted if active pomodoro
         if self.timer_core.current_mode == "pomodoro" and was_running:
             logger.debug("Marking current task as interrupted")
-            self.task_manager.update_task_status("interrupted")
+            self.task_manager.update_task_status("interrupted", self.focus_segment())
             self.update_history_display()
         
         # Reset the timer
         self.timer_core.reset()
+        self.focus_recorded = 0
         
         # Update UI button
         button_text = "Start"
@@ -458,21 +598,55 @@ class MainWindow:
         # Update status
         self.status_label.config(text="Ready to start")
     
+    def on_tk_thread(self, handler):
+        """Wrap an event handler so that it runs on the Tk thread
+        
+        Calling Tk from the bus worker is not safe, and root.after from
+        another thread fails unless mainloop is running; the worker only
+        appends to a deque the Tk thread drains.
+        """
+        def forward(*args):
+            self.ui_events.append((handler, args))
+        return forward
+    
+    def drain_ui_events(self):
+        """Run the event handlers forwarded so far, in order, then reschedule"""
+        try:
+            while self.ui_events:
+                handler, args = self.ui_events.popleft()
+                try:
+                    handler(*args)
+                except Exception as e:
+                    logger.error(f"UI handler {handler.__name__} failed: {str(e)}")
+        finally:
+            delay = UI_EVENT_BACKGROUND_POLL_MS if self.timer_core.background else UI_EVENT_POLL_MS
+            self.ui_event_job = self.root.after(delay, self.drain_ui_events)
+    
+    def focus_elapsed(self):
+        """Seconds already spent in the current pomodoro"""
+        return max(0, self.timer_core.pomodoro_time - self.timer_core.get_time_left())
+    
+    def focus_segment(self):
+        """Seconds of the current pomodoro spent since focus time was last recorded"""
+        elapsed = self.focus_elapsed()
+        segment = max(0, elapsed - self.focus_recorded)
+        self.focus_recorded = elapsed
+        return segment
+    
     def update_timer_display(self, time_left, mode):
-        mins, secs = divmod(time_left, 60)
-        time_str = f"{mins:02d}:{secs:02d}"
-        logger.debug(f"Updating timer display: {time_str} ({mode})")
+        # Table strings are shared objects, so an identity check spots repeats
+        time_str = format_time(time_left)
+        if time_str is self.displayed_time:
+            return
+        self.displayed_time = time_str
+        trace.record(trace.DISPLAY_UPDATE, time_left)
         
         self.time_display.config(text=time_str)
-        
-        # Update tray icon if it exists
+    
+    def update_tray_icon(self, time_left, mode):
+        """Update the tray icon if it exists"""
         if self.tray_icon.running:
-            self.tray_icon.update_icon(time_str, mode)
-            
-        # Update bubble if it exists
-        if hasattr(self, 'bubble') and self.bubble.winfo_exists():
-            # The bubble handles its own update through its update_time method
-            pass
+            self.tray_icon.update_icon(format_time(time_left), mode)
 
     def on_close(self):
         """Handle window close event"""
@@ -510,7 +684,11 @@ class MainWindow:
     def on_pomodoro_complete(self, pomodoro_count):
         logger.info(f"Pomodoro #{pomodoro_count} completed")
         self.counter_label.config(text=f"🍅 × {pomodoro_count}")
-        self.task_manager.update_task_status("completed")
+        # Count this pomodoro once, with the focus time not yet recorded by interruptions
+        self.task_manager.complete_pomodoro(max(0, self.timer_core.pomodoro_time - self.focus_recorded))
+        self.focus_recorded = 0
+        if self.heatmap_tiles is not None:
+            self.heatmap_tiles.refresh(self.task_manager.stats)
         self.update_history_display()
         
         # Update UI for break mode
@@ -523,7 +701,8 @@ class MainWindow:
         self.start_button.create_text(55, 20, text="Start Break", fill="white", font=FONTS["small"])
         
         # Show break message
-        messagebox.showinfo("Break Time!", "Time for a break!")
+        if self.interactive:
+            messagebox.showinfo("Break Time!", "Time for a break!")
     
     def on_break_complete(self):
         logger.info("Break completed")
@@ -538,9 +717,12 @@ class MainWindow:
         self.start_button.create_text(55, 20, text="Start", fill="white", font=FONTS["small"])
         
         # Ask for next task
-        if messagebox.askyesno("Continue?", "Would you like to start another Pomodoro?"):
+        if self.interactive and messagebox.askyesno("Continue?", "Would you like to start another Pomodoro?"):
             logger.info("User chose to start another pomodoro")
-            self.set_task()
+            if self.task_manager.has_planned_tasks():
+                self.start_next_planned_task()
+            else:
+                self.set_task()
             self.start_timer()
     
     def minimize_to_tray(self):
@@ -554,18 +736,57 @@ class MainWindow:
                 self.root.iconify()
                 return
         
-        mins, secs = divmod(self.timer_core.current_time_left, 60)
-        self.tray_icon.update_icon(f"{mins:02d}:{secs:02d}", self.timer_core.current_mode)
-        
         # Create floating bubble
         self.bubble = FloatingBubble(self.root, self.timer_core)
         
+        # Let the timer sleep until its deadline and refresh tray/bubble per minute
+        self.timer_core.set_background_mode(True)
+        self.background_wakeups.reset()
+        self.background_display = None
+        self.background_update()
+        
         # Hide main window
         self.root.withdraw()
     
+    def background_update(self):
+        """Minute-resolution refresh of the tray icon and bubble while minimized"""
+        self.background_job = None
+        if not self.timer_core.background:
+            return
+        self.background_wakeups.tick()
+        trace.record(trace.BACKGROUND_UPDATE)
+        
+        time_left = self.timer_core.get_time_left()
+        mode = self.timer_core.current_mode
+        display = (f"{math.ceil(time_left / 60)}m", mode)
+        if display != self.background_display:
+            self.background_display = display
+            self.tray_icon.update_icon(*display)
+            if hasattr(self, 'bubble') and self.bubble.winfo_exists():
+                self.bubble.show(*display)
+        
+        # Wake again when the displayed minute changes
+        if self.timer_core.timer_running:
+            delay = (time_left % 60 or 60) * 1000 + 50
+        else:
+            delay = 60 * 1000
+        self.background_job = self.root.after(delay, self.background_update)
+    
+    def cancel_background_update(self):
+        if self.background_job is not None:
+            self.root.after_cancel(self.background_job)
+            self.background_job = None
+    
     def open_main_window(self):
         logger.info("Opening main window from tray")
         
+        # Resume full per-second ticking
+        self.cancel_background_update()
+        if self.timer_core.background:
+            self.background_wakeups.report("background")
+            self.timer_core.set_background_mode(False)
+            self.timer_core.events.publish("tick", self.timer_core.get_time_left(), self.timer_core.current_mode)
+        
         # Destroy floating bubble if it exists
         if hasattr(self, 'bubble') and self.bubble.winfo_exists():
             logger.debug("Destroying floating bubble")
@@ -574,8 +795,16 @@ class MainWindow:
         self.root.deiconify()
         self.root.lift()
     
+    def toggle_profiler(self):
+        # Called from the tray thread; cProfile must run on the Tk thread
+        self.root.after(0, profiler.toggle)
+    
     def quit_app(self):
         logger.info("Quitting application")
+        self.cancel_background_update()
+        if self.ui_event_job is not None:
+            self.root.after_cancel(self.ui_event_job)
+            self.ui_event_job = None
         
         # Destroy floating bubble if it exists
         if hasattr(self, 'bubble') and self.bubble.winfo_exists():
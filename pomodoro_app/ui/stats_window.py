@@ -0,0 +1,87 @@
+# stats_window.py
+
+import tkinter as tk
+from datetime import date, timedelta
+from ..constants.styling import COLORS, FONTS
+from ..core import logger
+from ..data.projects import parse_labels
+from .components import RoundedButton
+
+def format_focus(seconds):
+    hours, rem = divmod(int(seconds) // 60, 60)
+    return f"{hours}h {rem:02d}m" if hours else f"{rem}m"
+
+def show_statistics(root, stats, current_task=None, show_year=None):
+    """
+    Display a statistics panel built from incrementally maintained rollups.
+    
+    Args:
+        root: The parent window
+        stats: ProductivityStats instance holding the rollups
+        current_task: Name of the current task, shown with its total focus time
+        show_year: Callback opening the year overview, adds a button when given
+    """
+    logger.info("Opening statistics window")
+    today = date.today()
+    
+    stats_window = tk.Toplevel(root)
+    stats_window.title("Statistics")
+    stats_window.geometry("320x480")
+    stats_window.resizable(False, False)
+    stats_window.config(bg=COLORS["bg"])
+    stats_window.transient(root)
+    
+    # Center window relative to parent
+    stats_window.geometry(f"+{root.winfo_rootx() + root.winfo_width()//2 - 160}+{root.winfo_rooty() + root.winfo_height()//2 - 240}")
+    
+    tk.Label(stats_window, text="Statistics", font=FONTS["medium"], 
+           bg=COLORS["bg"], fg=COLORS["text"]).pack(pady=(20, 15))
+    
+    def add_row(label, value, color=COLORS["text"]):
+        row = tk.Frame(stats_window, bg=COLORS["bg"])
+        row.pack(fill=tk.X, padx=20, pady=2)
+        tk.Label(row, text=label, font=FONTS["list"], bg=COLORS["bg"], fg=COLORS["text"]).pack(side=tk.LEFT)
+        tk.Label(row, text=value, font=FONTS["list"], bg=COLORS["bg"], fg=color).pack(side=tk.RIGHT)
+    
+    today_stats = stats.day(today)
+    add_row("Today", f"🍅 × {today_stats['pomodoros']}", COLORS["primary"])
+    add_row("Focus time today", format_focus(today_stats["focus_seconds"]))
+    add_row("Interruptions today", str(today_stats["interrupted"]), COLORS["danger"])
+    add_row("Current streak", f"{stats.streak(today)} days", COLORS["success"])
+    add_row("Best streak", f"{stats.best_streak} days")
+    
+    this_week = stats.week(today)
+    last_week = stats.week(today - timedelta(days=7))
+    add_row("This week", f"🍅 × {this_week['pomodoros']} ({format_focus(this_week['focus_seconds'])})")
+    add_row("Last week", f"🍅 × {last_week['pomodoros']} ({format_focus(last_week['focus_seconds'])})")
+    
+    # Last seven days as a compact bar row
+    days_frame = tk.Frame(stats_window, bg=COLORS["bg"])
+    days_frame.pack(fill=tk.X, padx=20, pady=(15, 5))
+    for offset in range(6, -1, -1):
+        day = today - timedelta(days=offset)
+        count = stats.day(day)["pomodoros"]
+        column = tk.Frame(days_frame, bg=COLORS["bg"])
+        column.pack(side=tk.LEFT, expand=True)
+        tk.Label(column, text=str(count), font=FONTS["list"], bg=COLORS["bg"], 
+               fg=COLORS["primary"] if count else COLORS["gray"]).pack()
+        tk.Label(column, text=day.strftime("%a"), font=FONTS["list"], bg=COLORS["bg"], 
+               fg=COLORS["text"]).pack()
+    
+    if current_task and current_task != "No task set":
+        task_stats = stats.task(current_task)
+        add_row("Current task total", 
+                f"🍅 × {task_stats['pomodoros']} ({format_focus(task_stats['focus_seconds'])})")
+        project, _ = parse_labels(current_task)
+        if project:
+            project_stats = stats.project(project, today.strftime("%Y-%m"))
+            add_row(f"@{project} this month", 
+                    f"🍅 × {project_stats['pomodoros']} ({format_focus(project_stats['focus_seconds'])})")
+    
+    buttons = tk.Frame(stats_window, bg=COLORS["bg"])
+    buttons.pack(pady=(15, 0))
+    if show_year is not None:
+        RoundedButton(buttons, "📅 Year", show_year, COLORS["secondary"], 
+                    width=120, height=35).pack(side=tk.LEFT, padx=(0, 10))
+    RoundedButton(buttons, "Close", stats_window.destroy, COLORS["gray"], 
+                width=120, height=35).pack(side=tk.LEFT)
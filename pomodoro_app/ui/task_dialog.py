@@ -0,0 +1,96 @@
+# task_dialog.py
+
+import tkinter as tk
+from ..constants.styling import COLORS, FONTS
+from ..core import logger
+from .components import RoundedButton
+
+def ask_task(root, suggest, initial=""):
+    """
+    Display a modal dialog asking for a task name with autocomplete.
+
+    Args:
+        root: The parent window
+        suggest: Callable returning task name suggestions for a prefix
+        initial: Initial text of the entry
+
+    Returns:
+        The entered task name, or None if the dialog was cancelled
+    """
+    logger.info("Opening set task dialog")
+    result = {"task": None}
+
+    dialog = tk.Toplevel(root)
+    dialog.title("Set Task")
+    dialog.geometry("320x260")
+    dialog.resizable(False, False)
+    dialog.config(bg=COLORS["bg"])
+    dialog.transient(root)
+
+    # Center window relative to parent
+    dialog.geometry(f"+{root.winfo_rootx() + root.winfo_width()//2 - 160}+{root.winfo_rooty() + root.winfo_height()//2 - 130}")
+
+    tk.Label(dialog, text="What are you working on?", font=FONTS["small"],
+           bg=COLORS["bg"], fg=COLORS["text"]).pack(pady=(15, 10))
+
+    task_text = tk.StringVar(value=initial)
+    entry = tk.Entry(dialog, textvariable=task_text, font=FONTS["tiny"],
+                   bg=COLORS["white"], fg=COLORS["text"], relief=tk.FLAT)
+    entry.pack(fill=tk.X, padx=20)
+
+    suggestions = tk.Listbox(dialog, font=FONTS["list"], bg=COLORS["white"], fg=COLORS["text"],
+                           borderwidth=0, highlightthickness=1, height=6,
+                           selectbackground=COLORS["primary"])
+    suggestions.pack(fill=tk.X, padx=20, pady=(5, 0))
+
+    def refresh_suggestions(*args):
+        suggestions.delete(0, tk.END)
+        for name in suggest(task_text.get()):
+            suggestions.insert(tk.END, name)
+
+    def accept(event=None):
+        selection = suggestions.curselection()
+        if selection and event is not None and event.widget is suggestions:
+            task = suggestions.get(selection[0])
+        else:
+            task = task_text.get()
+        task = task.strip()
+        if task:
+            result["task"] = task
+            dialog.destroy()
+
+    def complete(event=None):
+        if suggestions.size():
+            task_text.set(suggestions.get(0))
+            entry.icursor(tk.END)
+        return "break"
+
+    def focus_suggestions(event=None):
+        if suggestions.size():
+            suggestions.focus_set()
+            suggestions.selection_clear(0, tk.END)
+            suggestions.selection_set(0)
+            suggestions.activate(0)
+        return "break"
+
+    task_text.trace_add("write", refresh_suggestions)
+    entry.bind("<Return>", accept)
+    entry.bind("<Tab>", complete)
+    entry.bind("<Down>", focus_suggestions)
+    suggestions.bind("<Return>", accept)
+    suggestions.bind("<Double-Button-1>", accept)
+    dialog.bind("<Escape>", lambda e: dialog.destroy())
+
+    # Action buttons
+    button_frame = tk.Frame(dialog, bg=COLORS["bg"])
+    button_frame.pack(fill=tk.X, padx=20, pady=(15, 0))
+
+    RoundedButton(button_frame, "OK", accept, COLORS["primary"], width=120, height=35).pack(side=tk.LEFT, padx=(0, 10))
+    RoundedButton(button_frame, "Cancel", dialog.destroy, COLORS["gray"], width=120, height=35).pack(side=tk.RIGHT)
+
+    refresh_suggestions()
+    entry.focus_set()
+    dialog.grab_set()
+    root.wait_window(dialog)
+
+    return result["task"]
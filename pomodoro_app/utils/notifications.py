@@ -3,6 +3,14 @@
 from plyer import notification
 from ..core import logger
 
+def preload():
+    """Load the platform notification backend ahead of the first notification"""
+    try:
+        # plyer resolves its backend lazily on first attribute access
+        notification.notify
+    except Exception as e:
+        logger.warning(f"Notification backend unavailable: {str(e)}")
+
 def send_notification(title, message, timeout=10):
     try:
         logger.info(f"Sending notification: {title}")
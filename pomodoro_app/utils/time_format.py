@@ -0,0 +1,14 @@
+# time_format.py
+
+# Longest session the settings dialog allows (60 minute pomodoros)
+MAX_DURATION = 60 * 60
+
+# Every "MM:SS" string the timer can show, built once so ticks only index
+TIME_STRINGS = tuple(f"{seconds // 60:02d}:{seconds % 60:02d}" for seconds in range(MAX_DURATION + 1))
+
+def format_time(seconds):
+    """Return the "MM:SS" string for a number of seconds"""
+    if 0 <= seconds <= MAX_DURATION:
+        return TIME_STRINGS[seconds]
+    mins, secs = divmod(max(0, seconds), 60)
+    return f"{mins:02d}:{secs:02d}"
@@ -1,10 +1,18 @@
 # tray_icon.py
 
+import logging
 import threading
-import pystray
 from PIL import Image, ImageDraw, ImageFont
 from ..constants.styling import COLORS
-from ..core import logger
+from ..core import logger, profiler, trace
+
+# Imported by preload() so the tray backend loads off the startup path
+pystray = None
+
+ICON_SIZE = 64
+TEXT_COLOR = (255, 255, 255, 255)
+# Characters the timer and the minimized display show: "25:00", "25m"
+GLYPH_CHARS = "0123456789:m"
 
 class SystemTrayIcon:
     def __init__(self, app):
@@ -14,38 +22,105 @@ class SystemTrayIcon:
         self.running = False
         self.current_time = "25:00"
         self.current_mode = "pomodoro"
+        self.font = None
+        self.base_images = {}
+        self.glyphs = None
+        self.glyph_height = 0
+        self.canvas = None
+        self._lock = threading.Lock()
+    def preload(self):
+        """Import the tray backend and load the icon font; safe off the Tk thread"""
+        global pystray
+        import pystray
+        if self.font is None:
+            try:
+                self.font = ImageFont.truetype("arial.ttf", 20)
+            except:
+                self.font = ImageFont.load_default()
+                logger.warning("Could not load arial.ttf, using default font for tray icon")
     def create_image(self):
-        logger.debug(f"Creating tray icon image: time={self.current_time}, mode={self.current_mode}")
-        w, h = 64, 64
-        color = COLORS["primary"] if self.current_mode == "pomodoro" else COLORS["secondary"]
-        img = Image.new('RGBA', (w, h), color=(0, 0, 0, 0))
+        """Draw the icon for the current time and mode
+
+        Redrawn every second while the window is shown, so the text is
+        composed from glyph masks rendered once into one reused canvas;
+        the backend copies the image when it is assigned to the icon.
+        """
+        trace.record(trace.TRAY_IMAGE, self.current_time)
+        w, h = ICON_SIZE, ICON_SIZE
+        # The colored disc only depends on the mode; draw it once per mode
+        base = self.base_images.get(self.current_mode)
+        if base is None:
+            color = COLORS["primary"] if self.current_mode == "pomodoro" else COLORS["secondary"]
+            base = Image.new('RGBA', (w, h), color=(0, 0, 0, 0))
+            ImageDraw.Draw(base).ellipse([(0, 0), (w, h)], fill=color)
+            self.base_images[self.current_mode] = base
+        if self.font is None:
+            self.preload()
+        if self.glyphs is None:
+            self._render_glyphs()
+        if self.canvas is None:
+            self.canvas = base.copy()
+        else:
+            self.canvas.im.paste(base.im, (0, 0, w, h))
+
+        glyphs = self.glyphs
+        width = 0
+        for char in self.current_time:
+            glyph = glyphs.get(char)
+            if glyph is None:
+                return self._draw_text(base)
+            width += glyph[0]
+        x, y = (w - width) // 2, (h - self.glyph_height) // 2
+        for char in self.current_time:
+            advance, mask = glyphs[char]
+            self.canvas.im.paste(TEXT_COLOR, (x, y, x + advance, y + self.glyph_height), mask)
+            x += advance
+        return self.canvas
+    def _render_glyphs(self):
+        left, top, right, bottom = self.font.getbbox(GLYPH_CHARS)
+        self.glyph_height = bottom - top
+        self.glyphs = {}
+        for char in GLYPH_CHARS:
+            advance = max(1, round(self.font.getlength(char)))
+            mask = Image.new("L", (advance, self.glyph_height), 0)
+            ImageDraw.Draw(mask).text((0, -top), char, font=self.font, fill=255)
+            self.glyphs[char] = (advance, mask.im)
+    def _draw_text(self, base):
+        """Fallback for text with characters outside GLYPH_CHARS"""
+        img = base.copy()
         draw = ImageDraw.Draw(img)
-        draw.ellipse([(0, 0), (w, h)], fill=color)
-        try:
-            font = ImageFont.truetype("arial.ttf", 20)
-            logger.debug("Using arial.ttf font for tray icon")
-        except:
-            font = ImageFont.load_default()
-            logger.warning("Could not load arial.ttf, using default font for tray icon")
-        bbox = draw.textbbox((0, 0), self.current_time, font=font)
+        bbox = draw.textbbox((0, 0), self.current_time, font=self.font)
         text_w, text_h = bbox[2] - bbox[0], bbox[3] - bbox[1]
-        pos = ((w - text_w) / 2, (h - text_h) / 2)
-        draw.text(pos, self.current_time, font=font, fill="white")
+        pos = ((ICON_SIZE - text_w) / 2, (ICON_SIZE - text_h) / 2)
+        draw.text(pos, self.current_time, font=self.font, fill="white")
         return img
     def update_icon(self, time_str, mode):
-        logger.debug(f"Updating tray icon: time={time_str}, mode={mode}")
-        self.current_time, self.current_mode = time_str, mode
-        if self.icon and self.running:
-            try:
+        # Called from the event bus worker and the Tk thread; they share the canvas.
+        # acquire/release rather than "with", which allocates bound methods per call
+        self._lock.acquire()
+        try:
+            if time_str == self.current_time and mode == self.current_mode:
+                return
+            trace.record(trace.TRAY_UPDATE, time_str)
+            self.current_time, self.current_mode = time_str, mode
+            if self.icon and self.running:
                 self.icon.icon = self.create_image()
-                logger.debug("Tray icon updated successfully")
-            except Exception as e:
-                logger.error(f"Error updating tray icon: {str(e)}")
+        except Exception as e:
+            logger.error(f"Error updating tray icon: {str(e)}")
+        finally:
+            self._lock.release()
     def setup(self):
         try:
             logger.info("Setting up system tray icon")
+            self.preload()
             menu = pystray.Menu(
                 pystray.MenuItem("Open Timer", self.app.open_main_window),
+                # Only shown when running with --debug
+                pystray.MenuItem(
+                    lambda item: "Stop Profiling" if profiler.is_active() else "Start Profiling",
+                    self.app.toggle_profiler,
+                    visible=lambda item: logger.get_logger().isEnabledFor(logging.DEBUG)
+                ),
                 pystray.MenuItem("Exit", self.app.quit_app)
             )
             self.icon = pystray.Icon("pomodoro", self.create_image(), "Pomodoro Timer", menu)